@@ -0,0 +1,323 @@
+"""Response cache for read-heavy endpoints - LRU/TTL or Redis backends, ETags and per-company invalidation."""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from collections import Counter, OrderedDict
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+import hashlib
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# "memory" (per-process LRU), "redis" (shared across API processes) or "none".
+# The memory backend only sees invalidations made in its own process: with
+# several uvicorn workers, the others serve stale entries until the TTL
+# expires, so use redis when running more than one API process.
+CACHE_BACKEND = os.getenv("API_CACHE_BACKEND", "memory")
+
+# Seconds a cached response is served before it is rebuilt; bounds staleness
+# for writes that skip the invalidation hooks (e.g. standalone workers)
+CACHE_TTL_SECONDS = float(os.getenv("API_CACHE_TTL_SECONDS", "60"))
+
+# Responses held by the memory backend before the least recently used is evicted
+CACHE_MAX_ENTRIES = int(os.getenv("API_CACHE_MAX_ENTRIES", "10000"))
+
+CACHE_REDIS_URL = os.getenv("API_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+KEY_PREFIX = "chimera:"
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Response headers that are recomputed rather than replayed from the cache
+_SKIP_HEADERS = {"content-length", "content-type", "etag"}
+
+
+class MemoryBackend:
+    """
+    In-process LRU with per-entry expiry. Generations are never evicted.
+
+    Invalidation is per process: other API processes keep serving their own
+    copies until ``CACHE_TTL_SECONDS`` expires them.
+    """
+
+    blocking = False  # dict operations; safe to call on the event loop
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, scope: str) -> int:
+        return self._generations.get(scope, 0)
+
+    def bump(self, scope: str) -> int:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            return self._generations[scope]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self._entries)
+
+
+class RedisBackend:
+    """
+    Shared cache on a Redis-compatible server.
+
+    Only ``get``, ``set(..., px=)`` and ``incr`` are used, so any client
+    exposing those (redis-py, fakeredis, a KeyDB/Valkey/Dragonfly server)
+    works. Pass ``client`` to supply one; otherwise redis-py is required.
+
+    Calls are blocking network round trips, so ``ResponseCache`` runs them
+    in the threadpool rather than on the event loop.
+    """
+
+    blocking = True
+
+    def __init__(self, url: str = CACHE_REDIS_URL, client: Any = None):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise ImportError(
+                    "API_CACHE_BACKEND=redis requires the redis package (pip install redis)"
+                ) from e
+            client = redis.Redis.from_url(url)
+        self.client = client
+        self.evictions = 0  # Redis evicts on its own; see INFO stats
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(KEY_PREFIX + key)
+
+    def set(self, key: str, value: bytes, ttl: float):
+        self.client.set(KEY_PREFIX + key, value, px=max(1, int(ttl * 1000)))
+
+    def generation(self, scope: str) -> int:
+        return int(self.client.get(KEY_PREFIX + "gen:" + scope) or 0)
+
+    def bump(self, scope: str) -> int:
+        return int(self.client.incr(KEY_PREFIX + "gen:" + scope))
+
+    def clear(self):
+        # Entries expire on their own; shared keys are not flushed from one process
+        pass
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+def company_scope(company_id: str) -> str:
+    """Invalidation scope covering every cached view of one company."""
+    return f"company:{company_id}"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+class ResponseCache:
+    """
+    Caches serialized JSON responses keyed by URL and invalidation scope.
+
+    Each scope (e.g. ``company:<id>``) has a generation counter that is part
+    of every key cached under it; ``invalidate`` bumps the counter so all of
+    the scope's entries miss at once without enumerating them, on either
+    backend. Every response carries a content hash ETag, and a matching
+    ``If-None-Match`` gets a bodiless 304 whether or not the entry was cached.
+    """
+
+    def __init__(self, backend=None, ttl: float = CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+        self._adapters: Dict[Any, TypeAdapter] = {}
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counts[name] += n
+
+    def _adapter(self, response_type) -> TypeAdapter:
+        adapter = self._adapters.get(response_type)
+        if adapter is None:
+            adapter = self._adapters[response_type] = TypeAdapter(response_type)
+        return adapter
+
+    async def _call(self, method: Callable, *args):
+        """Run a backend call, off the event loop when the backend does I/O."""
+        if getattr(self.backend, "blocking", False):
+            return await run_in_threadpool(method, *args)
+        return method(*args)
+
+    async def _key(self, request: Request, scope: Optional[str], vary: str) -> str:
+        generation = await self._call(self.backend.generation, scope) if scope else 0
+        query = "&".join(
+            sorted(f"{k}={v}" for k, v in request.query_params.multi_items())
+        )
+        raw = f"{request.url.path}?{query}|{vary}"
+        return (
+            f"{scope or 'global'}:{generation}:{hashlib.sha1(raw.encode()).hexdigest()}"
+        )
+
+    async def respond(
+        self,
+        request: Request,
+        response_type,
+        build: Callable[[], Any],
+        scope: Optional[str] = None,
+        vary: str = "",
+        response: Optional[Response] = None,
+    ) -> Response:
+        """
+        Serve ``build()`` serialized as ``response_type``, from the cache when possible.
+        ``build`` may return an awaitable (e.g. ``AsyncSession.run_sync``).
+
+        ``vary`` adds to the key anything the URL does not capture (such as
+        a config version). Headers that ``build`` sets on ``response`` (like
+        ``X-Next-Cursor``) are cached and replayed with the body.
+        """
+        key = await self._key(request, scope, vary) if self.backend else None
+        cached = await self._call(self.backend.get, key) if key else None
+
+        if cached is not None:
+            self._count("hits")
+            meta, body = cached.split(b"\n", 1)
+            meta = json.loads(meta)
+            etag, headers, status = meta["etag"], meta["headers"], "HIT"
+        else:
+            self._count("misses")
+            data = build()
+            if inspect.isawaitable(data):
+                data = await data
+            adapter = self._adapter(response_type)
+            body = adapter.dump_json(
+                adapter.validate_python(data, from_attributes=True)
+            )
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = {
+                k: v
+                for k, v in (response.headers.items() if response is not None else ())
+                if k.lower() not in _SKIP_HEADERS
+            }
+            status = "MISS"
+            if key:
+                meta = json.dumps({"etag": etag, "headers": headers}).encode()
+                await self._call(self.backend.set, key, meta + b"\n" + body, self.ttl)
+                self._count("stores")
+
+        headers = {
+            **headers,
+            "ETag": etag,
+            CACHE_STATUS_HEADER: status,
+            "Cache-Control": "no-cache",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self._count("not_modified")
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, scopes: Iterable[str]) -> int:
+        """Drop every entry cached under the given scopes. Returns the scopes bumped."""
+        if not self.backend:
+            return 0
+        bumped = 0
+        for scope in set(scopes):
+            self.backend.bump(scope)
+            bumped += 1
+        self._count("invalidations", bumped)
+        return bumped
+
+    def invalidate_companies(self, company_ids: Iterable[str]) -> int:
+        """Drop the cached views of each company, e.g. after writing its KPIs, jobs or evidence."""
+        return self.invalidate(
+            company_scope(company_id) for company_id in company_ids if company_id
+        )
+
+    async def invalidate_companies_async(self, company_ids: Iterable[str]) -> int:
+        """``invalidate_companies`` for async routes; a blocking backend runs in the threadpool."""
+        company_ids = list(company_ids)
+        if getattr(self.backend, "blocking", False):
+            return await run_in_threadpool(self.invalidate_companies, company_ids)
+        return self.invalidate_companies(company_ids)
+
+    def clear(self):
+        if self.backend:
+            self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            counts = dict(self._counts)
+        lookups = counts.get("hits", 0) + counts.get("misses", 0)
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "ttl_seconds": self.ttl,
+            "hits": counts.get("hits", 0),
+            "misses": counts.get("misses", 0),
+            "hit_ratio": round(counts.get("hits", 0) / lookups, 4) if lookups else None,
+            "not_modified": counts.get("not_modified", 0),
+            "stores": counts.get("stores", 0),
+            "invalidations": counts.get("invalidations", 0),
+            "evictions": self.backend.evictions if self.backend else 0,
+            "entries": self.backend.size() if self.backend else 0,
+        }
+
+
+def build_backend(name: str = CACHE_BACKEND):
+    """Backend named by ``API_CACHE_BACKEND``; None disables caching (ETags still apply)."""
+    if name == "memory":
+        return MemoryBackend()
+    if name == "redis":
+        return RedisBackend()
+    if name in ("none", "", "off"):
+        return None
+    raise ValueError(f"Unknown API_CACHE_BACKEND {name!r}; use memory, redis or none")
+
+
+response_cache = ResponseCache(build_backend())
+
+
+def invalidate_companies(company_ids: Iterable[str]) -> int:
+    """Invalidation hook for writers of company data (workers and other sync code)."""
+    return response_cache.invalidate_companies(company_ids)
+
+
+async def invalidate_companies_async(company_ids: Iterable[str]) -> int:
+    """Invalidation hook for async routes."""
+    return await response_cache.invalidate_companies_async(company_ids)
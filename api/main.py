@@ -5,22 +5,31 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from contextlib import asynccontextmanager
 import logging
+import os
 from pathlib import Path
 import sys
+import threading
 
 # Add parent to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from api.routes import kpis, plays, jobs, evidence, companies, cycles
 from api.routes import lazy_larry, opportunities, social, intelligence, content, automation
-from database.connection import init_db, get_db
-from core.config_loader import load_agents, load_kpis, load_plays
+from api.pagination import NEXT_CURSOR_HEADER
+from api.cache import CACHE_STATUS_HEADER, invalidate_companies, response_cache
+from database.connection import async_engine, init_db, get_db
+from core.config_loader import get_config
+from core.event_log import shared_evidence_log
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 security = HTTPBearer()
 
+# Job worker threads run inside the API process; with 0, background cycles
+# wait for separate services/worker.py processes
+EMBEDDED_WORKERS = int(os.getenv("API_EMBEDDED_WORKERS", "0"))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -32,17 +41,37 @@ async def lifespan(app: FastAPI):
     
     # Load configs
     try:
-        agents = load_agents()
-        kpi_defs = load_kpis()
-        plays_cfg = load_plays()
-        logger.info(f"Loaded {len(agents)} agents, {len(kpi_defs)} KPIs, {len(plays_cfg)} plays")
+        config = get_config()
+        logger.info(
+            f"Loaded config {config.version}: {len(config.agents)} agents, "
+            f"{len(config.kpis)} KPIs, {len(config.plays)} plays"
+        )
     except Exception as e:
         logger.warning(f"Config loading warning: {e}")
     
+    workers = []
+    if EMBEDDED_WORKERS:
+        from services.worker import Worker
+        for i in range(EMBEDDED_WORKERS):
+            worker = Worker(
+                worker_id=f"api-{os.getpid()}-{i}",
+                on_commit=invalidate_companies,
+                event_log=shared_evidence_log(),
+            )
+            thread = threading.Thread(target=worker.run, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            workers.append((worker, thread))
+        logger.info(f"Started {EMBEDDED_WORKERS} embedded job worker(s)")
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Profit OS Chimera API")
+    for worker, _ in workers:
+        worker.stop()
+    for _, thread in workers:
+        thread.join(timeout=30)
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -61,6 +90,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", CACHE_STATUS_HEADER],
 )
 
 # Include routers
@@ -92,13 +122,24 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint."""
+    try:
+        config_version = get_config().version
+    except Exception:
+        config_version = None
     return {
         "status": "healthy",
         "version": "0.1.0",
-        "service": "Profit OS Chimera"
+        "service": "Profit OS Chimera",
+        "config_version": config_version
     }
 
 
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Response cache hit/miss counters for this API process."""
+    return response_cache.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
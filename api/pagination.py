@@ -0,0 +1,140 @@
+"""Keyset pagination and NDJSON export helpers for list endpoints."""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Type
+from datetime import datetime
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query, Session
+from database.connection import SessionLocal
+import base64
+import heapq
+import json
+import os
+
+# Page size bounds for cursor-paginated endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = int(os.getenv("API_MAX_PAGE_SIZE", "1000"))
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = int(os.getenv("API_EXPORT_BATCH_SIZE", "1000"))
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    """Opaque cursor for the row a page ended on."""
+    raw = json.dumps([sort_value.isoformat() if sort_value else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    """Inverse of ``encode_cursor``; a malformed cursor is a 400."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(sort_value) if sort_value else None), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_page(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of ``query`` ordered by ``(sort_column, id_column)``.
+
+    Rows after ``cursor`` are selected with a range predicate instead of
+    OFFSET, so every page costs the same index seek however deep it is.
+    Returns the rows and the cursor for the next page (None on the last).
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        if descending:
+            after = or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id),
+            )
+        else:
+            after = or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > row_id),
+            )
+        query = query.filter(after)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(
+        getattr(last, sort_column.key), getattr(last, id_column.key)
+    )
+
+
+def paginate(
+    response: Response,
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = True,
+) -> List[Any]:
+    """``keyset_page`` that reports the next cursor in the ``X-Next-Cursor`` header."""
+    rows, next_cursor = keyset_page(
+        query, sort_column, id_column, cursor, limit, descending
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+def ndjson_export(
+    build_query: Callable[[Session], Query],
+    schema: Type[BaseModel],
+    batch_size: int = EXPORT_BATCH_SIZE,
+    merge_with: Optional[Callable[[], Iterable[Any]]] = None,
+    sort_key: Optional[Callable[[Any], Any]] = None,
+) -> StreamingResponse:
+    """
+    Stream every row of a query as NDJSON.
+
+    The query runs on its own session with ``stream_results``, so rows come
+    from a server-side cursor (a named cursor on Postgres) ``batch_size`` at
+    a time and memory stays flat however many rows match. The generator is
+    synchronous, so Starlette drives it from its thread pool.
+
+    ``merge_with`` supplies more rows in the query's order (such as archived
+    evidence); both streams are merged on ``sort_key``.
+    """
+
+    def rows() -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            query = build_query(db).yield_per(batch_size)  # implies stream_results
+            if merge_with is not None:
+                query = heapq.merge(query, merge_with(), key=sort_key)
+            buffer = []
+            for row in query:
+                buffer.append(schema.model_validate(row).model_dump_json())
+                if len(buffer) >= batch_size:
+                    yield ("\n".join(buffer) + "\n").encode()
+                    buffer = []
+            if buffer:
+                yield ("\n".join(buffer) + "\n").encode()
+        finally:
+            db.close()
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson")
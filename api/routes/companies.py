@@ -1,36 +1,61 @@
 """Company management routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from database.connection import get_db
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database.connection import get_async_db
 from database.models import Company
 from api.schemas import CompanyCreate, CompanyResponse
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_export, paginate
 
 router = APIRouter()
 
 
 @router.post("/", response_model=CompanyResponse, status_code=201)
-async def create_company(company: CompanyCreate, db: Session = Depends(get_db)):
+async def create_company(company: CompanyCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new company."""
     db_company = Company(**company.dict())
     db.add(db_company)
-    db.commit()
-    db.refresh(db_company)
+    await db.commit()
+    await db.refresh(db_company)
     return db_company
 
 
 @router.get("/", response_model=List[CompanyResponse])
-async def list_companies(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """List all companies."""
-    companies = db.query(Company).offset(skip).limit(limit).all()
-    return companies
+async def list_companies(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    skip: int = Query(0, ge=0, deprecated=True, description="Use cursor instead"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List companies, oldest first. Pass the X-Next-Cursor header back as ``cursor`` for the next page."""
+    if skip and not cursor:
+        result = await db.scalars(
+            select(Company).order_by(Company.created_at, Company.id).offset(skip).limit(limit)
+        )
+        return result.all()
+    return await db.run_sync(
+        lambda sync_db: paginate(
+            response, sync_db.query(Company), Company.created_at, Company.id, cursor, limit, descending=False
+        )
+    )
+
+
+@router.get("/export")
+async def export_companies():
+    """Stream every company as NDJSON."""
+    return ndjson_export(
+        lambda db: db.query(Company).order_by(Company.created_at, Company.id),
+        CompanyResponse,
+    )
 
 
 @router.get("/{company_id}", response_model=CompanyResponse)
-async def get_company(company_id: str, db: Session = Depends(get_db)):
+async def get_company(company_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a specific company."""
-    company = db.query(Company).filter(Company.id == company_id).first()
+    company = await db.get(Company, company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     return company
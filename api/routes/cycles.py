@@ -1,85 +1,304 @@
 """Growth cycle execution routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from database.connection import get_db
-from database.models import Company, Job, EvidenceRecord
-from api.schemas import CycleRequest, CycleResponse
-from core.config_loader import load_agents, load_plays, load_kpis
-from core.orchestrator import Orchestrator
-from core.playbooks import generate_jobs_from_plays
-from core.models import Job as CoreJob
-import uuid
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime
+from database.connection import AsyncSessionLocal, get_async_db
+from database.models import Company, Cycle
+from database.bulk import IN_CLAUSE_CHUNK, bulk_insert_cycles, cycle_row, persist_cycle
+from database.cycles import cycle_progress
+from database.job_queue import enqueue_jobs
+from database.timeseries import iter_latest_snapshots
+from api.cache import invalidate_companies_async
+from api.schemas import (
+    CycleRequest, CycleResponse, CycleProgressResponse, BatchCycleRequest, BatchCycleResponse, BatchCycleSummary
+)
+from core.config_loader import ConfigSnapshot, get_config
+from core.async_orchestrator import AsyncOrchestrator, ConcurrencyLimits
+from core.event_log import EventLogSink, shared_evidence_log
+from core.playbooks import generate_jobs_from_plays, generate_jobs_for_companies
+import asyncio
+import os
+import time
 
 router = APIRouter()
 
+# Companies evaluated, run and persisted together in a batch request
+BATCH_CHUNK_SIZE = int(os.getenv("CYCLE_BATCH_CHUNK_SIZE", "500"))
+
+# Seconds between progress polls on a cycle's event stream
+EVENTS_POLL_INTERVAL = float(os.getenv("CYCLE_EVENTS_POLL_INTERVAL", "1.0"))
+
+# Seconds between keep-alive comments on an idle event stream
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("CYCLE_EVENTS_HEARTBEAT_SECONDS", "15"))
+
+# Each cycle request runs on its own orchestrator, so requests proceed
+# concurrently; job slots are shared per config snapshot and event loop, so
+# agents.yml concurrency limits hold across all of them.
+_limits: Optional[ConcurrencyLimits] = None
+_limits_key: Optional[tuple] = None
+
+
+def _request_orchestrator(config: ConfigSnapshot) -> AsyncOrchestrator:
+    global _limits, _limits_key
+    orch = AsyncOrchestrator(list(config.agents))
+    key = (config.version, asyncio.get_running_loop())
+    if _limits is None or _limits_key != key:
+        _limits, _limits_key = ConcurrencyLimits(orch.max_workers, orch.agent_limits), key
+    orch.limits = _limits
+    return orch
+
+
+async def _run_jobs(config: ConfigSnapshot, jobs) -> Tuple[list, float]:
+    """Run jobs through a request's orchestrator; returns (evidence, critical path ms)."""
+    orch = _request_orchestrator(config)
+    for job in jobs:
+        orch.enqueue(job)
+    evidence = await orch.run_cycle_async()
+    event_log = shared_evidence_log()
+    if event_log is not None:
+        # Logged (and fsynced off the event loop) before the caller's transaction
+        await run_in_threadpool(EventLogSink(event_log), evidence)
+    return evidence, orch.last_cycle.critical_path_seconds * 1000
+
+
+def _enqueue_cycle(db: Session, row: dict, jobs) -> None:
+    """Store a background cycle and its queued jobs. Caller commits."""
+    bulk_insert_cycles(db, [row])
+    enqueue_jobs(db, jobs, {row["company_id"]: row["id"]})
+
 
 @router.post("/run", response_model=CycleResponse)
-async def run_growth_cycle(cycle: CycleRequest, db: Session = Depends(get_db)):
-    """Run a complete growth cycle for a company."""
+async def run_growth_cycle(cycle: CycleRequest, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Run a complete growth cycle for a company.
+
+    With ``background`` the cycle and its queued jobs are stored and 202 is
+    returned at once; workers (services/worker.py) run the jobs and
+    ``GET /cycles/{cycle_id}`` reports progress.
+    """
     # Verify company exists
-    company = db.query(Company).filter(Company.id == cycle.company_id).first()
+    company = await db.get(Company, cycle.company_id)
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
-    # Load configuration
-    agents = load_agents()
-    plays_cfg = load_plays()
-    kpi_definitions = load_kpis()
-    
-    # Create orchestrator
-    orch = Orchestrator(agents)
+    # Use the cached configuration snapshot
+    config = get_config()
     
     # Generate jobs from triggered plays
     jobs = generate_jobs_from_plays(
         cycle.company_id,
         cycle.kpi_snapshot,
-        plays_cfg,
-        kpi_definitions
+        config.compiled_plays,
+        config.kpis
     )
     
-    # Convert core jobs to database jobs and enqueue
-    triggered_plays = set()
-    for job in jobs:
-        triggered_plays.add(job.payload.get("play_name", "unknown"))
-        
-        # Save to database
-        db_job = Job(
-            id=job.id,
-            company_id=job.company_id,
-            type=job.type,
-            payload=job.payload,
-            status=job.status.value
+    if cycle.background or cycle.enqueue_only:
+        # Leave execution to services/worker.py
+        row = cycle_row(cycle.company_id, cycle.kpi_snapshot, jobs)
+        await db.run_sync(_enqueue_cycle, row, jobs)
+        await db.commit()
+        await invalidate_companies_async([cycle.company_id])
+        response.status_code = 202
+        return CycleResponse(
+            cycle_id=row["id"],
+            company_id=cycle.company_id,
+            jobs_created=len(jobs),
+            plays_triggered=row["plays_triggered"],
+            evidence_count=0,
+            status=row["status"].value
         )
-        db.add(db_job)
-        orch.enqueue(job)
-    
-    db.commit()
     
-    # Run orchestrator
-    evidence = orch.run_cycle()
+    # Run without blocking the event loop
+    started_at = datetime.utcnow()
+    evidence, critical_path_ms = await _run_jobs(config, jobs)
     
-    # Save evidence to database
-    for ev in evidence:
-        db_evidence = EvidenceRecord(
-            id=ev.id,
-            company_id=ev.company_id,
-            job_id=ev.job_id,
-            event_type=ev.event_type,
-            payload=ev.payload
-        )
-        db.add(db_evidence)
-    
-    db.commit()
+    # Cycle, jobs (with final statuses) and evidence in one bulk transaction
+    row = cycle_row(cycle.company_id, cycle.kpi_snapshot, jobs, finished=True, created_at=started_at)
+    await db.run_sync(persist_cycle, jobs, evidence, [row])
+    await invalidate_companies_async([cycle.company_id])
     
     return CycleResponse(
-        cycle_id=str(uuid.uuid4()),
+        cycle_id=row["id"],
         company_id=cycle.company_id,
         jobs_created=len(jobs),
-        plays_triggered=list(triggered_plays),
+        plays_triggered=row["plays_triggered"],
         evidence_count=len(evidence),
-        status="completed"
+        status=row["status"].value,
+        critical_path_ms=critical_path_ms
     )
 
 
+@router.get("/{cycle_id}", response_model=CycleProgressResponse)
+async def get_cycle(cycle_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get a cycle's status and job progress."""
+    cycle = await db.get(Cycle, cycle_id)
+    if not cycle:
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    return await db.run_sync(cycle_progress, cycle)
+
+
+def _sse(event: str, data: str) -> bytes:
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
 
+async def _cycle_events(request: Request, cycle_id: str) -> AsyncIterator[bytes]:
+    """Emit a progress event whenever job counts change, then a final done event."""
+    last = None
+    last_sent = time.monotonic()
+    while True:
+        # A fresh session per poll, so counts are never served from its identity map
+        async with AsyncSessionLocal() as db:
+            cycle = await db.get(Cycle, cycle_id)
+            if cycle is None:
+                return
+            progress = CycleProgressResponse(**await db.run_sync(cycle_progress, cycle))
+        
+        state = (progress.status, progress.jobs, progress.evidence_count)
+        if progress.status in ("completed", "failed"):
+            yield _sse("done", progress.model_dump_json())
+            return
+        if state != last:
+            yield _sse("progress", progress.model_dump_json())
+            last, last_sent = state, time.monotonic()
+        elif time.monotonic() - last_sent >= EVENTS_HEARTBEAT_SECONDS:
+            yield b": keep-alive\n\n"
+            last_sent = time.monotonic()
+        
+        await asyncio.sleep(EVENTS_POLL_INTERVAL)
+        if await request.is_disconnected():
+            return
+
+
+@router.get("/{cycle_id}/events")
+async def stream_cycle_events(cycle_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
+    """Server-Sent Events stream of a cycle's progress until it finishes."""
+    if not await db.get(Cycle, cycle_id):
+        raise HTTPException(status_code=404, detail="Cycle not found")
+    return StreamingResponse(
+        _cycle_events(request, cycle_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _run_chunk(
+    db: AsyncSession,
+    config: ConfigSnapshot,
+    snapshots: Dict[str, Dict[str, float]]
+) -> Tuple[List[CycleResponse], int, float]:
+    """Evaluate, run and persist one chunk of companies; returns (results, evidence count, critical path ms)."""
+    jobs_by_company = generate_jobs_for_companies(snapshots, config.compiled_plays, config.kpis)
+    all_jobs = [job for jobs in jobs_by_company.values() for job in jobs]
+    started_at = datetime.utcnow()
+    evidence, critical_path_ms = await _run_jobs(config, all_jobs)
+    cycles = {
+        company_id: cycle_row(company_id, snapshots[company_id], jobs, finished=True, created_at=started_at)
+        for company_id, jobs in jobs_by_company.items()
+    }
+    await db.run_sync(persist_cycle, all_jobs, evidence, list(cycles.values()))
+    await invalidate_companies_async(cycles)
+    
+    evidence_counts = {company_id: 0 for company_id in snapshots}
+    for ev in evidence:
+        evidence_counts[ev.company_id] += 1
+    
+    results = []
+    for company_id, jobs in jobs_by_company.items():
+        row = cycles[company_id]
+        results.append(CycleResponse(
+            cycle_id=row["id"],
+            company_id=company_id,
+            jobs_created=len(jobs),
+            plays_triggered=row["plays_triggered"],
+            evidence_count=evidence_counts[company_id],
+            status=row["status"].value
+        ))
+    return results, len(evidence), critical_path_ms
+
+
+async def _iter_chunks(db: AsyncSession, batch: BatchCycleRequest) -> AsyncIterator[Dict[str, Dict[str, float]]]:
+    """Company snapshots for a batch request, ``BATCH_CHUNK_SIZE`` companies at a time."""
+    if batch.all_companies:
+        chunks = iter_latest_snapshots(db.sync_session, BATCH_CHUNK_SIZE)
+        while True:
+            # Each chunk's keyset query runs when the generator is advanced
+            chunk = await db.run_sync(lambda _: next(chunks, None))
+            if chunk is None:
+                return
+            yield dict(chunk)
+    snapshots = {cycle.company_id: cycle.kpi_snapshot for cycle in batch.cycles}
+    company_ids = list(snapshots)
+    for i in range(0, len(company_ids), BATCH_CHUNK_SIZE):
+        yield {company_id: snapshots[company_id] for company_id in company_ids[i:i + BATCH_CHUNK_SIZE]}
+
+
+async def _stream_batch(batch: BatchCycleRequest, config: ConfigSnapshot) -> AsyncIterator[bytes]:
+    """NDJSON: one CycleResponse line per company as each chunk completes, then a summary line."""
+    # The request's session is closed once the response starts, so use our own
+    async with AsyncSessionLocal() as db:
+        summary = BatchCycleSummary(companies=0, jobs_created=0, evidence_count=0, critical_path_ms=0.0)
+        async for snapshots in _iter_chunks(db, batch):
+            results, evidence_count, critical_path_ms = await _run_chunk(db, config, snapshots)
+            summary.companies += len(results)
+            summary.jobs_created += sum(r.jobs_created for r in results)
+            summary.evidence_count += evidence_count
+            summary.critical_path_ms = max(summary.critical_path_ms, critical_path_ms)
+            yield "".join(r.model_dump_json() + "\n" for r in results).encode()
+        yield (f'{{"summary": {summary.model_dump_json()}}}\n').encode()
+
+
+@router.post("/run/batch", response_model=BatchCycleResponse)
+async def run_growth_cycles(batch: BatchCycleRequest, db: AsyncSession = Depends(get_async_db)):
+    """
+    Run growth cycles for many companies, evaluating triggers in bulk.
+
+    Companies are processed in chunks of ``BATCH_CHUNK_SIZE``: one trigger
+    evaluation, one orchestrator cycle and one bulk persist per chunk. With
+    ``all_companies`` every company's latest stored KPIs are used; with
+    ``stream`` results are sent as NDJSON while later chunks still run.
+    """
+    if batch.all_companies == bool(batch.cycles):
+        raise HTTPException(status_code=422, detail="Pass either cycles or all_companies")
+    
+    if batch.cycles:
+        seen, duplicates = set(), set()
+        for cycle in batch.cycles:
+            (duplicates if cycle.company_id in seen else seen).add(cycle.company_id)
+        if duplicates:
+            raise HTTPException(status_code=422, detail=f"Duplicate company_id in cycles: {sorted(duplicates)}")
+
+        # Verify all companies exist with one IN query per chunk of ids
+        company_ids = list(seen)
+        found = set()
+        for i in range(0, len(company_ids), IN_CLAUSE_CHUNK):
+            chunk = company_ids[i:i + IN_CLAUSE_CHUNK]
+            found.update(await db.scalars(select(Company.id).where(Company.id.in_(chunk))))
+        missing = [company_id for company_id in company_ids if company_id not in found]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Companies not found: {missing}")
+    
+    config = get_config()
+    if batch.stream:
+        return StreamingResponse(_stream_batch(batch, config), media_type="application/x-ndjson")
+    
+    results: List[CycleResponse] = []
+    evidence_count = 0
+    critical_path_ms = 0.0
+    async for snapshots in _iter_chunks(db, batch):
+        chunk_results, chunk_evidence, chunk_critical_ms = await _run_chunk(db, config, snapshots)
+        results.extend(chunk_results)
+        evidence_count += chunk_evidence
+        critical_path_ms = max(critical_path_ms, chunk_critical_ms)
+    
+    return BatchCycleResponse(
+        cycles=results,
+        jobs_created=sum(r.jobs_created for r in results),
+        evidence_count=evidence_count,
+        critical_path_ms=critical_path_ms
+    )
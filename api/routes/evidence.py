@@ -1,46 +1,138 @@
 """Evidence records routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 from datetime import datetime, timedelta
-from database.connection import get_db
+from database.archive import evidence_archive, naive_utc
+from database.bulk import to_core_evidence
+from database.connection import get_async_db
 from database.models import EvidenceRecord
 from api.schemas import EvidenceCreate, EvidenceResponse
+from api.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, keyset_page, ndjson_export
+)
+from api.cache import company_scope, invalidate_companies_async, response_cache
+from core.event_log import EventLogSink, shared_evidence_log
 
 router = APIRouter()
 
 
 @router.post("/", response_model=EvidenceResponse, status_code=201)
-async def create_evidence(evidence: EvidenceCreate, db: Session = Depends(get_db)):
+async def create_evidence(evidence: EvidenceCreate, db: AsyncSession = Depends(get_async_db)):
     """Create an evidence record."""
     db_evidence = EvidenceRecord(**evidence.dict())
     db.add(db_evidence)
-    db.commit()
-    db.refresh(db_evidence)
+    event_log = shared_evidence_log()
+    if event_log is not None:
+        await db.flush()  # assigns id and occurred_at
+        await run_in_threadpool(EventLogSink(event_log), [to_core_evidence(db_evidence)])
+    await db.commit()
+    await db.refresh(db_evidence)
+    await invalidate_companies_async([db_evidence.company_id])
     return db_evidence
 
 
+def _company_evidence(
+    db: Session,
+    company_id: str,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    event_type: Optional[str]
+):
+    query = db.query(EvidenceRecord).filter(EvidenceRecord.company_id == company_id)
+    if since is not None:
+        query = query.filter(EvidenceRecord.occurred_at >= since)
+    if until is not None:
+        query = query.filter(EvidenceRecord.occurred_at < until)
+    if event_type:
+        query = query.filter(EvidenceRecord.event_type == event_type)
+    return query
+
+
+def _position(row: Any) -> Tuple[datetime, str]:
+    """Sort key shared by database rows and archived rows (dicts)."""
+    if isinstance(row, dict):
+        return row["occurred_at"], row["id"]
+    return naive_utc(row.occurred_at), row.id
+
+
+async def _evidence_page(
+    db: AsyncSession,
+    response: Response,
+    company_id: str,
+    since: Optional[datetime],
+    event_type: Optional[str],
+    cursor: Optional[str],
+    limit: int
+) -> List[EvidenceResponse]:
+    """
+    A newest-first keyset page over hot rows in the database and archived
+    rows, merged. The archive is only read when its manifest lists files
+    for the company that can match the filters.
+    """
+    def hot(sync_db: Session):
+        query = _company_evidence(sync_db, company_id, since, None, event_type)
+        return keyset_page(query, EvidenceRecord.occurred_at, EvidenceRecord.id, cursor, limit + 1)[0]
+
+    rows = list(await db.run_sync(hot))
+    if evidence_archive.files(company_id, since, None, event_type):
+        before = decode_cursor(cursor) if cursor else None
+        cold = await run_in_threadpool(evidence_archive.page, company_id, since, event_type, before, limit + 1)
+        rows = sorted(rows + cold, key=_position, reverse=True)
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*_position(rows[-1]))
+    return [EvidenceResponse.model_validate(row) for row in rows]
+
+
 @router.get("/company/{company_id}", response_model=List[EvidenceResponse])
 async def get_company_evidence(
     company_id: str,
+    request: Request,
+    response: Response,
     days: Optional[int] = 30,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    event_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get evidence records for a company."""
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    evidence = db.query(EvidenceRecord).filter(
-        EvidenceRecord.company_id == company_id,
-        EvidenceRecord.occurred_at >= cutoff
-    ).order_by(EvidenceRecord.occurred_at.desc()).limit(limit).all()
-    return evidence
+    """Get evidence records for a company, newest first, archived ones included. Page with the X-Next-Cursor header."""
+    since = datetime.utcnow() - timedelta(days=days) if days else None
+    return await response_cache.respond(
+        request, List[EvidenceResponse],
+        lambda: _evidence_page(db, response, company_id, since, event_type, cursor, limit),
+        company_scope(company_id), response=response
+    )
+
+
+@router.get("/company/{company_id}/export")
+async def export_company_evidence(
+    company_id: str,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    event_type: Optional[str] = None
+):
+    """Stream a company's evidence records as NDJSON, oldest first, optionally within [since, until), archived ones included."""
+    return ndjson_export(
+        lambda db: _company_evidence(db, company_id, since, until, event_type).order_by(
+            EvidenceRecord.occurred_at, EvidenceRecord.id
+        ),
+        EvidenceResponse,
+        merge_with=lambda: evidence_archive.iter_rows(company_id, since, until, event_type),
+        sort_key=_position,
+    )
 
 
 @router.get("/{evidence_id}", response_model=EvidenceResponse)
-async def get_evidence(evidence_id: str, db: Session = Depends(get_db)):
-    """Get a specific evidence record."""
-    evidence = db.query(EvidenceRecord).filter(EvidenceRecord.id == evidence_id).first()
+async def get_evidence(evidence_id: str, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific evidence record, archived ones included."""
+    evidence = await db.get(EvidenceRecord, evidence_id)
+    if not evidence:
+        evidence = await run_in_threadpool(evidence_archive.get, evidence_id)
     if not evidence:
         raise HTTPException(status_code=404, detail="Evidence not found")
     return evidence
@@ -1,44 +1,68 @@
 """Job management routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database.connection import get_db
+from database.connection import get_async_db
 from database.models import Job, JobStatus
 from api.schemas import JobCreate, JobResponse
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_export, paginate
+from api.cache import company_scope, invalidate_companies_async, response_cache
 
 router = APIRouter()
 
 
 @router.post("/", response_model=JobResponse, status_code=201)
-async def create_job(job: JobCreate, db: Session = Depends(get_db)):
+async def create_job(job: JobCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new job."""
     db_job = Job(**job.dict())
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    await invalidate_companies_async([db_job.company_id])
     return db_job
 
 
+def _company_jobs(db: Session, company_id: str, status: Optional[JobStatus]):
+    query = db.query(Job).filter(Job.company_id == company_id)
+    if status:
+        query = query.filter(Job.status == status)
+    return query
+
+
 @router.get("/company/{company_id}", response_model=List[JobResponse])
 async def get_company_jobs(
     company_id: str,
+    request: Request,
+    response: Response,
     status: Optional[JobStatus] = None,
-    limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get jobs for a company."""
-    query = db.query(Job).filter(Job.company_id == company_id)
-    if status:
-        query = query.filter(Job.status == status)
-    jobs = query.order_by(Job.created_at.desc()).limit(limit).all()
-    return jobs
+    """Get jobs for a company, newest first. Page with the X-Next-Cursor header."""
+    def build(sync_db: Session):
+        query = _company_jobs(sync_db, company_id, status)
+        return paginate(response, query, Job.created_at, Job.id, cursor, limit)
+    return await response_cache.respond(
+        request, List[JobResponse], lambda: db.run_sync(build), company_scope(company_id), response=response
+    )
+
+
+@router.get("/company/{company_id}/export")
+async def export_company_jobs(company_id: str, status: Optional[JobStatus] = None):
+    """Stream every job for a company as NDJSON, newest first."""
+    return ndjson_export(
+        lambda db: _company_jobs(db, company_id, status).order_by(Job.created_at.desc(), Job.id.desc()),
+        JobResponse,
+    )
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job(job_id: str, db: Session = Depends(get_db)):
+async def get_job(job_id: str, db: AsyncSession = Depends(get_async_db)):
     """Get a specific job."""
-    job = db.query(Job).filter(Job.id == job_id).first()
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
@@ -1,58 +1,260 @@
 """KPI management routes."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from datetime import datetime, timedelta
-from database.connection import get_db
+from database.connection import get_async_db
 from database.models import KPI
-from api.schemas import KPICreate, KPIResponse
+from database.timeseries import KPIBatchWriter, get_rollups, latest_kpis, latest_values, record_kpis
+from api.schemas import (
+    KPICreate, KPIResponse, KPIIngestResponse, KPIRollupResponse, KPIBulkIngestResponse, KPIBulkError
+)
+from api.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ndjson_export, paginate
+from api.cache import company_scope, invalidate_companies_async, response_cache
+from core.config_loader import get_config
+from core.kpis import KPIPointError, parse_point
+import csv
+import json
+import os
+import time
 
 router = APIRouter()
 
+# Points per insert/commit on the bulk endpoint
+BULK_BATCH_SIZE = int(os.getenv("KPI_BULK_BATCH_SIZE", "5000"))
+# Rejected lines echoed back in a bulk response (all are counted)
+BULK_MAX_ERRORS = int(os.getenv("KPI_BULK_MAX_ERRORS", "100"))
 
-@router.post("/", response_model=KPIResponse, status_code=201)
-async def create_kpi(kpi: KPICreate, db: Session = Depends(get_db)):
-    """Record a KPI snapshot."""
-    db_kpi = KPI(**kpi.dict())
+_NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json")
+_CSV_TYPES = ("text/csv",)
+_CSV_REQUIRED = ("company_id", "name", "value")
+
+
+@router.post("/", response_model=KPIIngestResponse, status_code=201)
+async def create_kpi(kpi: KPICreate, db: AsyncSession = Depends(get_async_db)):
+    """Record a KPI snapshot and report plays whose trigger state changed."""
+    # Only plays referencing this KPI can change state
+    evaluator = get_config().evaluator
+    affected = evaluator.affected_plays([kpi.name])
+    names = {name for play in affected for name in play.kpi_names}
+    
+    snapshot = await db.run_sync(latest_values, kpi.company_id, names) if names else {}
+    previous_state = evaluator.evaluate(snapshot, [kpi.name])
+    
+    # Raw point, latest value and rollups in one transaction
+    data = kpi.dict()
+    data["meta_data"] = data.pop("metadata") or {}
+    db_kpi = KPI(**data, recorded_at=datetime.utcnow())
     db.add(db_kpi)
-    db.commit()
-    db.refresh(db_kpi)
-    return db_kpi
+    await db.flush()
+    await db.run_sync(record_kpis, [db_kpi])
+    await db.commit()
+    await db.refresh(db_kpi)
+    await invalidate_companies_async([kpi.company_id])
+    
+    snapshot[kpi.name] = kpi.value
+    delta = evaluator.update(previous_state, snapshot, [kpi.name])
+    
+    response = KPIIngestResponse.model_validate(db_kpi)
+    response.plays_fired = delta.fired
+    response.plays_cleared = delta.cleared
+    return response
+
+
+def _company_kpis(db: Session, company_id: str, since: Optional[datetime], name: Optional[str]):
+    query = db.query(KPI).filter(KPI.company_id == company_id)
+    if since is not None:
+        query = query.filter(KPI.recorded_at >= since)
+    if name:
+        query = query.filter(KPI.name == name)
+    return query
 
 
 @router.get("/company/{company_id}", response_model=List[KPIResponse])
 async def get_company_kpis(
     company_id: str,
+    request: Request,
+    response: Response,
     days: Optional[int] = 30,
-    db: Session = Depends(get_db)
+    name: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get KPIs for a company."""
-    cutoff = datetime.utcnow() - timedelta(days=days)
-    kpis = db.query(KPI).filter(
-        KPI.company_id == company_id,
-        KPI.recorded_at >= cutoff
-    ).order_by(KPI.recorded_at.desc()).all()
-    return kpis
+    """Get KPIs for a company, newest first. Page with the X-Next-Cursor header."""
+    def build(sync_db: Session):
+        since = datetime.utcnow() - timedelta(days=days) if days else None
+        query = _company_kpis(sync_db, company_id, since, name)
+        return paginate(response, query, KPI.recorded_at, KPI.id, cursor, limit)
+    return await response_cache.respond(
+        request, List[KPIResponse], lambda: db.run_sync(build), company_scope(company_id), response=response
+    )
+
+
+@router.get("/company/{company_id}/export")
+async def export_company_kpis(company_id: str, since: Optional[datetime] = None, name: Optional[str] = None):
+    """Stream a company's KPI points as NDJSON, oldest first."""
+    return ndjson_export(
+        lambda db: _company_kpis(db, company_id, since, name).order_by(KPI.recorded_at, KPI.id),
+        KPIResponse,
+    )
 
 
 @router.get("/company/{company_id}/latest", response_model=List[KPIResponse])
-async def get_latest_kpis(company_id: str, db: Session = Depends(get_db)):
+async def get_latest_kpis(company_id: str, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get latest KPI snapshot for each metric."""
-    # Get the most recent KPI for each name
-    subquery = db.query(
-        KPI.name,
-        db.func.max(KPI.recorded_at).label('max_time')
-    ).filter(
-        KPI.company_id == company_id
-    ).group_by(KPI.name).subquery()
-    
-    kpis = db.query(KPI).join(
-        subquery,
-        (KPI.name == subquery.c.name) & (KPI.recorded_at == subquery.c.max_time)
-    ).filter(KPI.company_id == company_id).all()
-    
-    return kpis
+    return await response_cache.respond(
+        request, List[KPIResponse], lambda: db.run_sync(latest_kpis, company_id), company_scope(company_id)
+    )
+
+
+@router.get("/company/{company_id}/rollups", response_model=List[KPIRollupResponse])
+async def get_kpi_rollups(
+    company_id: str,
+    request: Request,
+    granularity: str = Query("day", pattern="^(hour|day)$"),
+    days: int = 30,
+    name: Optional[List[str]] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get pre-aggregated hourly or daily KPI values for charts."""
+    since = datetime.utcnow() - timedelta(days=days)
+    return await response_cache.respond(
+        request, List[KPIRollupResponse], lambda: db.run_sync(get_rollups, company_id, granularity, since, name),
+        company_scope(company_id)
+    )
+
+
+async def _read_lines(request: Request) -> AsyncIterator[List[Tuple[int, bytes]]]:
+    """Complete lines of the request body, per received chunk, with 1-based line numbers."""
+    line_no = 0
+    remainder = b""
+    async for chunk in request.stream():
+        if not chunk:
+            continue
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        numbered = []
+        for line in lines:
+            line_no += 1
+            numbered.append((line_no, line))
+        yield numbered
+    if remainder:
+        yield [(line_no + 1, remainder)]
+
+
+def _decode(line_no: int, line: bytes, reject) -> Optional[str]:
+    try:
+        text = line.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        reject(line_no, "not valid UTF-8")
+        return None
+    return text or None
+
+
+@router.post("/bulk", response_model=KPIBulkIngestResponse)
+async def bulk_ingest_kpis(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Ingest a large stream of KPI points.
+
+    The body is NDJSON (one ``{"company_id", "name", "value", "recorded_at",
+    "target"}`` object per line) or CSV with a header row, chosen by
+    Content-Type. Lines are validated as they arrive; valid points are
+    written in batches of ``BULK_BATCH_SIZE``, each committed with its
+    latest-value and rollup updates, so a rejected line never fails the
+    upload. Status comes from kpis.yml thresholds.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in _CSV_TYPES:
+        is_csv = True
+    elif content_type in _NDJSON_TYPES:
+        is_csv = False
+    else:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported content type {content_type!r}; send application/x-ndjson or text/csv",
+        )
+
+    start = time.perf_counter()
+    # The writer runs on the session's sync facade, entered through run_sync
+    writer = KPIBatchWriter(db.sync_session, get_config().kpis, BULK_BATCH_SIZE)
+    default_time = datetime.utcnow()
+    errors: List[KPIBulkError] = []
+    rejected = 0
+    touched = set()
+    points: List[Tuple[int, dict]] = []
+
+    def reject(line_no: int, error: str):
+        nonlocal rejected
+        rejected += 1
+        if len(errors) < BULK_MAX_ERRORS:
+            errors.append(KPIBulkError(line=line_no, error=error))
+
+    def add(line_no: int, record):
+        try:
+            point = parse_point(record, default_time)
+        except KPIPointError as e:
+            reject(line_no, str(e))
+            return
+        touched.add(point["company_id"])
+        points.append((line_no, point))
+
+    def write(sync_db: Session, flush: bool = False) -> List[Tuple[int, str]]:
+        """Hand parsed points to the writer, which commits whenever a batch fills."""
+        rejections = []
+        for line_no, point in points:
+            rejections.extend(writer.add(line_no, point))
+        points.clear()
+        if flush:
+            rejections.extend(writer.flush())
+        return rejections
+
+    header: Optional[List[str]] = None
+    try:
+        async for lines in _read_lines(request):
+            texts = []
+            for line_no, line in lines:
+                text = _decode(line_no, line, reject)
+                if text is not None:
+                    texts.append((line_no, text))
+
+            if not is_csv:
+                for line_no, text in texts:
+                    try:
+                        record = json.loads(text)
+                    except ValueError as e:
+                        reject(line_no, f"invalid JSON: {e}")
+                        continue
+                    add(line_no, record)
+            else:
+                if header is None and texts:
+                    header = [column.strip() for column in next(csv.reader([texts.pop(0)[1]]))]
+                    missing = [column for column in _CSV_REQUIRED if column not in header]
+                    if missing:
+                        raise HTTPException(status_code=400, detail=f"CSV header missing columns: {missing}")
+                for (line_no, _), values in zip(texts, csv.reader(text for _, text in texts)):
+                    if len(values) != len(header):
+                        reject(line_no, f"expected {len(header)} columns, got {len(values)}")
+                        continue
+                    add(line_no, dict(zip(header, values)))
 
+            # One trip into the database per received chunk, not per point
+            for ref, error in await db.run_sync(write):
+                reject(ref, error)
 
+        for ref, error in await db.run_sync(write, True):
+            reject(ref, error)
+    finally:
+        # Batches commit as they fill, so evict even if the upload broke off
+        await invalidate_companies_async(touched)
+    errors.sort(key=lambda e: e.line)
 
+    return KPIBulkIngestResponse(
+        accepted=writer.accepted,
+        rejected=rejected,
+        batches=writer.batches,
+        errors=errors,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
@@ -1,36 +1,35 @@
 """Growth plays routes."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from typing import List, Dict
-from core.config_loader import load_plays, load_kpis
+from core.config_loader import get_config
+from api.cache import response_cache
 from api.schemas import KPISnapshot
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Dict])
-async def list_plays():
+async def list_plays(request: Request):
     """List all available growth plays."""
-    plays = load_plays()
-    return plays
+    # Keyed on the config version, so a plays.yml reload is never served stale
+    config = get_config()
+    return await response_cache.respond(request, List[Dict], lambda: list(config.plays), vary=config.version)
 
 
 @router.post("/evaluate")
 async def evaluate_plays(snapshot: KPISnapshot):
     """Evaluate which plays should trigger for given KPI snapshot."""
-    from core.playbooks import evaluate_triggers, generate_jobs_from_plays
-    
-    plays_cfg = load_plays()
-    kpi_definitions = load_kpis()
+    plays_cfg = get_config().compiled_plays
     
     triggered_plays = []
     for play in plays_cfg:
-        if evaluate_triggers(snapshot.kpis, play, kpi_definitions):
+        if play.matches(snapshot.kpis):
             triggered_plays.append({
-                "id": play["id"],
-                "name": play["name"],
-                "intent": play.get("intent", ""),
-                "impact_hypothesis": play.get("impact_hypothesis", "")
+                "id": play.id,
+                "name": play.name,
+                "intent": play.play.get("intent", ""),
+                "impact_hypothesis": play.play.get("impact_hypothesis", "")
             })
     
     return {
@@ -11,6 +11,7 @@ class JobStatus(str, Enum):
     RUNNING = "running"
     SUCCEEDED = "succeeded"
     FAILED = "failed"
+    SKIPPED = "skipped"
 
 
 class KPIStatus(str, Enum):
@@ -58,13 +59,51 @@ class KPIResponse(BaseModel):
     value: float
     target: Optional[float] = None
     status: KPIStatus
-    metadata: Dict
+    metadata: Dict = Field(default_factory=dict, validation_alias="meta_data")  # column renamed in the model
     recorded_at: datetime
     
     class Config:
         from_attributes = True
 
 
+class KPIIngestResponse(KPIResponse):
+    """KPI response plus the plays whose trigger state changed."""
+    plays_fired: List[str] = []
+    plays_cleared: List[str] = []
+
+
+class KPIRollupResponse(BaseModel):
+    """Aggregated KPI values for one hour or day bucket."""
+    company_id: str
+    name: str
+    granularity: str
+    bucket_start: datetime
+    count: int
+    min_value: float
+    max_value: float
+    avg_value: float
+    last_value: float
+    last_recorded_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class KPIBulkError(BaseModel):
+    """A rejected line of a bulk KPI upload."""
+    line: int
+    error: str
+
+
+class KPIBulkIngestResponse(BaseModel):
+    """Outcome of a streamed bulk KPI upload."""
+    accepted: int
+    rejected: int
+    batches: List[int] = Field(default_factory=list, description="Points committed per batch")
+    errors: List[KPIBulkError] = Field(default_factory=list, description="First rejected lines")
+    elapsed_ms: float
+
+
 class KPISnapshot(BaseModel):
     """KPI snapshot for play evaluation."""
     kpis: Dict[str, float] = Field(..., description="KPI name to value mapping")
@@ -114,6 +153,8 @@ class EvidenceResponse(BaseModel):
 class CycleRequest(BaseModel):
     company_id: str
     kpi_snapshot: Dict[str, float]
+    background: bool = Field(False, description="Return 202 at once and let workers run the jobs; poll GET /cycles/{id}")
+    enqueue_only: bool = Field(False, description="Alias for background")
 
 
 class CycleResponse(BaseModel):
@@ -123,4 +164,40 @@ class CycleResponse(BaseModel):
     plays_triggered: List[str]
     evidence_count: int
     status: str
+    critical_path_ms: Optional[float] = None  # longest chain of dependent job durations
+
+
+
+class BatchCycleRequest(BaseModel):
+    cycles: List[CycleRequest] = Field(default_factory=list, description="One entry per company")
+    all_companies: bool = Field(False, description="Run every company with stored KPIs, using their latest values")
+    stream: bool = Field(False, description="Stream one NDJSON line per company as results complete")
+
+
+class BatchCycleResponse(BaseModel):
+    cycles: List[CycleResponse]
+    jobs_created: int
+    evidence_count: int
+    critical_path_ms: Optional[float] = None
+
+
+class CycleProgressResponse(BaseModel):
+    """Stored cycle with live job progress."""
+    cycle_id: str
+    company_id: str
+    status: str
+    jobs_created: int
+    jobs: Dict[str, int] = Field(..., description="Job count per status")
+    evidence_count: int
+    plays_triggered: List[str]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    elapsed_seconds: float
+
 
+class BatchCycleSummary(BaseModel):
+    """Final line of a streamed batch run."""
+    companies: int
+    jobs_created: int
+    evidence_count: int
+    critical_path_ms: Optional[float] = None
@@ -0,0 +1,203 @@
+"""Load test: API requests/second under concurrent clients.
+
+Starts the API under uvicorn on a fresh SQLite database (or targets a
+running server with ``--url``), seeds companies and KPIs, then runs
+``--clients`` concurrent clients for ``--duration`` seconds over a mix of
+KPI, job and evidence reads plus KPI writes. The response cache is disabled
+so every request reaches the database.
+
+To compare two revisions on the same machine, point ``--app-dir`` at a
+checkout of each (e.g. ``git worktree add /tmp/before HEAD~1``).
+
+Usage:
+    python benchmarks/bench_api_concurrency.py
+    python benchmarks/bench_api_concurrency.py --clients 64 --duration 20
+    python benchmarks/bench_api_concurrency.py --app-dir /tmp/before
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+KPI_NAMES = ["revenue_total_30d", "cr_main_funnel", "sessions_main_30d", "aov_main"]
+
+# (weight, name) of each request kind in the mix
+MIX = [
+    (40, "kpi_latest"),
+    (20, "kpi_list"),
+    (15, "jobs_list"),
+    (15, "evidence_list"),
+    (10, "kpi_write"),
+]
+
+
+def start_server(app_dir: Path, port: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+        API_CACHE_BACKEND="none",
+        PYTHONPATH=str(app_dir),
+    )
+    return subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=app_dir,
+        env=env,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/api/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("API did not become ready")
+
+
+async def seed(
+    client: httpx.AsyncClient, companies: int, kpis_per_company: int
+) -> list:
+    company_ids = []
+    for i in range(companies):
+        response = await client.post(
+            "/api/v1/companies/", json={"name": f"Load Co {i}"}
+        )
+        response.raise_for_status()
+        company_ids.append(response.json()["id"])
+    lines = "".join(
+        f'{{"company_id": "{cid}", "name": "{KPI_NAMES[j % len(KPI_NAMES)]}", "value": {j}}}\n'
+        for cid in company_ids
+        for j in range(kpis_per_company)
+    )
+    response = await client.post(
+        "/api/v1/kpis/bulk",
+        content=lines,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    response.raise_for_status()
+    # One finished cycle per company so job and evidence lists are non-empty
+    for cid in company_ids:
+        response = await client.post(
+            "/api/v1/cycles/run",
+            json={
+                "company_id": cid,
+                "kpi_snapshot": {"cr_main_funnel": 0.001, "revenue_total_30d": 10},
+            },
+        )
+        response.raise_for_status()
+    return company_ids
+
+
+def request_for(kind: str, company_id: str, rng: random.Random):
+    if kind == "kpi_latest":
+        return "GET", f"/api/v1/kpis/company/{company_id}/latest", None
+    if kind == "kpi_list":
+        return "GET", f"/api/v1/kpis/company/{company_id}?limit=50", None
+    if kind == "jobs_list":
+        return "GET", f"/api/v1/jobs/company/{company_id}?limit=50", None
+    if kind == "evidence_list":
+        return "GET", f"/api/v1/evidence/company/{company_id}?limit=50", None
+    point = {
+        "company_id": company_id,
+        "name": rng.choice(KPI_NAMES),
+        "value": round(rng.uniform(0, 5000), 2),
+    }
+    return "POST", "/api/v1/kpis/", point
+
+
+async def client_loop(client, company_ids, deadline, latencies, errors, seed_value):
+    rng = random.Random(seed_value)
+    kinds = [kind for weight, kind in MIX for _ in range(weight)]
+    while time.monotonic() < deadline:
+        method, path, body = request_for(
+            rng.choice(kinds), rng.choice(company_ids), rng
+        )
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, path, json=body)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - start)
+        else:
+            errors.append(path)
+
+
+async def run(args):
+    server = None
+    url = args.url
+    if not url:
+        url = f"http://127.0.0.1:{args.port}"
+        server = start_server(Path(args.app_dir).resolve(), args.port)
+    try:
+        limits = httpx.Limits(
+            max_connections=args.clients, max_keepalive_connections=args.clients
+        )
+        async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as client:
+            await wait_ready(client)
+            company_ids = await seed(client, args.companies, args.kpis)
+
+            latencies, errors = [], []
+            start = time.monotonic()
+            deadline = start + args.duration
+            await asyncio.gather(
+                *(
+                    client_loop(client, company_ids, deadline, latencies, errors, i)
+                    for i in range(args.clients)
+                )
+            )
+            elapsed = time.monotonic() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    pct = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    print(f"  {args.clients} clients, {elapsed:.1f}s, app {args.url or args.app_dir}")
+    print(f"  requests  {len(latencies):>8,}  errors {len(errors)}")
+    print(f"  req/s     {len(latencies) / elapsed:>8,.0f}")
+    print(
+        f"  latency   p50 {pct(0.50):.1f}ms  p95 {pct(0.95):.1f}ms  p99 {pct(0.99):.1f}ms"
+        f"  mean {statistics.fmean(latencies) * 1000:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument(
+        "--kpis", type=int, default=200, help="KPI points seeded per company"
+    )
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--url", help="Target a running API instead of starting one")
+    parser.add_argument("--app-dir", default=str(Path(__file__).resolve().parents[1]))
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
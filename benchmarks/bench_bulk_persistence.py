@@ -0,0 +1,100 @@
+"""Benchmark: persisting evidence with per-row ORM adds vs. the bulk insert path.
+
+Writes ``--records`` evidence rows into a fresh SQLite database twice, once
+with ``db.add`` per record (the old cycle route) and once with
+``database.bulk.bulk_insert_evidence``, each in a single transaction.
+
+Usage:
+    python benchmarks/bench_bulk_persistence.py
+    python benchmarks/bench_bulk_persistence.py --records 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Point the app at a throwaway database before database.connection is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from core.models import EvidenceRecord
+from database.bulk import bulk_insert_evidence
+from database.connection import SessionLocal, init_db
+from database.models import Company, EvidenceRecord as EvidenceRow
+
+
+def make_records(n: int, company_id: str) -> list:
+    now = datetime.utcnow()
+    return [
+        EvidenceRecord(
+            id=str(uuid.uuid4()),
+            company_id=company_id,
+            job_id=None,
+            event_type="play_executed",
+            occurred_at=now,
+            payload={
+                "play_id": f"play_{i % 50}",
+                "step": i % 7,
+                "message": "Executed play step",
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def orm_per_row(db, records):
+    for ev in records:
+        db.add(
+            EvidenceRow(
+                id=ev.id,
+                company_id=ev.company_id,
+                job_id=ev.job_id,
+                event_type=ev.event_type,
+                payload=ev.payload,
+                occurred_at=ev.occurred_at,
+            )
+        )
+    db.commit()
+
+
+def bulk(db, records):
+    bulk_insert_evidence(db, records)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100_000)
+    args = parser.parse_args()
+
+    init_db()
+    db = SessionLocal()
+    company = Company(name="Bench Co")
+    db.add(company)
+    db.commit()
+
+    print(f"Persisting {args.records} evidence records per run (SQLite)")
+    timings = {}
+    for name, fn in (("orm_per_row", orm_per_row), ("bulk_insert", bulk)):
+        records = make_records(args.records, company.id)
+        start = time.perf_counter()
+        fn(db, records)
+        timings[name] = time.perf_counter() - start
+        print(
+            f"  {name:<12} {timings[name]:8.2f}s  {args.records / timings[name]:>10,.0f} rows/s"
+        )
+
+    total = db.query(EvidenceRow).count()
+    db.close()
+    assert total == 2 * args.records, f"expected {2 * args.records} rows, found {total}"
+    print(f"Speedup: {timings['orm_per_row'] / timings['bulk_insert']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
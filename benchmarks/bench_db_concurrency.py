@@ -0,0 +1,250 @@
+"""Benchmark: mixed concurrent readers and writers under two engine profiles.
+
+Each profile runs against a fresh SQLite file. ``--writers`` processes
+record KPI points the way ``POST /api/v1/kpis/`` does: read latest values,
+insert, upsert latest and rollups, commit (``--batch`` points per commit
+models bulk ingest and cycle persistence). ``--readers`` processes load a
+page of recent points, latest snapshots and daily rollups, and
+``--exporters`` stream the whole table slowly, as an NDJSON export to a slow
+client does. Separate
+processes (as API, workers and bi_cli are) contend on SQLite's file locks
+rather than on one interpreter's GIL. All run for ``--duration`` seconds.
+
+Profiles:
+    legacy  rollback journal, synchronous=FULL, 5s busy timeout, no mmap,
+            2 MiB page cache, pool 5+10 (the engine's previous defaults)
+    tuned   the DB_* defaults in database/connection.py (WAL, NORMAL, ...)
+
+Usage:
+    python benchmarks/bench_db_concurrency.py
+    python benchmarks/bench_db_concurrency.py --writers 8 --readers 16 --duration 15
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PROFILES = {
+    "legacy": {
+        "DB_SQLITE_JOURNAL_MODE": "DELETE",
+        "DB_SQLITE_SYNCHRONOUS": "FULL",
+        "DB_SQLITE_BUSY_TIMEOUT_MS": "5000",
+        "DB_SQLITE_MMAP_SIZE": "0",
+        "DB_SQLITE_CACHE_SIZE": "-2000",
+        "DB_POOL_SIZE": "5",
+        "DB_POOL_MAX_OVERFLOW": "10",
+    },
+    "tuned": {},
+}
+
+KPI_NAMES = ["revenue_total_30d", "cr_main_funnel", "sessions_main_30d", "aov_main"]
+
+
+def run_profile(args):
+    """Profile process: seed, fork the workload, print one JSON result line."""
+    sys.path.insert(0, str(ROOT))
+    from datetime import datetime, timedelta
+    from sqlalchemy.exc import OperationalError
+    import uuid
+    from database.bulk import bulk_insert_kpis
+    from database.connection import SessionLocal, engine, init_db
+    from database.models import KPI, Company, KPIStatus
+    from database.timeseries import get_rollups, latest_kpis, latest_values, record_kpis
+
+    init_db()
+    db = SessionLocal()
+    companies = [Company(name=f"Bench Co {i}") for i in range(args.companies)]
+    db.add_all(companies)
+    db.commit()
+    company_ids = [c.id for c in companies]
+    seed_time = datetime.utcnow()
+    bulk_insert_kpis(
+        db,
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "company_id": company_ids[i % len(company_ids)],
+                "name": KPI_NAMES[i % len(KPI_NAMES)],
+                "value": float(i),
+                "status": KPIStatus.OK,
+                "meta_data": {},
+                "recorded_at": seed_time - timedelta(minutes=i),
+            }
+            for i in range(args.seed_points)
+        ],
+    )
+    db.commit()
+    db.close()
+
+    engine.dispose()  # each forked process opens its own connections
+
+    def write(db, rng):
+        company_id = rng.choice(company_ids)
+        latest_values(db, company_id, KPI_NAMES)
+        kpis = [
+            KPI(
+                company_id=company_id,
+                name=rng.choice(KPI_NAMES),
+                value=rng.uniform(0, 5000),
+                status=KPIStatus.OK,
+                meta_data={},
+                recorded_at=datetime.utcnow(),
+            )
+            for _ in range(args.batch)
+        ]
+        db.add_all(kpis)
+        db.flush()
+        record_kpis(db, kpis)
+        db.commit()
+
+    def read(db, rng):
+        company_id = rng.choice(company_ids)
+        db.query(KPI).filter(KPI.company_id == company_id).order_by(
+            KPI.recorded_at.desc()
+        ).limit(200).all()
+        latest_kpis(db, company_id)
+        get_rollups(db, company_id, "day", datetime.utcnow() - timedelta(days=30), None)
+        db.rollback()  # end the read transaction, as a request's session close would
+
+    def export(db, rng):
+        # One long read transaction, paced like a slow download
+        for i, _ in enumerate(db.query(KPI).yield_per(200)):
+            if i % 200 == 0:
+                time.sleep(0.05)
+        db.rollback()
+
+    def loop(kind, op, seed, deadline, queue):
+        rng = random.Random(seed)
+        latencies, failed = [], 0
+        db = SessionLocal()
+        try:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                try:
+                    op(db, rng)
+                    latencies.append(time.perf_counter() - start)
+                except OperationalError:
+                    db.rollback()
+                    failed += 1
+        finally:
+            db.close()
+        queue.put((kind, latencies, failed))
+
+    ctx = multiprocessing.get_context("fork")
+    queue = ctx.Queue()
+    deadline = time.monotonic() + args.duration
+    roles = [("write", write)] * args.writers + [("read", read)] * args.readers
+    roles += [("export", export)] * args.exporters
+    procs = [
+        ctx.Process(target=loop, args=(kind, op, i, deadline, queue))
+        for i, (kind, op) in enumerate(roles)
+    ]
+    start = time.monotonic()
+    for p in procs:
+        p.start()
+    results = {"write": [], "read": [], "export": []}
+    errors = {"write": 0, "read": 0, "export": 0}
+    for _ in procs:
+        kind, latencies, failed = queue.get()
+        results[kind].extend(latencies)
+        errors[kind] += failed
+    for p in procs:
+        p.join()
+    elapsed = time.monotonic() - start
+
+    out = {"elapsed": elapsed}
+    for kind, latencies in results.items():
+        latencies.sort()
+        pct = lambda q: (
+            latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+            if latencies
+            else 0.0
+        )
+        out[kind] = {
+            "ops": len(latencies),
+            "per_s": len(latencies) / elapsed,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+            "locked": errors[kind],
+        }
+    print(json.dumps(out))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--exporters", type=int, default=1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument(
+        "--batch", type=int, default=1, help="KPI points per write transaction"
+    )
+    parser.add_argument(
+        "--seed-points",
+        type=int,
+        default=20_000,
+        help="KPI rows present before the run",
+    )
+    parser.add_argument(
+        "--profile", choices=sorted(PROFILES), help="Run one profile in this process"
+    )
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args)
+        return
+
+    print(
+        f"  {args.writers} writers ({args.batch} points/commit), {args.readers} readers,"
+        f" {args.exporters} exporters, {args.duration:.0f}s per profile"
+    )
+    for name, overrides in PROFILES.items():
+        env = {k: v for k, v in os.environ.items() if not k.startswith("DB_")}
+        env.update(overrides, DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--profile",
+                name,
+                "--writers",
+                str(args.writers),
+                "--readers",
+                str(args.readers),
+                "--exporters",
+                str(args.exporters),
+                "--duration",
+                str(args.duration),
+                "--companies",
+                str(args.companies),
+                "--batch",
+                str(args.batch),
+                "--seed-points",
+                str(args.seed_points),
+            ],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        for kind in ("write", "read", "export"):
+            r = result[kind]
+            print(
+                f"  {name:<7} {kind:<6} {r['ops']:>7,} ops {r['per_s']:>8,.1f}/s  p50 {r['p50_ms']:7.1f}ms"
+                f"  p99 {r['p99_ms']:8.1f}ms  locked {r['locked']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Benchmark: durable evidence writes - per-row database commits vs. the group-committed event log.
+
+``--writers`` threads each write their share of ``--records`` evidence
+records one at a time, as concurrent cycles and workers emitting evidence
+do. ``db_per_row`` inserts and commits every record on its own session;
+``event_log`` appends each record to a ``core.event_log.EventLog`` and waits
+for its commit. Both are durable per record: SQLite runs with
+``synchronous=--db-synchronous`` (FULL fsyncs every commit) and the log
+fsyncs each group commit.
+
+Usage:
+    python benchmarks/bench_evidence_log.py
+    python benchmarks/bench_evidence_log.py --records 50000 --writers 16 --group-commit-ms 1
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def make_records(n: int, company_id: str) -> list:
+    from core.models import EvidenceRecord
+
+    now = datetime.utcnow()
+    return [
+        EvidenceRecord(
+            id=str(uuid.uuid4()),
+            company_id=company_id,
+            job_id=None,
+            event_type="play_executed",
+            occurred_at=now,
+            payload={
+                "play_id": f"play_{i % 50}",
+                "step": i % 7,
+                "message": "Executed play step",
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def run_threads(writers: int, records: list, write_one) -> float:
+    """Split records across writer threads; returns elapsed seconds."""
+
+    def loop(share):
+        for record in share:
+            write_one(record)
+
+    threads = [
+        threading.Thread(target=loop, args=(records[i::writers],))
+        for i in range(writers)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--group-commit-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--db-synchronous",
+        default="FULL",
+        help="SQLite synchronous pragma for the database run",
+    )
+    args = parser.parse_args()
+
+    # Point the app at a throwaway database before database.connection is imported
+    workdir = Path(tempfile.mkdtemp())
+    os.environ["DATABASE_URL"] = f"sqlite:///{workdir}/bench.db"
+    os.environ["DB_SQLITE_SYNCHRONOUS"] = args.db_synchronous
+
+    from core.event_log import EventLog, EventLogSink, read_log
+    from database.bulk import bulk_insert_evidence
+    from database.connection import SessionLocal, init_db
+    from database.models import Company, EvidenceRecord as EvidenceRow
+
+    init_db()
+    db = SessionLocal()
+    company = Company(name="Bench Co")
+    db.add(company)
+    db.commit()
+    company_id = company.id
+    db.close()
+
+    print(
+        f"{args.records} evidence records from {args.writers} writer threads, one durable write each "
+        f"(SQLite synchronous={args.db_synchronous}, log group commit wait {args.group_commit_ms}ms)"
+    )
+    local = threading.local()
+
+    def db_write(record):
+        session = getattr(local, "db", None)
+        if session is None:
+            session = local.db = SessionLocal()
+        bulk_insert_evidence(session, [record])
+        session.commit()
+
+    elapsed = {}
+    elapsed["db_per_row"] = run_threads(
+        args.writers, make_records(args.records, company_id), db_write
+    )
+    db = SessionLocal()
+    stored = db.query(EvidenceRow).count()
+    db.close()
+    assert stored == args.records, f"expected {args.records} rows, found {stored}"
+    print(
+        f"  {'db_per_row':<11} {elapsed['db_per_row']:8.2f}s  {args.records / elapsed['db_per_row']:>10,.0f} rows/s"
+    )
+
+    log = EventLog(workdir / "evidence-log", group_commit_ms=args.group_commit_ms)
+    sink = EventLogSink(log)
+    elapsed["event_log"] = run_threads(
+        args.writers, make_records(args.records, company_id), lambda r: sink([r])
+    )
+    log.close()
+    logged = sum(1 for _ in read_log(workdir / "evidence-log"))
+    assert (
+        logged == args.records
+    ), f"expected {args.records} log records, found {logged}"
+    print(
+        f"  {'event_log':<11} {elapsed['event_log']:8.2f}s  {args.records / elapsed['event_log']:>10,.0f} rows/s"
+        f"  ({log.commits} fsyncs, {args.records / max(log.commits, 1):.1f} records each)"
+    )
+    print(f"Speedup: {elapsed['db_per_row'] / elapsed['event_log']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Benchmark: KPI ingestion through per-point POSTs vs. one streamed bulk upload.
+
+Sends ``--single`` points one request at a time to ``POST /api/v1/kpis/``,
+then streams ``--points`` points as NDJSON to ``POST /api/v1/kpis/bulk``,
+both in-process against a fresh SQLite database.
+
+Usage:
+    python benchmarks/bench_kpi_bulk_ingest.py
+    python benchmarks/bench_kpi_bulk_ingest.py --points 20000 --single 500
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Point the app at a throwaway database before database.connection is imported
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from database.connection import init_db
+
+KPI_NAMES = ["revenue_total_30d", "cr_main_funnel", "sessions_main_30d", "aov_main"]
+
+
+def make_points(n: int, company_ids: list):
+    rng = random.Random(7)
+    for i in range(n):
+        yield {
+            "company_id": company_ids[i % len(company_ids)],
+            "name": KPI_NAMES[i % len(KPI_NAMES)],
+            "value": round(rng.uniform(0, 6000), 2),
+            "recorded_at": f"2026-09-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00",
+        }
+
+
+def ndjson_body(points, chunk_size: int = 64 * 1024):
+    """Yield the NDJSON body in fixed-size chunks, as a streaming client would."""
+    buf = []
+    size = 0
+    for point in points:
+        line = json.dumps(point) + "\n"
+        buf.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield "".join(buf).encode()
+            buf, size = [], 0
+    if buf:
+        yield "".join(buf).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=100_000)
+    parser.add_argument(
+        "--single", type=int, default=1_000, help="points sent one request at a time"
+    )
+    parser.add_argument("--companies", type=int, default=20)
+    args = parser.parse_args()
+
+    init_db()
+    client = TestClient(app)
+    company_ids = [
+        client.post("/api/v1/companies/", json={"name": f"Bench Co {i}"}).json()["id"]
+        for i in range(args.companies)
+    ]
+
+    start = time.perf_counter()
+    for point in make_points(args.single, company_ids):
+        point.pop("recorded_at")
+        client.post("/api/v1/kpis/", json=point).raise_for_status()
+    single_s = time.perf_counter() - start
+    single_rate = args.single / single_s
+    print(
+        f"  per-point POST {args.single:>8,} points {single_s:8.2f}s  {single_rate:>10,.0f} points/s"
+    )
+
+    start = time.perf_counter()
+    response = client.post(
+        "/api/v1/kpis/bulk",
+        content=ndjson_body(make_points(args.points, company_ids)),
+        headers={"content-type": "application/x-ndjson"},
+    )
+    bulk_s = time.perf_counter() - start
+    response.raise_for_status()
+    result = response.json()
+    assert result["accepted"] == args.points, result
+    bulk_rate = args.points / bulk_s
+    print(
+        f"  bulk NDJSON    {args.points:>8,} points {bulk_s:8.2f}s  {bulk_rate:>10,.0f} points/s"
+        f"  ({len(result['batches'])} batches)"
+    )
+    print(f"Throughput: {bulk_rate / single_rate:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
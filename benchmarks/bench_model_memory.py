@@ -0,0 +1,153 @@
+"""Benchmark: bytes per Job / EvidenceRecord, plain dataclasses vs. the slotted core models.
+
+The "before" classes reproduce the previous dataclass definitions (per-instance
+``__dict__``, 36-char string ids, two ``utcnow()`` calls per job). Sizes are
+counted with ``sys.getsizeof`` over each object and its attribute values,
+counting an object shared between instances (interned strings, the shared
+payload, a per-cycle timestamp) once.
+
+Usage:
+    python benchmarks/bench_model_memory.py
+    python benchmarks/bench_model_memory.py --count 200000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.models import EvidenceRecord, Job, new_id
+
+
+@dataclass
+class DataclassJob:
+    id: str
+    type: str
+    company_id: str
+    payload: Dict
+    status: str = "queued"
+    priority: int = 100
+    depends_on: List[str] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    updated_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class DataclassEvidence:
+    id: str
+    company_id: str
+    job_id: str
+    event_type: str
+    occurred_at: datetime
+    payload: Dict
+
+
+JOB_TYPES = [
+    "EXECUTE_PLAY_GROWTH",
+    "EXECUTE_PLAY_COMMERCE",
+    "LOG_EVIDENCE",
+    "HUNT_OPPORTUNITIES",
+]
+PAYLOAD = {"play_id": "launch_hero_products", "params": {}}
+
+
+def fresh(s: str) -> str:
+    """A new str object per call, as strings parsed from YAML/JSON/DB rows are."""
+    return "".join(list(s))
+
+
+def build_jobs_before(n: int):
+    return [
+        DataclassJob(str(uuid.uuid4()), fresh(JOB_TYPES[i % 4]), "acme", PAYLOAD)
+        for i in range(n)
+    ]
+
+
+def build_jobs_after(n: int):
+    created_at = datetime.utcnow()
+    return [
+        Job(new_id(), fresh(JOB_TYPES[i % 4]), "acme", PAYLOAD, created_at=created_at)
+        for i in range(n)
+    ]
+
+
+def build_evidence_before(n: int):
+    return [
+        DataclassEvidence(
+            str(uuid.uuid4()),
+            "acme",
+            "job",
+            fresh("play_executed"),
+            datetime.utcnow(),
+            PAYLOAD,
+        )
+        for _ in range(n)
+    ]
+
+
+def build_evidence_after(n: int):
+    occurred_at = datetime.utcnow()
+    return [
+        EvidenceRecord(
+            new_id(), "acme", "job", fresh("play_executed"), occurred_at, PAYLOAD
+        )
+        for _ in range(n)
+    ]
+
+
+def retained_bytes(objects) -> int:
+    """Shallow size of each object plus its attribute values, shared values counted once."""
+    seen = set()
+    total = 0
+    for obj in objects:
+        total += sys.getsizeof(obj)
+        attrs = getattr(obj, "__dict__", None)
+        if attrs is not None:
+            total += sys.getsizeof(attrs)
+            values = attrs.values()
+        else:
+            values = [getattr(obj, name) for name in obj.__slots__]
+        for value in values:
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
+
+
+def measure(build, n: int):
+    """Return (bytes per object, seconds to build) for ``n`` objects."""
+    gc.collect()
+    start = time.perf_counter()
+    objects = build(n)
+    elapsed = time.perf_counter() - start
+    return retained_bytes(objects) / n, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    print(f"{args.count:,} objects each")
+    for label, before, after in (
+        ("Job", build_jobs_before, build_jobs_after),
+        ("EvidenceRecord", build_evidence_before, build_evidence_after),
+    ):
+        before_bytes, before_s = measure(before, args.count)
+        after_bytes, after_s = measure(after, args.count)
+        print(
+            f"  {label:<15} before {before_bytes:6.0f} B/obj ({before_s:5.2f}s)   "
+            f"after {after_bytes:6.0f} B/obj ({after_s:5.2f}s)   "
+            f"{100 * (1 - after_bytes / before_bytes):.0f}% smaller"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark: Orchestrator wall-clock time vs. worker count with a simulated-latency agent.
+
+Each job sleeps for ``--latency`` seconds, standing in for a Shopify/Fiverr/LLM
+call, so serial cycle time is roughly jobs x latency.
+
+Usage:
+    python benchmarks/bench_orchestrator_concurrency.py
+    python benchmarks/bench_orchestrator_concurrency.py --jobs 400 --latency 0.01 --executor process
+"""
+
+import argparse
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.agents import Agent
+from core.models import Job
+from core.orchestrator import Orchestrator
+
+
+class SimulatedLatencyAgent(Agent):
+    """Agent that waits on a fake external call before producing evidence."""
+
+    def __init__(self, name: str, latency: float):
+        super().__init__(name, ["EXECUTE_PLAY_GROWTH"])
+        self.latency = latency
+
+    def handle(self, job: Job):
+        time.sleep(self.latency)
+        return super().handle(job)
+
+
+def run(jobs: int, latency: float, executor, workers: int) -> tuple:
+    """Run one cycle and return (seconds, evidence ids)."""
+    agents = [SimulatedLatencyAgent(f"bot_{i}", latency) for i in range(4)]
+    with Orchestrator(
+        agents, policy="round_robin", executor=executor, max_workers=workers
+    ) as orch:
+        for i in range(jobs):
+            orch.enqueue(
+                Job(
+                    id=str(uuid.uuid4()),
+                    type="EXECUTE_PLAY_GROWTH",
+                    company_id=f"company-{i % 10}",
+                    payload={"play_id": f"play_{i}"},
+                )
+            )
+        start = time.perf_counter()
+        evidence = orch.run_cycle()
+        elapsed = time.perf_counter() - start
+    return elapsed, [e.payload["play_id"] for e in evidence]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per job")
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    baseline, expected = run(args.jobs, args.latency, None, 1)
+    print(f"{args.jobs} jobs x {args.latency * 1000:.0f} ms simulated latency")
+    print(f"{'mode':>10} {'workers':>8} {'wall (s)':>10} {'speedup':>8}")
+    print(f"{'serial':>10} {1:>8} {baseline:>10.3f} {1.0:>7.2f}x")
+
+    for workers in args.workers:
+        elapsed, order = run(args.jobs, args.latency, args.executor, workers)
+        if order != expected:
+            raise SystemExit("Evidence order differs from serial execution")
+        print(
+            f"{args.executor:>10} {workers:>8} {elapsed:>10.3f} {baseline / elapsed:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
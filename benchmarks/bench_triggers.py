@@ -0,0 +1,128 @@
+"""Benchmark: compiled trigger engine vs. the per-call clause interpreter.
+
+Builds a synthetic workload of random plays over the KPIs in kpis.yml and
+evaluates every play against every snapshot with both engines.
+
+Usage:
+    python benchmarks/bench_triggers.py
+    python benchmarks/bench_triggers.py --plays 200 --snapshots 5000
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config_loader import load_kpis
+from core.playbooks import OPERATORS, compile_plays, evaluate_triggers
+
+
+def make_plays(count: int, kpi_definitions: dict, rng: random.Random) -> list:
+    """Generate random plays with 1-4 clauses each."""
+    names = list(kpi_definitions)
+    operators = list(OPERATORS)
+    plays = []
+    for i in range(count):
+
+        def clause():
+            name = rng.choice(names)
+            ratio = "target" in kpi_definitions[name] and rng.random() < 0.5
+            return {
+                "kpi": name,
+                "relation": "ratio_to_target" if ratio else "absolute",
+                "operator": rng.choice(operators),
+                "value": (
+                    round(rng.uniform(0.2, 1.5), 2) if ratio else rng.randint(0, 1000)
+                ),
+            }
+
+        triggers = {}
+        if rng.random() < 0.7:
+            triggers["all"] = [clause() for _ in range(rng.randint(1, 3))]
+        if rng.random() < 0.5 or not triggers:
+            triggers["any"] = [clause() for _ in range(rng.randint(1, 3))]
+        plays.append(
+            {
+                "id": f"play_{i}",
+                "name": f"Play {i}",
+                "triggers": triggers,
+                "job_plan": [],
+            }
+        )
+    return plays
+
+
+def make_snapshots(count: int, kpi_definitions: dict, rng: random.Random) -> list:
+    """Generate random KPI snapshots with ~10% of KPIs missing."""
+    names = list(kpi_definitions)
+    snapshots = []
+    for _ in range(count):
+        snapshot = {}
+        for name in names:
+            if rng.random() < 0.1:
+                continue
+            target = kpi_definitions[name].get("target")
+            snapshot[name] = (
+                rng.uniform(0, 2 * target) if target else float(rng.randint(0, 1000))
+            )
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--plays", type=int, default=1000)
+    parser.add_argument("--snapshots", type=int, default=50000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    kpi_definitions = load_kpis()
+    plays = make_plays(args.plays, kpi_definitions, rng)
+    snapshots = make_snapshots(args.snapshots, kpi_definitions, rng)
+    evaluations = args.plays * args.snapshots
+    print(
+        f"Workload: {args.plays} plays x {args.snapshots} snapshots = {evaluations:,} evaluations"
+    )
+
+    start = time.perf_counter()
+    compiled = compile_plays(plays, kpi_definitions)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    interpreted_hits = 0
+    for snapshot in snapshots:
+        for play in plays:
+            if evaluate_triggers(snapshot, play, kpi_definitions):
+                interpreted_hits += 1
+    interpreted_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled_hits = 0
+    for snapshot in snapshots:
+        for play in compiled:
+            if play.matches(snapshot):
+                compiled_hits += 1
+    compiled_time = time.perf_counter() - start
+
+    if interpreted_hits != compiled_hits:
+        raise SystemExit(
+            f"Mismatch: interpreter={interpreted_hits} compiled={compiled_hits}"
+        )
+
+    print(f"Triggered:   {compiled_hits:,}")
+    print(f"Compile:     {compile_time * 1000:.1f} ms (once)")
+    print(
+        f"Interpreter: {interpreted_time:.2f} s  ({evaluations / interpreted_time:,.0f} evals/s)"
+    )
+    print(
+        f"Compiled:    {compiled_time:.2f} s  ({evaluations / compiled_time:,.0f} evals/s)"
+    )
+    print(f"Speedup:     {interpreted_time / compiled_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
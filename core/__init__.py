@@ -2,9 +2,26 @@
 
 from .models import Company, KPI, Job, EvidenceRecord, Status
 from .agents import Agent
-from .orchestrator import Orchestrator
-from .playbooks import evaluate_triggers, generate_jobs_from_plays
-from .config_loader import load_agents, load_kpis, load_plays
+from .handlers import HANDLERS, HandlerRegistry, register_handler
+from .orchestrator import Orchestrator, SelectionPolicy, FirstCapablePolicy, RoundRobinPolicy, LeastLoadedPolicy
+from .async_orchestrator import AsyncOrchestrator
+from .evidence_store import EvidenceStore, JsonlSpill
+from .event_log import EventLog, EventLogSink
+from .kpis import KPIPointError, kpi_status, parse_point
+from .playbooks import (
+    CompiledPlay,
+    PlayCatalog,
+    IncrementalEvaluator,
+    TriggerDelta,
+    build_kpi_index,
+    compile_plays,
+    evaluate_triggers,
+    evaluate_triggers_batch,
+    build_kpi_matrix,
+    generate_jobs_from_plays,
+    generate_jobs_for_companies,
+)
+from .config_loader import ConfigSnapshot, get_config, load_agents, load_kpis, load_plays, load_compiled_plays
 
 __all__ = [
     "Company",
@@ -13,11 +30,38 @@ __all__ = [
     "EvidenceRecord",
     "Status",
     "Agent",
+    "HANDLERS",
+    "HandlerRegistry",
+    "register_handler",
     "Orchestrator",
+    "AsyncOrchestrator",
+    "EvidenceStore",
+    "JsonlSpill",
+    "EventLog",
+    "EventLogSink",
+    "KPIPointError",
+    "kpi_status",
+    "parse_point",
+    "SelectionPolicy",
+    "FirstCapablePolicy",
+    "RoundRobinPolicy",
+    "LeastLoadedPolicy",
+    "CompiledPlay",
+    "PlayCatalog",
+    "IncrementalEvaluator",
+    "TriggerDelta",
+    "build_kpi_index",
+    "compile_plays",
     "evaluate_triggers",
+    "evaluate_triggers_batch",
+    "build_kpi_matrix",
     "generate_jobs_from_plays",
+    "generate_jobs_for_companies",
+    "ConfigSnapshot",
+    "get_config",
     "load_agents",
     "load_kpis",
     "load_plays",
+    "load_compiled_plays",
 ]
 
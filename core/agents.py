@@ -1,14 +1,16 @@
 """Agent system for Profit OS Chimera - Commander agents and execution bots."""
 
 from typing import Dict, Any, List, Optional
-from .models import Job, EvidenceRecord
-from datetime import datetime
-import uuid
+from .models import Job, EvidenceRecord, new_id
+from .handlers import HANDLERS, Handler, HandlerRegistry
 
 
 class Agent:
     """Base agent class that handles specific job types."""
     
+    # Job type -> handler table; jobs with no registered handler produce no evidence
+    handlers: HandlerRegistry = HANDLERS
+    
     def __init__(self, name: str, capabilities: List[str], metadata: Optional[Dict[str, Any]] = None):
         self.name = name
         self.capabilities = set(capabilities)
@@ -21,24 +23,16 @@ class Agent:
     def handle(self, job: Job) -> List[EvidenceRecord]:
         """
         Process a job and return evidence records.
-        Override in subclasses or extend with LLM calls for real logic.
+        Dispatches through ``handlers``; register new job types with
+        ``core.handlers.register_handler`` or override in subclasses.
+        Subclasses run by AsyncOrchestrator may override this as ``async def``.
+        Evidence is stamped with ``job.updated_at``, the orchestrator's
+        ``cycle_time`` set when the job started, rather than a clock read per record.
         """
-        if job.type == "EVALUATE_KPIS":
-            return self._handle_evaluate_kpis(job)
-        elif job.type == "SUGGEST_PLAYS":
-            return self._handle_suggest_plays(job)
-        elif job.type == "INGEST_METRICS":
-            return self._handle_ingest_metrics(job)
-        elif job.type == "LOG_EVIDENCE":
-            return self._handle_log_evidence(job)
-        elif job.type.startswith("EXECUTE_PLAY_"):
-            return self._handle_execute_play(job)
-        elif job.type == "PLAN_JOB_QUEUE_FOR_PLAY":
-            return self._handle_plan_job_queue(job)
-        elif job.type == "TRAIN_AGENT":
-            return self._handle_train_agent(job)
-        else:
+        handler = self.handlers.resolve(job.type)
+        if handler is None:
             return []
+        return handler(self, job)
     
     def _handle_evaluate_kpis(self, job: Job) -> List[EvidenceRecord]:
         """Evaluate KPIs and determine status."""
@@ -68,11 +62,11 @@ class Agent:
             })
         
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="kpi_evaluated",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={"evaluations": evaluations}
         )]
     
@@ -81,11 +75,11 @@ class Agent:
         # This would normally use playbook logic
         # For now, return a placeholder
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="plays_suggested",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={
                 "plays": job.payload.get("suggested_plays", []),
                 "rationale": "Based on KPI evaluation and playbook triggers"
@@ -93,31 +87,38 @@ class Agent:
         )]
     
     def _handle_ingest_metrics(self, job: Job) -> List[EvidenceRecord]:
-        """Ingest metrics from data sources."""
+        """
+        Ingest metrics from data sources, recording the trigger state of the
+        plays that reference them (other plays are not re-evaluated).
+        """
+        from .config_loader import get_config  # config_loader imports this module
+
         source = job.payload.get("source", "unknown")
         metrics = job.payload.get("metrics", {})
+        trigger_state = get_config().evaluator.evaluate(metrics, metrics)
         
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="metrics_ingested",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={
                 "source": source,
                 "metrics_count": len(metrics),
-                "metrics": metrics
+                "metrics": metrics,
+                "trigger_state": trigger_state
             }
         )]
     
     def _handle_log_evidence(self, job: Job) -> List[EvidenceRecord]:
         """Log evidence of an action or outcome."""
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type=job.payload.get("event_type", "evidence_logged"),
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload=job.payload.get("evidence_data", {})
         )]
     
@@ -128,11 +129,11 @@ class Agent:
         params = job.payload.get("params", {})
         
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="play_executed",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={
                 "play_id": play_id,
                 "handler": handler,
@@ -146,11 +147,11 @@ class Agent:
         play_id = job.payload.get("play_id", "unknown")
         
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="job_queue_planned",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={
                 "play_id": play_id,
                 "jobs_planned": job.payload.get("job_count", 0)
@@ -162,14 +163,30 @@ class Agent:
         agent_id = job.payload.get("agent_id", "unknown")
         
         return [EvidenceRecord(
-            id=str(uuid.uuid4()),
+            id=new_id(),
             company_id=job.company_id,
-            job_id=job.id,
+            job_id=job._id,
             event_type="agent_trained",
-            occurred_at=datetime.utcnow(),
+            occurred_at=job.updated_at,
             payload={
                 "agent_id": agent_id,
                 "training_scenarios": job.payload.get("scenarios_count", 0)
             }
         )]
 
+
+def _agent_method(name: str) -> Handler:
+    """Handler that calls an Agent method, so subclass overrides still apply."""
+    def handler(agent: Agent, job: Job) -> List[EvidenceRecord]:
+        return getattr(agent, name)(job)
+    handler.__name__ = name
+    return handler
+
+
+HANDLERS.add("EVALUATE_KPIS", _agent_method("_handle_evaluate_kpis"))
+HANDLERS.add("SUGGEST_PLAYS", _agent_method("_handle_suggest_plays"))
+HANDLERS.add("INGEST_METRICS", _agent_method("_handle_ingest_metrics"))
+HANDLERS.add("LOG_EVIDENCE", _agent_method("_handle_log_evidence"))
+HANDLERS.add("EXECUTE_PLAY_", _agent_method("_handle_execute_play"), prefix=True)
+HANDLERS.add("PLAN_JOB_QUEUE_FOR_PLAY", _agent_method("_handle_plan_job_queue"))
+HANDLERS.add("TRAIN_AGENT", _agent_method("_handle_train_agent"))
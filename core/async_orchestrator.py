@@ -0,0 +1,164 @@
+"""Asyncio orchestrator for Profit OS Chimera - runs jobs without blocking the event loop."""
+
+from typing import Dict, List, Optional, Set, Union
+from .models import Job, EvidenceRecord
+from .agents import Agent
+from .evidence_store import EvidenceStore
+from .orchestrator import (
+    EvidenceSink,
+    Orchestrator,
+    SelectionPolicy,
+    MAX_COMPLETED_JOBS,
+)
+import asyncio
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimits:
+    """
+    Job slots (global and per agent) shared by several orchestrators, such as
+    one per API request, so their cycles run concurrently within one set of
+    limits. Use from a single event loop.
+    """
+
+    def __init__(
+        self, max_concurrency: int, agent_limits: Optional[Dict[str, int]] = None
+    ):
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.agent_slots = {
+            name: asyncio.Semaphore(limit)
+            for name, limit in (agent_limits or {}).items()
+        }
+
+
+class AsyncOrchestrator(Orchestrator):
+    """
+    Orchestrator with an awaitable cycle entry point.
+
+    Agents may implement ``async def handle(job)``; synchronous handlers are
+    run in a worker thread. Concurrency is bounded globally by
+    ``max_concurrency`` and per agent by ``agent_limits``/``max_concurrency``
+    in agents.yml, or by ``limits`` shared with other orchestrators.
+    """
+
+    def __init__(
+        self,
+        agents: List[Agent],
+        policy: Union[str, SelectionPolicy, None] = None,
+        max_completed: int = MAX_COMPLETED_JOBS,
+        max_concurrency: int = 64,
+        agent_limits: Optional[Dict[str, int]] = None,
+        job_timeout: Optional[float] = None,
+        evidence_sink: Optional[EvidenceSink] = None,
+        evidence_store: Optional[EvidenceStore] = None,
+        limits: Optional[ConcurrencyLimits] = None,
+    ):
+        super().__init__(
+            agents,
+            policy=policy,
+            max_completed=max_completed,
+            max_workers=max_concurrency,
+            agent_limits=agent_limits,
+            job_timeout=job_timeout,
+            evidence_sink=evidence_sink,
+            evidence_store=evidence_store,
+        )
+        # Shared job slots; without them each cycle gets its own
+        self.limits = limits
+        self._is_async = {
+            agent.name: inspect.iscoroutinefunction(agent.handle) for agent in agents
+        }
+
+    async def run_cycle_async(self) -> List[EvidenceRecord]:
+        """
+        Run one cycle, awaiting jobs concurrently.
+
+        Returns evidence in the same deterministic order as ``run_cycle``.
+        """
+        self._begin_cycle()
+        limits = self.limits or ConcurrencyLimits(self.max_workers, self.agent_limits)
+        slots, agent_slots = limits.slots, limits.agent_slots
+        pending: Set[asyncio.Task] = set()
+
+        while True:
+            while True:
+                job = self._dequeue()
+                if job is None:
+                    break
+                pending.add(
+                    asyncio.create_task(self._run_job_async(job, slots, agent_slots))
+                )
+
+            if not pending:
+                break
+            # Completions may make more jobs ready, so re-check the queue after each
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                task.result()
+
+        return self._end_cycle()
+
+    async def _run_job_async(
+        self,
+        job: Job,
+        slots: asyncio.Semaphore,
+        agent_slots: Dict[str, asyncio.Semaphore],
+    ):
+        """Select an agent once a slot is free, run the job and store its evidence."""
+        async with slots:
+            agent = self._select_agent(job)
+            if agent is None:
+                self._finish(job, None, None, None)
+                return
+
+            agent_slot = agent_slots.get(agent.name)
+            if agent_slot is not None:
+                await agent_slot.acquire()
+            self._start(job, agent)
+            worker = None  # thread running a synchronous handler
+            release = True
+            try:
+                try:
+                    if self._is_async.get(agent.name):
+                        call = agent.handle(job)
+                    else:
+                        # Shielded so a timeout leaves the thread's task (and its slot) in place
+                        worker = asyncio.ensure_future(
+                            asyncio.to_thread(agent.handle, job)
+                        )
+                        call = asyncio.shield(worker)
+                    if self.job_timeout:
+                        records = await asyncio.wait_for(call, self.job_timeout)
+                    else:
+                        records = await call
+                    error = None
+                except asyncio.TimeoutError:
+                    records, error = None, TimeoutError(
+                        f"Job exceeded {self.job_timeout}s timeout"
+                    )
+                except Exception as e:
+                    records, error = None, e
+
+                if worker is not None and not worker.done():
+                    # A timed-out thread keeps running; its agent slot is freed when it returns
+                    release = False
+                    self._finish(job, agent, records, error, release=False)
+                    worker.add_done_callback(
+                        lambda _: self._release_worker(agent.name, agent_slot)
+                    )
+                else:
+                    self._finish(job, agent, records, error)
+            finally:
+                if release and agent_slot is not None:
+                    agent_slot.release()
+
+    def _release_worker(self, agent_name: str, agent_slot: Optional[asyncio.Semaphore]):
+        with self._slots:
+            self.in_flight[agent_name] -= 1
+        if agent_slot is not None:
+            agent_slot.release()
@@ -1,12 +1,27 @@
 """Configuration loader for Profit OS Chimera - loads YAML configs and instantiates agents."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Mapping, Tuple
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
+from types import MappingProxyType
+import hashlib
+import logging
+import os
+import threading
+import time
 import yaml
 from .agents import Agent
+from .playbooks import CompiledPlay, IncrementalEvaluator, PlayCatalog, compile_plays
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 CONFIG_DIR = BASE_DIR / "configs"
+CONFIG_FILES = ("agents.yml", "kpis.yml", "plays.yml")
+
+# Seconds between stat() checks of the config files; 0 checks on every call.
+RELOAD_CHECK_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "2.0"))
 
 
 def load_yaml(name: str) -> Dict[str, Any]:
@@ -14,17 +29,16 @@ def load_yaml(name: str) -> Dict[str, Any]:
     path = CONFIG_DIR / name
     if not path.exists():
         raise FileNotFoundError(f"Config file not found: {path}")
-    
+
     with path.open("r", encoding="utf-8") as f:
         return yaml.safe_load(f)
 
 
-def load_agents() -> List[Agent]:
-    """Load agents from agents.yml and instantiate Agent objects."""
-    raw = load_yaml("agents.yml")
+def _build_agents(raw: Dict[str, Any]) -> List[Agent]:
+    """Instantiate Agent objects from parsed agents.yml."""
     agents_cfg = raw.get("agents", [])
     agents: List[Agent] = []
-    
+
     for cfg in agents_cfg:
         agent = Agent(
             name=cfg["id"],
@@ -32,19 +46,148 @@ def load_agents() -> List[Agent]:
             metadata=cfg
         )
         agents.append(agent)
-    
+
     return agents
 
 
-def load_kpis() -> Dict[str, Dict[str, Any]]:
-    """Load KPIs from kpis.yml and return as a dictionary."""
-    raw = load_yaml("kpis.yml")
+def _build_kpis(raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Index parsed kpis.yml by KPI name."""
     kpis = raw.get("kpis", [])
     return {k["name"]: k for k in kpis}
 
 
-def load_plays() -> List[Dict[str, Any]]:
-    """Load plays from plays.yml and return as a list."""
-    raw = load_yaml("plays.yml")
-    return raw.get("plays", [])
+def _build_plays(raw: Dict[str, Any]) -> PlayCatalog:
+    """Wrap parsed plays.yml in a KPI-indexed catalog."""
+    return PlayCatalog(raw.get("plays", []))
+
+
+def load_agents() -> List[Agent]:
+    """Load agents from agents.yml and instantiate Agent objects."""
+    return _build_agents(load_yaml("agents.yml"))
+
+
+def load_kpis() -> Dict[str, Dict[str, Any]]:
+    """Load KPIs from kpis.yml and return as a dictionary."""
+    return _build_kpis(load_yaml("kpis.yml"))
+
+
+def load_plays() -> PlayCatalog:
+    """Load plays from plays.yml as a list indexed by the KPIs they reference."""
+    return _build_plays(load_yaml("plays.yml"))
+
+
+def load_compiled_plays(kpi_definitions: Optional[Dict[str, Dict[str, Any]]] = None) -> List[CompiledPlay]:
+    """Load plays and compile their triggers against the KPI definitions."""
+    if kpi_definitions is None:
+        kpi_definitions = load_kpis()
+    return compile_plays(load_plays(), kpi_definitions)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """A consistent, versioned view of agents, KPIs and plays.
+
+    Everything in a snapshot is derived from the same file contents, so
+    compiled plays always match the KPI targets and agents they were
+    built with. Treat the contents as read-only.
+    """
+    version: str
+    loaded_at: datetime
+    agents: Tuple[Agent, ...]
+    kpis: Mapping[str, Dict[str, Any]]
+    plays: PlayCatalog
+    compiled_plays: Tuple[CompiledPlay, ...]
+    routing: Mapping[str, Tuple[str, ...]]  # job type -> capable agent names
+    evaluator: IncrementalEvaluator
+
+
+def load_config_snapshot(config_dir: Path = CONFIG_DIR) -> ConfigSnapshot:
+    """Parse all config files into a new snapshot."""
+    contents: Dict[str, bytes] = {}
+    digest = hashlib.sha256()
+    for name in CONFIG_FILES:
+        path = config_dir / name
+        if not path.exists():
+            raise FileNotFoundError(f"Config file not found: {path}")
+        contents[name] = path.read_bytes()
+        digest.update(name.encode("utf-8"))
+        digest.update(contents[name])
+
+    agents = _build_agents(yaml.safe_load(contents["agents.yml"]) or {})
+    kpis = _build_kpis(yaml.safe_load(contents["kpis.yml"]) or {})
+    plays = _build_plays(yaml.safe_load(contents["plays.yml"]) or {})
+    compiled = compile_plays(plays, kpis)
+
+    routing: Dict[str, List[str]] = {}
+    for agent in agents:
+        for job_type in agent.metadata.get("handles", []):
+            routing.setdefault(job_type, []).append(agent.name)
+
+    return ConfigSnapshot(
+        version=digest.hexdigest()[:12],
+        loaded_at=datetime.utcnow(),
+        agents=tuple(agents),
+        kpis=MappingProxyType(kpis),
+        plays=plays,
+        compiled_plays=tuple(compiled),
+        routing=MappingProxyType({k: tuple(v) for k, v in routing.items()}),
+        evaluator=IncrementalEvaluator(compiled, kpis, plays.kpi_index),
+    )
+
+
+class ConfigCache:
+    """In-process cache that swaps in a new snapshot when config files change."""
+
+    def __init__(self, config_dir: Path = CONFIG_DIR, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.config_dir = config_dir
+        self.check_interval = check_interval
+        self._snapshot: Optional[ConfigSnapshot] = None
+        self._fingerprint: Optional[Tuple] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def _stat(self) -> Tuple:
+        """Cheap change detector: (mtime, size) of every config file."""
+        stats = []
+        for name in CONFIG_FILES:
+            try:
+                st = (self.config_dir / name).stat()
+                stats.append((st.st_mtime_ns, st.st_size))
+            except FileNotFoundError:
+                stats.append(None)
+        return tuple(stats)
+
+    def get(self, force: bool = False) -> ConfigSnapshot:
+        """Return the current snapshot, reloading if the files changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and not force and time.monotonic() < self._next_check:
+            return snapshot
+
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            fingerprint = self._stat()
+            if self._snapshot is not None and not force and fingerprint == self._fingerprint:
+                return self._snapshot
+
+            try:
+                fresh = load_config_snapshot(self.config_dir)
+            except Exception as e:
+                if self._snapshot is None:
+                    raise
+                logger.error(f"Config reload failed, keeping version {self._snapshot.version}: {e}")
+                return self._snapshot
+
+            self._fingerprint = fingerprint
+            if self._snapshot is None or fresh.version != self._snapshot.version:
+                if self._snapshot is not None:
+                    logger.info(f"Config reloaded: {self._snapshot.version} -> {fresh.version}")
+                self._snapshot = fresh
+            return self._snapshot
+
+
+_cache = ConfigCache()
+
 
+def get_config(force: bool = False) -> ConfigSnapshot:
+    """Return the process-wide config snapshot, hot-reloading on file changes."""
+    return _cache.get(force=force)
@@ -0,0 +1,458 @@
+"""Append-only evidence event log - CRC-checked records in rotating segments with group commit."""
+
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime
+from pathlib import Path
+from .models import EvidenceRecord
+import heapq
+import json
+import logging
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+
+try:
+    import fcntl
+except (
+    ImportError
+):  # Windows: no advisory lock, one writer per directory is on the caller
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Root of the evidence logs; each process writes its own <hostname>-<pid>
+# subdirectory, so API workers and job workers can share one setting. Empty disables it
+EVIDENCE_LOG_DIR = os.getenv("EVIDENCE_LOG_DIR", "")
+
+# A segment is sealed and a new one started once it grows past this many bytes
+EVIDENCE_LOG_SEGMENT_BYTES = int(
+    os.getenv("EVIDENCE_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024))
+)
+
+# Milliseconds a committing writer waits for others to join its fsync; 0 still
+# batches every append that arrives while the previous fsync is in progress
+EVIDENCE_LOG_GROUP_COMMIT_MS = float(os.getenv("EVIDENCE_LOG_GROUP_COMMIT_MS", "0"))
+
+# With false, commits only flush to the OS (survives process crashes, not power loss)
+EVIDENCE_LOG_FSYNC = os.getenv("EVIDENCE_LOG_FSYNC", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+
+# Record header: payload length and CRC32 of the payload, little-endian
+_HEADER = struct.Struct("<II")
+_SEGMENT_SUFFIX = ".log"
+_READ_CHUNK = 1024 * 1024
+
+
+class EventLogError(Exception):
+    """The log directory cannot be opened for writing."""
+
+
+class EventLogCorruption(EventLogError):
+    """A sealed segment holds a record that is truncated or fails its CRC."""
+
+    def __init__(self, path: Path, position: int, reason: str):
+        super().__init__(f"{path} at byte {position}: {reason}")
+        self.path = path
+        self.position = position
+
+
+def _segment_name(base_offset: int) -> str:
+    return f"{base_offset:020d}{_SEGMENT_SUFFIX}"
+
+
+def _segments(directory: Path) -> List[Tuple[int, Path]]:
+    """(base offset, path) of each segment, oldest first."""
+    found = []
+    for path in directory.glob("*" + _SEGMENT_SUFFIX):
+        try:
+            found.append((int(path.stem), path))
+        except ValueError:
+            continue
+    return sorted(found)
+
+
+def _scan(path: Path) -> Iterator[Tuple[int, Optional[bytes], Optional[str]]]:
+    """
+    Yield (position, payload, None) for each valid record of a segment, then
+    (position, None, reason) if the file ends in a torn or corrupt record.
+    """
+    with path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        buffer = b""
+        i = 0  # start of the next record in buffer
+        base = 0  # file offset of buffer[0]
+        while True:
+            available = len(buffer) - i
+            need = _HEADER.size
+            if available >= _HEADER.size:
+                length, crc = _HEADER.unpack_from(buffer, i)
+                need += length
+            if available < need:
+                # A garbage length must not turn into a huge read
+                more = (
+                    f.read(max(need - available, _READ_CHUNK))
+                    if base + i + need <= size
+                    else b""
+                )
+                if not more:
+                    if available:
+                        reason = (
+                            "truncated header"
+                            if available < _HEADER.size
+                            else "truncated record"
+                        )
+                        yield base + i, None, reason
+                    return
+                buffer = buffer[i:] + more
+                base += i
+                i = 0
+                continue
+            payload = buffer[i + _HEADER.size : i + need]
+            if zlib.crc32(payload) != crc:
+                yield base + i, None, "CRC mismatch"
+                return
+            yield base + i, payload, None
+            i += need
+
+
+def _fsync_dir(directory: Path):
+    if os.name == "nt":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class EventLog:
+    """
+    Append-only log of opaque records, stored as length-prefixed, CRC32-checked
+    entries in segment files named by the offset of their first record.
+
+    ``append`` buffers records and returns the offset just past them;
+    ``commit`` makes everything up to an offset durable. Commits use group
+    commit: one caller flushes and fsyncs on behalf of every record appended
+    so far, and concurrent committers wait for that fsync instead of issuing
+    their own. Segments roll over at ``segment_bytes``; a torn tail left by a
+    crash is truncated when the log is reopened. One process writes a
+    directory at a time (enforced with an advisory lock); any number may read.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        segment_bytes: int = EVIDENCE_LOG_SEGMENT_BYTES,
+        group_commit_ms: float = EVIDENCE_LOG_GROUP_COMMIT_MS,
+        fsync: bool = EVIDENCE_LOG_FSYNC,
+    ):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self.group_commit_seconds = group_commit_ms / 1000
+        self.fsync = fsync
+        self.commits = 0  # flushes performed, each covering one or more appends
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock_file = (self.directory / "LOCK").open("a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError as e:
+                self._lock_file.close()
+                raise EventLogError(
+                    f"{self.directory} is already open for writing by another process"
+                ) from e
+
+        self._write_lock = threading.Lock()
+        self._commit_cond = threading.Condition()
+        self._syncing = False
+
+        segments = _segments(self.directory)
+        if segments:
+            base, path = segments[-1]
+            count, size = self._recover(path)
+        else:
+            base, path, count, size = 0, self.directory / _segment_name(0), 0, 0
+        self._file = path.open("ab")
+        self._segment_size = size
+        self._next_offset = base + count
+        self._durable = self._next_offset
+
+    @staticmethod
+    def _recover(path: Path) -> Tuple[int, int]:
+        """Count the active segment's records, truncating a torn tail. Returns (records, bytes)."""
+        count, size = 0, 0
+        for position, payload, reason in _scan(path):
+            if payload is None:
+                dropped = path.stat().st_size - position
+                logger.warning(
+                    f"Evidence log {path.name}: {reason}, truncating {dropped} bytes at {position}"
+                )
+                with path.open("r+b") as f:
+                    f.truncate(position)
+                    os.fsync(f.fileno())
+                break
+            count += 1
+            size = position + _HEADER.size + len(payload)
+        return count, size
+
+    @property
+    def next_offset(self) -> int:
+        """Offset the next appended record will get."""
+        return self._next_offset
+
+    def append(self, payloads: Sequence[bytes]) -> int:
+        """Buffer records in order. Returns the offset after the last one; pass it to ``commit``."""
+        data = b"".join(_HEADER.pack(len(p), zlib.crc32(p)) + p for p in payloads)
+        with self._write_lock:
+            self._file.write(data)
+            self._segment_size += len(data)
+            self._next_offset += len(payloads)
+            end = self._next_offset
+            if self._segment_size >= self.segment_bytes:
+                self._rotate()
+        return end
+
+    def _rotate(self):
+        """Seal the active segment and start the next. Caller holds the write lock."""
+        self._sync_file()
+        self._file.close()
+        self._file = (self.directory / _segment_name(self._next_offset)).open("ab")
+        self._segment_size = 0
+        _fsync_dir(self.directory)
+        with self._commit_cond:
+            # Everything in the sealed segment is durable now
+            self._durable = max(self._durable, self._next_offset)
+
+    def _sync_file(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def commit(self, offset: Optional[int] = None):
+        """Block until every record before ``offset`` (default: all appended) is durable."""
+        if offset is None:
+            offset = self._next_offset
+        with self._commit_cond:
+            while self._durable < offset:
+                if not self._syncing:
+                    self._syncing = True
+                    break
+                self._commit_cond.wait()
+            else:
+                return
+
+        # This caller leads the next group commit
+        durable = None
+        try:
+            if self.group_commit_seconds:
+                time.sleep(self.group_commit_seconds)
+            with self._write_lock:
+                self._sync_file()
+                durable = self._next_offset
+            self.commits += 1
+        finally:
+            with self._commit_cond:
+                self._syncing = False
+                if durable is not None:
+                    self._durable = max(self._durable, durable)
+                self._commit_cond.notify_all()
+
+    def close(self):
+        """Commit outstanding records and release the directory."""
+        with self._write_lock:
+            if self._file.closed:
+                return
+            self._sync_file()
+            self._file.close()
+        self._lock_file.close()
+
+    def __enter__(self) -> "EventLog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_log(directory: Path, start: int = 0) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield (offset, payload) for every record at or after ``start``, oldest first.
+
+    Raises ``EventLogCorruption`` for a bad record in a sealed segment. The
+    newest segment may be mid-write, so reading stops quietly at an
+    incomplete record there.
+    """
+    segments = _segments(Path(directory))
+    for i, (base, path) in enumerate(segments):
+        next_base = segments[i + 1][0] if i + 1 < len(segments) else None
+        if next_base is not None and next_base <= start:
+            continue
+        offset = base
+        for position, payload, reason in _scan(path):
+            if payload is None:
+                if next_base is not None:
+                    raise EventLogCorruption(path, position, reason)
+                break
+            if offset >= start:
+                yield offset, payload
+            offset += 1
+        if next_base is not None and offset != next_base:
+            raise EventLogCorruption(
+                path,
+                path.stat().st_size,
+                f"holds {offset - base} records, expected {next_base - base}",
+            )
+
+
+def log_streams(root: Path) -> List[Path]:
+    """Log directories under ``root`` (including ``root`` itself) that hold segments, sorted by name."""
+    root = Path(root)
+    candidates = (
+        [root] + sorted(p for p in root.iterdir() if p.is_dir())
+        if root.is_dir()
+        else []
+    )
+    return [d for d in candidates if _segments(d)]
+
+
+def encode_evidence(record: EvidenceRecord) -> bytes:
+    """Log payload for one evidence record."""
+    return json.dumps(
+        {
+            "id": record.id,
+            "company_id": record.company_id,
+            "job_id": record.job_id,
+            "event_type": record.event_type,
+            "occurred_at": (
+                record.occurred_at.isoformat() if record.occurred_at else None
+            ),
+            "payload": record.payload,
+        },
+        separators=(",", ":"),
+        default=str,
+    ).encode()
+
+
+def decode_evidence(data: bytes) -> EvidenceRecord:
+    """Evidence record from a log payload written by ``encode_evidence``."""
+    row = json.loads(data)
+    occurred_at = row["occurred_at"]
+    return EvidenceRecord(
+        id=row["id"],
+        company_id=row["company_id"],
+        job_id=row["job_id"],
+        event_type=row["event_type"],
+        occurred_at=datetime.fromisoformat(occurred_at) if occurred_at else None,
+        payload=row["payload"],
+    )
+
+
+def replay(
+    directory: Path,
+    sink: Callable[[List[EvidenceRecord]], None],
+    start: int = 0,
+    batch_size: int = 1000,
+    predicate: Optional[Callable[[EvidenceRecord], bool]] = None,
+) -> Tuple[int, int]:
+    """
+    Feed logged evidence to ``sink`` in batches, in log order, from offset ``start``.
+
+    Any orchestrator evidence sink works as a target (``BulkEvidenceSink``,
+    ``JsonlSpill``, ``EvidenceStore.extend``). Returns (records replayed,
+    offset to resume from).
+    """
+    batch: List[EvidenceRecord] = []
+    replayed, resume = 0, start
+    for offset, payload in read_log(directory, start):
+        record = decode_evidence(payload)
+        resume = offset + 1
+        if predicate is not None and not predicate(record):
+            continue
+        batch.append(record)
+        if len(batch) >= batch_size:
+            sink(batch)
+            replayed += len(batch)
+            batch = []
+    if batch:
+        sink(batch)
+        replayed += len(batch)
+    return replayed, resume
+
+
+def read_evidence(
+    directories: Iterable[Path],
+    predicate: Optional[Callable[[EvidenceRecord], bool]] = None,
+) -> Iterator[EvidenceRecord]:
+    """
+    Evidence from several log streams (e.g. one per process), merged by
+    ``occurred_at``. Each stream is read in log order.
+    """
+
+    def stream(directory: Path) -> Iterator[Tuple[datetime, EvidenceRecord]]:
+        for _, payload in read_log(directory):
+            record = decode_evidence(payload)
+            if predicate is None or predicate(record):
+                yield record.occurred_at or datetime.min, record
+
+    for _, record in heapq.merge(
+        *(stream(d) for d in directories), key=lambda item: item[0]
+    ):
+        yield record
+
+
+class EventLogSink:
+    """
+    Orchestrator evidence sink that appends each cycle's evidence to an
+    ``EventLog`` and waits for its group commit, then passes the batch on to
+    ``forward`` (e.g. ``BulkEvidenceSink``). Logging first means every row
+    that reaches the database can be rebuilt from the log.
+    """
+
+    def __init__(
+        self,
+        log: EventLog,
+        forward: Optional[Callable[[List[EvidenceRecord]], None]] = None,
+    ):
+        self.log = log
+        self.forward = forward
+        self.count = 0
+
+    def __call__(self, records: List[EvidenceRecord]):
+        if records:
+            self.log.commit(self.log.append([encode_evidence(r) for r in records]))
+            self.count += len(records)
+        if self.forward is not None:
+            self.forward(records)
+
+
+_shared_log: Optional[EventLog] = None
+_shared_pid: Optional[int] = None
+_shared_lock = threading.Lock()
+
+
+def process_log_dir(root: Path) -> Path:
+    """This process's stream under a log root."""
+    return Path(root) / f"{socket.gethostname()}-{os.getpid()}"
+
+
+def shared_evidence_log() -> Optional[EventLog]:
+    """This process's log under ``EVIDENCE_LOG_DIR``, opened on first use; None when unset."""
+    global _shared_log, _shared_pid
+    if not EVIDENCE_LOG_DIR:
+        return None
+    with _shared_lock:
+        if _shared_log is None or _shared_pid != os.getpid():
+            # A forked child must not append through its parent's log
+            _shared_log = EventLog(process_log_dir(EVIDENCE_LOG_DIR))
+            _shared_pid = os.getpid()
+            logger.info(
+                f"Evidence log {_shared_log.directory} opened at offset {_shared_log.next_offset}"
+            )
+        return _shared_log
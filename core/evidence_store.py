@@ -0,0 +1,183 @@
+"""Bounded in-memory evidence store with company, job and event type indexes."""
+
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from .models import EvidenceRecord, _compact_id
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Records kept in memory before the oldest are evicted; 0 disables the cap
+MAX_EVIDENCE_RECORDS = int(os.getenv("ORCHESTRATOR_MAX_EVIDENCE", "100000"))
+
+# Seconds of evidence kept in memory, by occurred_at; 0 keeps everything within the cap
+EVIDENCE_RETENTION_SECONDS = float(
+    os.getenv("ORCHESTRATOR_EVIDENCE_RETENTION_SECONDS", "0")
+)
+
+# Receives evicted records, oldest first, e.g. to spill them to disk or the database
+EvictionHandler = Callable[[List[EvidenceRecord]], None]
+
+
+class EvidenceStore:
+    """
+    Evidence records in arrival order, indexed by company, job and event type.
+
+    Lookups cost O(k) in the number of matching records. Once ``max_records``
+    is exceeded, or records fall outside ``retention_seconds``, the oldest are
+    evicted and passed to ``on_evict``. Supports the list operations the
+    orchestrator used (append, extend, len, iteration, indexing).
+    """
+
+    def __init__(
+        self,
+        max_records: int = MAX_EVIDENCE_RECORDS,
+        retention_seconds: float = EVIDENCE_RETENTION_SECONDS,
+        on_evict: Optional[EvictionHandler] = None,
+    ):
+        self.max_records = max_records
+        self.retention_seconds = retention_seconds
+        self.on_evict = on_evict
+        self.evicted_count = 0
+        self._records: Deque[EvidenceRecord] = deque()
+        # Per-key deques stay in arrival order, so eviction pops from their left too
+        self._by_company: Dict[str, Deque[EvidenceRecord]] = {}
+        self._by_job: Dict[Union[int, str], Deque[EvidenceRecord]] = {}
+        self._by_type: Dict[str, Deque[EvidenceRecord]] = {}
+
+    def append(self, record: EvidenceRecord):
+        """Add one record, evicting old ones if needed."""
+        self._add(record)
+        self._evict()
+
+    def extend(self, records: Iterable[EvidenceRecord]):
+        """Add records in order, evicting old ones once at the end."""
+        for record in records:
+            self._add(record)
+        self._evict()
+
+    def _add(self, record: EvidenceRecord):
+        self._records.append(record)
+        self._by_company.setdefault(record.company_id, deque()).append(record)
+        if record._job_id is not None:
+            self._by_job.setdefault(record._job_id, deque()).append(record)
+        self._by_type.setdefault(record.event_type, deque()).append(record)
+
+    def _evict(self):
+        over = len(self._records) - self.max_records if self.max_records else 0
+        cutoff = None
+        if self.retention_seconds:
+            cutoff = datetime.utcnow() - timedelta(seconds=self.retention_seconds)
+
+        evicted: List[EvidenceRecord] = []
+        while self._records and (
+            len(evicted) < over
+            or (cutoff is not None and self._records[0].occurred_at < cutoff)
+        ):
+            record = self._records.popleft()
+            self._unindex(self._by_company, record.company_id)
+            if record._job_id is not None:
+                self._unindex(self._by_job, record._job_id)
+            self._unindex(self._by_type, record.event_type)
+            evicted.append(record)
+
+        if evicted:
+            self.evicted_count += len(evicted)
+            if self.on_evict is not None:
+                try:
+                    self.on_evict(evicted)
+                except Exception as e:
+                    logger.error(
+                        f"Evidence eviction handler failed for {len(evicted)} records: {e}"
+                    )
+
+    @staticmethod
+    def _unindex(index: Dict[str, Deque[EvidenceRecord]], key: str):
+        bucket = index[key]
+        bucket.popleft()
+        if not bucket:
+            del index[key]
+
+    def for_company(self, company_id: str) -> List[EvidenceRecord]:
+        """Records for a company, oldest first."""
+        return list(self._by_company.get(company_id, ()))
+
+    def for_job(self, job_id: str) -> List[EvidenceRecord]:
+        """Records for a job, oldest first."""
+        return list(self._by_job.get(_compact_id(job_id), ()))
+
+    def for_event_type(self, event_type: str) -> List[EvidenceRecord]:
+        """Records of one event type, oldest first."""
+        return list(self._by_type.get(event_type, ()))
+
+    def query(
+        self,
+        company_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+    ) -> List[EvidenceRecord]:
+        """Records matching every given filter, scanning only the smallest index bucket."""
+        candidates = [self._records]
+        if job_id is not None:
+            job_id = _compact_id(job_id)
+        if company_id is not None:
+            candidates.append(self._by_company.get(company_id, ()))
+        if job_id is not None:
+            candidates.append(self._by_job.get(job_id, ()))
+        if event_type is not None:
+            candidates.append(self._by_type.get(event_type, ()))
+        return [
+            r
+            for r in min(candidates, key=len)
+            if (company_id is None or r.company_id == company_id)
+            and (job_id is None or r._job_id == job_id)
+            and (event_type is None or r.event_type == event_type)
+        ]
+
+    def clear(self):
+        """Drop all records without calling ``on_evict``."""
+        self._records.clear()
+        self._by_company.clear()
+        self._by_job.clear()
+        self._by_type.clear()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[EvidenceRecord]:
+        return iter(self._records)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self._records)[index]
+        return self._records[index]
+
+
+class JsonlSpill:
+    """Eviction handler that appends evicted records to a JSON Lines file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, records: List[EvidenceRecord]):
+        with self.path.open("a", encoding="utf-8") as f:
+            for r in records:
+                f.write(
+                    json.dumps(
+                        {
+                            "id": r.id,
+                            "company_id": r.company_id,
+                            "job_id": r.job_id,
+                            "event_type": r.event_type,
+                            "occurred_at": r.occurred_at.isoformat(),
+                            "payload": r.payload,
+                        },
+                        default=str,
+                    )
+                    + "\n"
+                )
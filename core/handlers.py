@@ -0,0 +1,181 @@
+"""Job handler registry for Profit OS Chimera - maps job types to the functions that run them."""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from enum import Enum
+from .models import Job, EvidenceRecord, new_id
+import importlib
+import logging
+import threading
+
+if TYPE_CHECKING:
+    from .agents import Agent
+
+logger = logging.getLogger(__name__)
+
+# A handler receives the agent running the job and returns its evidence
+Handler = Callable[["Agent", Job], List[EvidenceRecord]]
+
+# Entry point group third-party packages use to register handlers
+ENTRY_POINT_GROUP = "profit_os_chimera.handlers"
+
+# Modules in this repo whose import registers handlers for agents.yml job types
+BUILTIN_HANDLER_MODULES = (
+    "modules.commander_hunter.handlers",
+    "modules.ai_intelligence.handlers",
+    "modules.social_automation.handlers",
+)
+
+
+class HandlerRegistry:
+    """
+    Job type -> handler table.
+
+    Handlers are registered for an exact job type or for a prefix such as
+    ``EXECUTE_PLAY_``; exact matches win, then the longest prefix. Each type
+    is resolved once and cached, so dispatch is a single dict lookup.
+    Plugin handlers (built-in modules and entry points) load on first use.
+    """
+
+    def __init__(
+        self,
+        plugin_modules: Tuple[str, ...] = (),
+        entry_point_group: Optional[str] = None,
+    ):
+        self._exact: Dict[str, Handler] = {}
+        self._prefixes: List[Tuple[str, Handler]] = []
+        self._resolved: Dict[str, Optional[Handler]] = {}
+        self._plugin_modules = plugin_modules
+        self._entry_point_group = entry_point_group
+        self._plugins_loaded = False
+        self._lock = threading.RLock()
+
+    def add(self, job_type: str, handler: Handler, prefix: bool = False):
+        """Register ``handler`` for a job type, or for every type starting with it."""
+        if prefix:
+            self._prefixes = [(p, h) for p, h in self._prefixes if p != job_type]
+            self._prefixes.append((job_type, handler))
+            self._prefixes.sort(key=lambda item: len(item[0]), reverse=True)
+        else:
+            self._exact[job_type] = handler
+        self._resolved = {}
+
+    def remove(self, job_type: str, prefix: bool = False):
+        """Unregister the handler added for a job type or prefix, if any."""
+        if prefix:
+            self._prefixes = [(p, h) for p, h in self._prefixes if p != job_type]
+        else:
+            self._exact.pop(job_type, None)
+        self._resolved = {}
+
+    def register(
+        self, *job_types: str, prefix: bool = False
+    ) -> Callable[[Handler], Handler]:
+        """Decorator form of ``add`` for one or more job types."""
+
+        def decorator(handler: Handler) -> Handler:
+            for job_type in job_types:
+                self.add(job_type, handler, prefix=prefix)
+            return handler
+
+        return decorator
+
+    def resolve(self, job_type: str) -> Optional[Handler]:
+        """Return the handler for a job type, or None if nothing is registered."""
+        try:
+            return self._resolved[job_type]
+        except KeyError:
+            pass
+        self._load_plugins()
+        handler = self._exact.get(job_type)
+        if handler is None:
+            handler = next(
+                (h for p, h in self._prefixes if job_type.startswith(p)), None
+            )
+        self._resolved[job_type] = handler
+        return handler
+
+    def job_types(self) -> List[str]:
+        """Exact job types with a registered handler."""
+        self._load_plugins()
+        return sorted(self._exact)
+
+    def _load_plugins(self):
+        if self._plugins_loaded:
+            return
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            for name in self._plugin_modules:
+                try:
+                    importlib.import_module(name)
+                except ImportError as e:
+                    logger.warning(f"Handler module {name} not loaded: {e}")
+            if self._entry_point_group:
+                self.load_entry_points(self._entry_point_group)
+            self._plugins_loaded = True
+
+    def load_entry_points(self, group: str = ENTRY_POINT_GROUP):
+        """
+        Load handlers advertised by installed packages.
+
+        Each entry point's name is the job type and its object the handler;
+        a name ending in ``*`` registers a prefix.
+        """
+        from importlib.metadata import entry_points
+
+        for ep in entry_points(group=group):
+            try:
+                handler = ep.load()
+            except Exception as e:
+                logger.error(
+                    f"Failed to load handler entry point {ep.name} ({ep.value}): {e}"
+                )
+                continue
+            if ep.name.endswith("*"):
+                self.add(ep.name[:-1], handler, prefix=True)
+            else:
+                self.add(ep.name, handler)
+
+
+def make_evidence(
+    job: Job,
+    event_type: str,
+    payload: Dict[str, Any],
+    occurred_at: Optional[datetime] = None,
+) -> EvidenceRecord:
+    """Evidence record for a job, stamped with the cycle time it started at unless given."""
+    return EvidenceRecord(
+        id=new_id(),
+        company_id=job.company_id,
+        job_id=job._id,
+        event_type=event_type,
+        occurred_at=occurred_at if occurred_at is not None else job.updated_at,
+        payload=payload,
+    )
+
+
+def jsonable(value: Any) -> Any:
+    """Convert module results (dataclasses, enums, datetimes) into JSON-safe evidence payloads."""
+    if is_dataclass(value) and not isinstance(value, type):
+        value = asdict(value)
+    if isinstance(value, dict):
+        return {k: jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [jsonable(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+HANDLERS = HandlerRegistry(BUILTIN_HANDLER_MODULES, ENTRY_POINT_GROUP)
+
+
+def register_handler(
+    *job_types: str, prefix: bool = False
+) -> Callable[[Handler], Handler]:
+    """Register a handler in the default registry used by every Agent."""
+    return HANDLERS.register(*job_types, prefix=prefix)
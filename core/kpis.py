@@ -0,0 +1,201 @@
+"""KPI status evaluation against kpis.yml thresholds, and parsing of ingested KPI points."""
+
+from typing import Any, Dict, Iterator, Optional, Union
+from datetime import datetime
+from pathlib import Path
+import csv
+import json
+import math
+
+# Bytes read per step when streaming a JSON array
+_JSON_READ_SIZE = 1 << 20
+
+
+def kpi_status(
+    value: float, definition: Optional[Dict[str, Any]], target: Optional[float] = None
+) -> str:
+    """
+    Classify a KPI value as ok, warning or critical.
+
+    Uses absolute thresholds (``critical_below``/``warning_below`` and
+    ``critical_above``/``warning_above``) when defined, otherwise the ratio
+    to ``target`` (``critical_ratio_below``/``warning_ratio_below``, default
+    0.5/0.8). ``target`` overrides the definition's target. Returns
+    "unknown" when the KPI has neither thresholds nor a target.
+    """
+    definition = definition or {}
+    absolute = False
+
+    if "critical_below" in definition or "warning_below" in definition:
+        absolute = True
+        if "critical_below" in definition and value < definition["critical_below"]:
+            return "critical"
+        if "warning_below" in definition and value < definition["warning_below"]:
+            return "warning"
+
+    if "critical_above" in definition or "warning_above" in definition:
+        absolute = True
+        if "critical_above" in definition and value > definition["critical_above"]:
+            return "critical"
+        if "warning_above" in definition and value > definition["warning_above"]:
+            return "warning"
+
+    if absolute:
+        return "ok"
+
+    if target is None:
+        target = definition.get("target")
+    if not target:
+        return "unknown"
+    ratio = value / target if target > 0 else 0
+    if ratio < definition.get("critical_ratio_below", 0.5):
+        return "critical"
+    if ratio < definition.get("warning_ratio_below", 0.8):
+        return "warning"
+    return "ok"
+
+
+class KPIPointError(ValueError):
+    """An ingested KPI point is missing a field or has an unusable value."""
+
+
+def _number(record: Dict[str, Any], field: str, required: bool) -> Optional[float]:
+    raw = record.get(field)
+    if raw is None or raw == "":
+        if required:
+            raise KPIPointError(f"missing {field}")
+        return None
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        raise KPIPointError(f"{field} is not a number: {raw!r}")
+    if not math.isfinite(value):
+        raise KPIPointError(f"{field} is not finite: {raw!r}")
+    return value
+
+
+def parse_point(
+    record: Dict[str, Any], default_time: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    Validate one ingested KPI point (a parsed JSON object or CSV row).
+
+    Requires ``company_id``, ``name`` and a finite ``value``; ``target`` is
+    optional and ``recorded_at`` (ISO 8601) defaults to ``default_time`` or
+    now. Timezone-aware times are converted to naive UTC. Raises
+    KPIPointError.
+    """
+    if not isinstance(record, dict):
+        raise KPIPointError("expected an object")
+    company_id = record.get("company_id")
+    name = record.get("name")
+    if not company_id or not isinstance(company_id, str):
+        raise KPIPointError("missing company_id")
+    if not name or not isinstance(name, str):
+        raise KPIPointError("missing name")
+
+    raw_time = record.get("recorded_at")
+    if raw_time is None or raw_time == "":
+        recorded_at = default_time or datetime.utcnow()
+    else:
+        try:
+            recorded_at = datetime.fromisoformat(str(raw_time).replace("Z", "+00:00"))
+        except ValueError:
+            raise KPIPointError(f"recorded_at is not ISO 8601: {raw_time!r}")
+        if recorded_at.tzinfo is not None:
+            recorded_at = datetime.utcfromtimestamp(recorded_at.timestamp())
+
+    return {
+        "company_id": company_id,
+        "name": name,
+        "value": _number(record, "value", required=True),
+        "target": _number(record, "target", required=False),
+        "recorded_at": recorded_at,
+    }
+
+
+def _iter_json_array(f, read_size: int = _JSON_READ_SIZE) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    buf = f.read(read_size).lstrip()
+    if not buf.startswith("["):
+        raise ValueError("expected a JSON array")
+    pos = 1
+    eof = False
+    while True:
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf) and buf[pos] == "]":
+            return
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            # Element split across reads; pull in more text and retry
+            if eof:
+                raise
+            chunk = f.read(read_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        yield item
+        pos = end
+        if pos > read_size:
+            buf, pos = buf[pos:], 0
+
+
+def _expand(record: Any) -> Iterator[Any]:
+    """Wide rows (``{"company_id", "metrics": {name: value}}``) become one record per KPI."""
+    if isinstance(record, dict) and isinstance(record.get("metrics"), dict):
+        for name, value in record["metrics"].items():
+            yield {
+                "company_id": record.get("company_id"),
+                "name": name,
+                "value": value,
+                "recorded_at": record.get("recorded_at"),
+            }
+    else:
+        yield record
+
+
+def iter_metric_file(path: Union[str, Path]) -> Iterator[Any]:
+    """
+    Stream raw KPI records from a ``.csv``, ``.jsonl``/``.ndjson`` or
+    ``.json`` file, one record at a time.
+
+    CSV files need a header row. A JSON file is either an array of records
+    or an object of company id -> {KPI name: value}. Records can be long
+    (``company_id``, ``name``, ``value``, ``recorded_at``) or wide (``metrics``
+    mapping); validate them with ``parse_point``. Malformed JSON lines are
+    yielded as KPIPointError instances so callers can count them.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, newline="" if suffix == ".csv" else None, encoding="utf-8") as f:
+        if suffix == ".csv":
+            yield from csv.DictReader(f)
+        elif suffix in (".jsonl", ".ndjson"):
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield KPIPointError(f"line {line_no}: invalid JSON: {e}")
+                    continue
+                yield from _expand(record)
+        elif suffix == ".json":
+            head = f.read(1)
+            while head and head.isspace():
+                head = f.read(1)
+            f.seek(0)
+            if head == "{":
+                for company_id, metrics in json.load(f).items():
+                    yield from _expand({"company_id": company_id, "metrics": metrics})
+            else:
+                for record in _iter_json_array(f):
+                    yield from _expand(record)
+        else:
+            raise ValueError(
+                f"Unsupported metrics file type: {path.suffix} (expected .csv, .jsonl or .json)"
+            )
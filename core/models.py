@@ -1,11 +1,15 @@
 """Core data models for Profit OS Chimera."""
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Literal, Optional
+from dataclasses import FrozenInstanceError, dataclass, field
+from typing import Dict, List, Literal, Optional, Union
 from datetime import datetime
+import sys
 import uuid
 
-Status = Literal["queued", "running", "succeeded", "failed"]
+Status = Literal["queued", "running", "succeeded", "failed", "skipped"]
+
+# Job priority used when a play does not declare one; lower values run first.
+DEFAULT_PRIORITY = 100
 
 
 @dataclass
@@ -28,37 +32,139 @@ class KPI:
     metadata: Dict = field(default_factory=dict)
 
 
-@dataclass
+def new_id() -> int:
+    """A random 128-bit id; kept as an int in memory and formatted as a UUID string on access."""
+    return uuid.uuid4().int
+
+
+def _compact_id(value: Union[int, str]) -> Union[int, str]:
+    """Store canonical UUID strings as 128-bit ints; keep any other id as given."""
+    if isinstance(value, int):
+        return value
+    if len(value) == 36:
+        try:
+            compact = uuid.UUID(value)
+        except ValueError:
+            return value
+        if str(compact) == value:
+            return compact.int
+    return value
+
+
+def _format_id(value: Union[int, str]) -> str:
+    if isinstance(value, int):
+        h = "%032x" % value
+        return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+    return value
+
+
 class Job:
-    """A single unit of work in the Profit OS system."""
-    id: str
-    type: str
-    company_id: str
-    payload: Dict
-    status: Status = "queued"
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    """A single unit of work in the Profit OS system.
 
-    def __post_init__(self):
-        """Ensure timestamps are timezone-aware if needed."""
-        if isinstance(self.created_at, str):
-            # Handle ISO string format if needed
-            pass
+    Slotted to keep millions of queued jobs compact: the id is held as a
+    128-bit int (``id`` still reads and writes UUID strings), the type
+    string is interned, and ``updated_at`` shares ``created_at`` until the
+    job changes state.
+    """
+    __slots__ = (
+        "_id", "type", "company_id", "payload", "status", "priority",
+        "depends_on", "created_at", "updated_at",
+    )
+
+    def __init__(
+        self,
+        id: Union[int, str],
+        type: str,
+        company_id: str,
+        payload: Dict,
+        status: Status = "queued",
+        priority: int = DEFAULT_PRIORITY,
+        depends_on: Optional[List[str]] = None,  # ids of jobs that must succeed first
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None
+    ):
+        self._id = _compact_id(id)
+        self.type = sys.intern(type)
+        self.company_id = company_id
+        self.payload = payload
+        self.status = status
+        self.priority = priority
+        self.depends_on = depends_on if depends_on is not None else []
+        self.created_at = created_at if created_at is not None else datetime.utcnow()
+        self.updated_at = updated_at if updated_at is not None else self.created_at
+
+    @property
+    def id(self) -> str:
+        return _format_id(self._id)
+
+    @id.setter
+    def id(self, value: Union[int, str]):
+        self._id = _compact_id(value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Job):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"Job(id={self.id!r}, type={self.type!r}, company_id={self.company_id!r}, "
+            f"status={self.status!r}, priority={self.priority!r})"
+        )
 
 
-@dataclass
 class EvidenceRecord:
-    """Records evidence of actions and their outcomes."""
-    id: str
-    company_id: str
-    job_id: str
-    event_type: str
-    occurred_at: datetime
-    payload: Dict
-
-    def __post_init__(self):
-        """Ensure timestamps are timezone-aware if needed."""
-        if isinstance(self.occurred_at, str):
-            # Handle ISO string format if needed
-            pass
+    """Records evidence of actions and their outcomes. Immutable and slotted."""
+    __slots__ = ("_id", "company_id", "_job_id", "event_type", "occurred_at", "payload")
+
+    def __init__(
+        self,
+        id: Union[int, str],
+        company_id: str,
+        job_id: Optional[Union[int, str]],
+        event_type: str,
+        occurred_at: datetime,
+        payload: Dict
+    ):
+        setattr_ = object.__setattr__
+        setattr_(self, "_id", _compact_id(id))
+        setattr_(self, "company_id", company_id)
+        setattr_(self, "_job_id", _compact_id(job_id) if job_id is not None else None)
+        setattr_(self, "event_type", sys.intern(event_type))
+        setattr_(self, "occurred_at", occurred_at)
+        setattr_(self, "payload", payload)
+
+    @property
+    def id(self) -> str:
+        return _format_id(self._id)
+
+    @property
+    def job_id(self) -> Optional[str]:
+        return _format_id(self._job_id) if self._job_id is not None else None
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+
+    def __reduce__(self):
+        # Rebuild through __init__ so pickling (process pools) bypasses __setattr__
+        return (EvidenceRecord, (
+            self._id, self.company_id, self._job_id, self.event_type, self.occurred_at, self.payload
+        ))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, EvidenceRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    __hash__ = None
 
+    def __repr__(self) -> str:
+        return (
+            f"EvidenceRecord(id={self.id!r}, company_id={self.company_id!r}, job_id={self.job_id!r}, "
+            f"event_type={self.event_type!r}, occurred_at={self.occurred_at!r})"
+        )
@@ -1,89 +1,581 @@
 """Orchestrator for Profit OS Chimera - manages job queue and agent routing."""
 
-from typing import List, Dict, Optional
-from .models import Job, EvidenceRecord
+from typing import Callable, List, Dict, Iterator, Optional, Sequence, Set, Tuple, Union
+from collections import OrderedDict
+from dataclasses import dataclass
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from .models import Job, EvidenceRecord, new_id, _compact_id, _format_id
 from .agents import Agent
+from .evidence_store import EvidenceStore
 from datetime import datetime
+import functools
+import heapq
+import itertools
 import logging
-import uuid
+import os
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
+# Policy used when an Orchestrator is created without one: first, round_robin or least_loaded
+DEFAULT_POLICY = os.getenv("ORCHESTRATOR_POLICY", "first")
+
+# Finished jobs kept for status lookups before the oldest are dropped
+MAX_COMPLETED_JOBS = int(os.getenv("ORCHESTRATOR_MAX_COMPLETED_JOBS", "10000"))
+
+# Job statuses that take no further part in scheduling
+FINISHED_STATUSES = ("succeeded", "failed", "skipped")
+
+# Jobs are keyed by their compact id (``Job._id``: a 128-bit int for UUIDs),
+# so the scheduler's containers never hold formatted UUID strings
+JobKey = Union[int, str]
+
+# Receives each cycle's evidence batch, e.g. to persist it in bulk
+EvidenceSink = Callable[[List[EvidenceRecord]], None]
+
+
+@dataclass
+class CycleReport:
+    """Timing summary of the last run_cycle call."""
+    jobs_finished: int
+    wall_seconds: float
+    critical_path_seconds: float  # longest chain of dependent job durations
+    critical_path: List[str]  # job ids along that chain
+
+
+def _handle_job(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Pool entry point; module-level so process pools can pickle it."""
+    return agent.handle(job)
+
+
+class SelectionPolicy:
+    """Chooses one agent among those capable of handling a job."""
+    
+    def select(self, job: Job, candidates: Sequence[Agent], orchestrator: "Orchestrator") -> Agent:
+        raise NotImplementedError
+
+
+class FirstCapablePolicy(SelectionPolicy):
+    """Always pick the first capable agent in agents.yml order."""
+    
+    def select(self, job: Job, candidates: Sequence[Agent], orchestrator: "Orchestrator") -> Agent:
+        return candidates[0]
+
+
+class RoundRobinPolicy(SelectionPolicy):
+    """Rotate through the capable agents for each job type."""
+    
+    def __init__(self):
+        self._next: Dict[str, int] = {}
+    
+    def select(self, job: Job, candidates: Sequence[Agent], orchestrator: "Orchestrator") -> Agent:
+        i = self._next.get(job.type, 0)
+        self._next[job.type] = i + 1
+        return candidates[i % len(candidates)]
+
+
+class LeastLoadedPolicy(SelectionPolicy):
+    """Pick the capable agent with the fewest in-flight, then assigned, jobs."""
+    
+    def select(self, job: Job, candidates: Sequence[Agent], orchestrator: "Orchestrator") -> Agent:
+        in_flight = orchestrator.in_flight
+        assigned = orchestrator.assigned
+        return min(candidates, key=lambda a: (in_flight[a.name], assigned[a.name]))
+
+
+POLICIES = {
+    "first": FirstCapablePolicy,
+    "round_robin": RoundRobinPolicy,
+    "least_loaded": LeastLoadedPolicy,
+}
+
 
 class Orchestrator:
     """Orchestrates job execution across agents."""
     
-    def __init__(self, agents: List[Agent]):
+    def __init__(
+        self,
+        agents: List[Agent],
+        policy: Union[str, SelectionPolicy, None] = None,
+        max_completed: int = MAX_COMPLETED_JOBS,
+        executor: Optional[str] = None,
+        max_workers: int = 8,
+        agent_limits: Optional[Dict[str, int]] = None,
+        job_timeout: Optional[float] = None,
+        evidence_sink: Optional[EvidenceSink] = None,
+        evidence_store: Optional[EvidenceStore] = None
+    ):
+        """
+        Args:
+            agents: Agents available for routing
+            policy: Agent selection policy name or instance
+            max_completed: Finished jobs retained for status lookups
+            executor: None to run jobs serially, "thread" for I/O-bound agents
+                or "process" for CPU-bound ones
+            max_workers: Pool size when an executor is set
+            agent_limits: Agent name -> max concurrent jobs; defaults to each
+                agent's ``max_concurrency`` in agents.yml
+            job_timeout: Seconds before a pooled job is marked failed
+            evidence_sink: Called with each cycle's evidence, in order
+            evidence_store: In-memory evidence retention; defaults to a
+                store capped at ``ORCHESTRATOR_MAX_EVIDENCE`` records
+        """
+        if executor not in (None, "thread", "process"):
+            raise ValueError(f"Unknown executor: {executor} (expected 'thread' or 'process')")
         self.agents = agents
-        self.jobs: Dict[str, Job] = {}
-        self.evidence: List[EvidenceRecord] = []
+        self.jobs: Dict[JobKey, Job] = {}  # queued and running jobs
+        self.completed_jobs: "OrderedDict[JobKey, Job]" = OrderedDict()  # most recent finished jobs
+        self.max_completed = max_completed
+        self._queue: List[Tuple[int, int, JobKey]] = []  # heap of (priority, enqueue seq, job key)
+        self._sequence = itertools.count()
+        self._order: Dict[JobKey, Tuple[int, int]] = {}  # job key -> heap key, for result ordering
+        self._unmet: Dict[JobKey, int] = {}  # blocked job key -> parents not yet succeeded
+        self._dependents: Dict[JobKey, List[JobKey]] = {}  # parent job key -> blocked child keys
+        self._skipped_on_enqueue: List[Tuple[JobKey, JobKey]] = []  # (job key, failed parent key)
+        self._results: Dict[Tuple[int, int], List[EvidenceRecord]] = {}
+        self._cycle_jobs: List[JobKey] = []  # job keys in finish order, this cycle
+        self._cycle_started = 0.0
+        self._durations: Dict[JobKey, float] = {}  # start time while running, then duration
+        self.last_cycle: Optional[CycleReport] = None
+        self.cycle_time = datetime.utcnow()  # wall-clock timestamp shared by one cycle's updates
+        self.evidence = evidence_store if evidence_store is not None else EvidenceStore()
+        self.evidence_sink = evidence_sink
+        
+        # Job type -> capable agents (in config order), built once
+        self.agents_by_name: Dict[str, Agent] = {}
+        self.routes: Dict[str, List[Agent]] = {}
+        for agent in agents:
+            self.agents_by_name.setdefault(agent.name, agent)
+            for job_type in agent.capabilities:
+                self.routes.setdefault(job_type, []).append(agent)
+        
+        if policy is None:
+            policy = DEFAULT_POLICY
+        if isinstance(policy, str):
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown selection policy: {policy} (expected one of {sorted(POLICIES)})")
+            policy = POLICIES[policy]()
+        self.policy = policy
+        self.in_flight: Dict[str, int] = {agent.name: 0 for agent in agents}
+        self.assigned: Dict[str, int] = {agent.name: 0 for agent in agents}
+        
+        self.executor = executor
+        self.max_workers = max_workers
+        self.job_timeout = job_timeout
+        self.agent_limits: Dict[str, int] = {
+            agent.name: agent.metadata["max_concurrency"]
+            for agent in agents if agent.metadata.get("max_concurrency")
+        }
+        self.agent_limits.update(agent_limits or {})
+        self._pool: Optional[Executor] = None
+        # Timed-out pooled jobs whose workers are still running; each keeps
+        # its agent's in_flight slot until its future finishes
+        self._abandoned: Set[Future] = set()
+        self._slots = threading.Condition()  # guards in_flight once pooled jobs can time out
     
     def enqueue(self, job: Job):
-        """Add a job to the queue."""
-        self.jobs[job.id] = job
+        """
+        Add a job to the queue.
+        
+        A job with ``depends_on`` waits until every parent has succeeded and is
+        skipped if any parent fails. Parents may be enqueued after their
+        children, but before the cycle runs: jobs still blocked when a cycle
+        ends (a parent never enqueued, or a dependency loop) are skipped.
+        
+        A job that already finished (succeeded, failed or skipped) is only
+        recorded, so dependents can resolve against it; other statuses are
+        rejected.
+        """
+        key = job._id
+        if job.status in FINISHED_STATUSES:
+            self._retire(job, key)
+            logger.info(f"Job {job.id} ({job.type}) recorded as {job.status} for company {job.company_id}")
+            return
+        if job.status != "queued":
+            raise ValueError(f"Cannot enqueue job {job.id} with status {job.status!r}")
+        self.jobs[key] = job
+        
+        self._order[key] = (job.priority, next(self._sequence))
+        unmet = 0
+        failed_parent = None
+        for parent_id in job.depends_on:
+            parent_key = _compact_id(parent_id)
+            parent = self._lookup(parent_key)
+            if parent is not None and parent.status == "succeeded":
+                continue
+            if parent is not None and parent.status in ("failed", "skipped"):
+                failed_parent = parent_key
+                continue
+            self._dependents.setdefault(parent_key, []).append(key)
+            unmet += 1
+        
+        if failed_parent is not None:
+            self._skipped_on_enqueue.append((key, failed_parent))
+        elif unmet:
+            self._unmet[key] = unmet
+        else:
+            heapq.heappush(self._queue, self._order[key] + (key,))
         logger.info(f"Job {job.id} ({job.type}) enqueued for company {job.company_id}")
     
+    def _dequeue(self) -> Optional[Job]:
+        """Pop the highest-priority queued job, or None if the queue is empty."""
+        while self._queue:
+            _, _, key = heapq.heappop(self._queue)
+            job = self.jobs.get(key)
+            if job is not None and job.status == "queued":
+                return job
+            self._order.pop(key, None)
+        return None
+    
+    def _retire(self, job: Job, key: JobKey):
+        """Move a finished job out of the active set into the bounded completed store."""
+        self.jobs.pop(key, None)
+        self.completed_jobs[key] = job
+        while len(self.completed_jobs) > self.max_completed:
+            self.completed_jobs.popitem(last=False)
+    
     def run_cycle(self) -> List[EvidenceRecord]:
         """
         Run one cycle of the orchestrator.
-        Processes all queued jobs and returns evidence records.
+        Processes queued jobs in priority order and returns evidence records.
+        
+        Jobs unblocked by a parent finishing run in the same cycle. With an
+        executor configured, independent jobs run concurrently; evidence is
+        still returned grouped per job in queue order, so batches are
+        reproducible. Timing is available in ``last_cycle``.
         """
+        self._begin_cycle()
+        if self.executor is None:
+            self._run_serial()
+        else:
+            self._run_concurrent()
+        return self._end_cycle()
+    
+    def _begin_cycle(self):
+        """Reset per-cycle bookkeeping and skip jobs whose parents already failed."""
+        self._results = {}
+        self._cycle_jobs = []
+        self._cycle_started = time.perf_counter()
+        self.cycle_time = datetime.utcnow()
+        skipped, self._skipped_on_enqueue = self._skipped_on_enqueue, []
+        for key, parent_key in skipped:
+            job = self.jobs.get(key)
+            if job is not None and job.status == "queued":
+                self._skip(job, parent_key)
+    
+    def _end_cycle(self) -> List[EvidenceRecord]:
+        """Skip jobs left blocked, collect evidence in queue order and compute the cycle report."""
+        for key in list(self._unmet):
+            job = self.jobs.get(key)
+            if job is not None and job.status == "queued":
+                parent_key = next(
+                    (pk for pk in map(_compact_id, job.depends_on)
+                     if getattr(self._lookup(pk), "status", None) != "succeeded"),
+                    None,
+                )
+                self._skip(job, parent_key, reason="dependency_unresolved")
+        # Children of parents that were never enqueued are skipped now
+        self._dependents.clear()
+        
         evidence_batch = []
+        for key in sorted(self._results):
+            evidence_batch.extend(self._results[key])
+        self.evidence.extend(evidence_batch)
+        if self.evidence_sink is not None and evidence_batch:
+            self.evidence_sink(evidence_batch)
+        
+        # Longest chain of dependent job durations among jobs finished this cycle;
+        # finish order is a topological order since children start after parents.
+        path_time: Dict[JobKey, float] = {}
+        path_prev: Dict[JobKey, Optional[JobKey]] = {}
+        for key in self._cycle_jobs:
+            job = self._lookup(key)
+            best, prev = 0.0, None
+            for parent_key in (map(_compact_id, job.depends_on) if job else ()):
+                if path_time.get(parent_key, -1.0) > best:
+                    best, prev = path_time[parent_key], parent_key
+            path_time[key] = best + self._durations.pop(key, 0.0)
+            path_prev[key] = prev
         
-        for job in list(self.jobs.values()):
-            if job.status != "queued":
+        critical_path: List[str] = []
+        if path_time:
+            node: Optional[JobKey] = max(path_time, key=path_time.get)
+            critical_seconds = path_time[node]
+            while node is not None:
+                critical_path.append(_format_id(node))
+                node = path_prev[node]
+            critical_path.reverse()
+        else:
+            critical_seconds = 0.0
+        
+        self.last_cycle = CycleReport(
+            jobs_finished=len(self._cycle_jobs),
+            wall_seconds=time.perf_counter() - self._cycle_started,
+            critical_path_seconds=critical_seconds,
+            critical_path=critical_path,
+        )
+        self._results = {}
+        self._cycle_jobs = []
+        return evidence_batch
+    
+    def _run_serial(self):
+        """Execute queued jobs one at a time on the calling thread."""
+        while True:
+            job = self._dequeue()
+            if job is None:
+                break
+            agent = self._select_agent(job)
+            if agent is None:
+                self._finish(job, None, None, None)
                 continue
-            
+            self._start(job, agent)
+            try:
+                records, error = agent.handle(job), None
+            except Exception as e:
+                records, error = None, e
+            self._finish(job, agent, records, error)
+    
+    def _run_concurrent(self):
+        """Execute queued jobs on the worker pool, honouring agent limits and timeouts."""
+        pool = self._get_pool()
+        running: Dict[Future, Tuple[Job, Agent, Optional[float]]] = {}
+        deferred: List[Job] = []  # jobs whose agent was at its concurrency limit
+        
+        def dispatch(job: Job) -> bool:
             agent = self._select_agent(job)
-            if not agent:
-                logger.warning(f"No agent found for job type: {job.type}")
-                job.status = "failed"
-                job.updated_at = datetime.utcnow()
+            if agent is None:
+                self._finish(job, None, None, None)
+                return True
+            limit = self.agent_limits.get(agent.name)
+            if limit and self.in_flight[agent.name] >= limit:
+                return False
+            self._start(job, agent)
+            deadline = time.monotonic() + self.job_timeout if self.job_timeout else None
+            running[pool.submit(_handle_job, agent, job)] = (job, agent, deadline)
+            return True
+        
+        while True:
+            waiting, deferred = deferred, []
+            for job in waiting:
+                if len(running) >= self.max_workers or not dispatch(job):
+                    deferred.append(job)
+            while len(running) < self.max_workers:
+                job = self._dequeue()
+                if job is None:
+                    break
+                if not dispatch(job):
+                    deferred.append(job)
+            
+            if not running:
+                if not deferred:
+                    break
+                with self._slots:
+                    if self._abandoned:
+                        # Deferred jobs wait for a timed-out job to free its agent's slot
+                        self._slots.wait()
+                # Otherwise the slot was freed since the last dispatch; retry it
                 continue
             
-            job.status = "running"
-            job.updated_at = datetime.utcnow()
+            deadlines = [d for _, _, d in running.values() if d is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
             
-            try:
-                records = agent.handle(job)
-                evidence_batch.extend(records)
-                self.evidence.extend(records)
+            for future in done:
+                job, agent, _ = running.pop(future)
+                try:
+                    records, error = future.result(), None
+                except Exception as e:
+                    records, error = None, e
+                self._finish(job, agent, records, error)
+            
+            now = time.monotonic()
+            for future, (job, agent, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    # The worker cannot be interrupted; it finishes in the background
+                    # and only then releases its agent slot
+                    del running[future]
+                    error = TimeoutError(f"Job exceeded {self.job_timeout}s timeout")
+                    self._finish(job, agent, None, error, release=False)
+                    with self._slots:
+                        self._abandoned.add(future)
+                    future.cancel()
+                    future.add_done_callback(functools.partial(self._release_abandoned, agent.name))
+    
+    def _release_abandoned(self, agent_name: str, future: Future):
+        """Done callback of a timed-out job: free its agent slot now that its worker has returned."""
+        with self._slots:
+            self._abandoned.discard(future)
+            self.in_flight[agent_name] -= 1
+            self._slots.notify_all()
+    
+    def _start(self, job: Job, agent: Agent):
+        """Mark a job as running on an agent."""
+        job.status = "running"
+        job.updated_at = self.cycle_time
+        self.assigned[agent.name] += 1
+        with self._slots:
+            self.in_flight[agent.name] += 1
+        self._durations[job._id] = time.perf_counter()
+    
+    def _finish(
+        self,
+        job: Job,
+        agent: Optional[Agent],
+        records: Optional[List[EvidenceRecord]],
+        error: Optional[BaseException],
+        release: bool = True
+    ) -> List[EvidenceRecord]:
+        """
+        Record a job's outcome, retire it, release or skip its dependents and
+        return its evidence. With ``release=False`` the agent's slot stays
+        taken (its worker is still running).
+        """
+        key = job._id
+        if key in self._durations:
+            self._durations[key] = time.perf_counter() - self._durations[key]
+        if agent is None:
+            logger.warning(f"No agent found for job type: {job.type}")
+            job.status = "failed"
+            records = []
+        else:
+            if release:
+                with self._slots:
+                    self.in_flight[agent.name] -= 1
+            if error is None:
                 job.status = "succeeded"
                 logger.info(f"Job {job.id} succeeded, produced {len(records)} evidence records")
-            except Exception as e:
+            else:
                 job.status = "failed"
-                error_record = EvidenceRecord(
-                    id=str(uuid.uuid4()),
+                records = [EvidenceRecord(
+                    id=new_id(),
                     company_id=job.company_id,
-                    job_id=job.id,
+                    job_id=key,
                     event_type="error",
-                    occurred_at=datetime.utcnow(),
-                    payload={"error": str(e), "error_type": type(e).__name__}
-                )
-                evidence_batch.append(error_record)
-                self.evidence.append(error_record)
-                logger.error(f"Job {job.id} failed: {e}", exc_info=True)
-            finally:
-                job.updated_at = datetime.utcnow()
+                    occurred_at=self.cycle_time,
+                    payload={"error": str(error), "error_type": type(error).__name__}
+                )]
+                logger.error(f"Job {job.id} failed: {error}", exc_info=error)
         
-        return evidence_batch
+        job.updated_at = self.cycle_time
+        self._retire(job, key)
+        self._results[self._order.pop(key)] = records
+        self._cycle_jobs.append(key)
+        
+        children = self._dependents.pop(key, [])
+        for child_key in children:
+            child = self.jobs.get(child_key)
+            if child is None or child.status != "queued":
+                continue
+            if job.status == "succeeded":
+                self._unmet[child_key] -= 1
+                if self._unmet[child_key] == 0:
+                    del self._unmet[child_key]
+                    heapq.heappush(self._queue, self._order[child_key] + (child_key,))
+            else:
+                self._skip(child, key)
+        return records
+    
+    def _skip(self, job: Job, failed_parent: Optional[JobKey], reason: str = "dependency_not_succeeded"):
+        """Skip a job and its queued descendants because a parent did not (or cannot) succeed."""
+        key = job._id
+        dependency = _format_id(failed_parent) if failed_parent is not None else None
+        self._unmet.pop(key, None)
+        job.status = "skipped"
+        job.updated_at = self.cycle_time
+        self._retire(job, key)
+        self._results[self._order.pop(key)] = [EvidenceRecord(
+            id=new_id(),
+            company_id=job.company_id,
+            job_id=key,
+            event_type="job_skipped",
+            occurred_at=job.updated_at,
+            payload={"reason": reason, "dependency": dependency}
+        )]
+        self._cycle_jobs.append(key)
+        logger.warning(f"Job {job.id} skipped ({reason}): dependency {dependency}")
+        for child_key in self._dependents.pop(key, []):
+            child = self.jobs.get(child_key)
+            if child is not None and child.status == "queued":
+                self._skip(child, key, reason)
+    
+    def _get_pool(self) -> Executor:
+        """Create the worker pool on first use."""
+        if self._pool is None:
+            if self.executor == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="orchestrator")
+        return self._pool
+    
+    def shutdown(self, wait: bool = True):
+        """Release the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+    
+    def __enter__(self) -> "Orchestrator":
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.shutdown()
     
     def _select_agent(self, job: Job) -> Optional[Agent]:
-        """Select the appropriate agent for a job type."""
-        for agent in self.agents:
-            if agent.can_handle(job.type):
+        """
+        Select the agent for a job.
+        
+        The ``handler`` named in the job payload wins when it can handle the
+        job type; otherwise the selection policy picks among capable agents.
+        """
+        candidates = self.routes.get(job.type)
+        if not candidates:
+            return None
+        
+        handler = job.payload.get("handler")
+        if handler:
+            agent = self.agents_by_name.get(handler)
+            if agent is not None and job.type in agent.capabilities:
                 return agent
-        return None
+            logger.warning(f"Handler {handler} cannot handle {job.type}, using {type(self.policy).__name__}")
+        
+        if len(candidates) == 1:
+            return candidates[0]
+        return self.policy.select(job, candidates, self)
+    
+    def _lookup(self, key: JobKey) -> Optional[Job]:
+        return self.jobs.get(key) or self.completed_jobs.get(key)
     
-    def get_job_status(self, job_id: str) -> Optional[Job]:
+    def get_job_status(self, job_id: Union[int, str]) -> Optional[Job]:
         """Get the status of a specific job."""
-        return self.jobs.get(job_id)
+        return self._lookup(_compact_id(job_id))
+    
+    def all_jobs(self) -> Iterator[Job]:
+        """Iterate active jobs, then retained completed jobs."""
+        yield from self.jobs.values()
+        yield from self.completed_jobs.values()
+    
+    @property
+    def queued_count(self) -> int:
+        """Number of entries waiting in the priority queue."""
+        return len(self._queue)
+    
+    @property
+    def blocked_count(self) -> int:
+        """Number of queued jobs still waiting on dependencies."""
+        return len(self._unmet)
     
     def get_evidence_for_company(self, company_id: str) -> List[EvidenceRecord]:
-        """Get all evidence records for a company."""
-        return [e for e in self.evidence if e.company_id == company_id]
+        """Get retained evidence records for a company."""
+        return self.evidence.for_company(company_id)
     
     def get_evidence_for_job(self, job_id: str) -> List[EvidenceRecord]:
-        """Get all evidence records for a specific job."""
-        return [e for e in self.evidence if e.job_id == job_id]
+        """Get retained evidence records for a specific job."""
+        return self.evidence.for_job(job_id)
 
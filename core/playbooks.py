@@ -1,9 +1,29 @@
 """Playbook system for Profit OS Chimera - evaluates triggers and generates jobs."""
 
-from typing import Dict, Any, List
-from .models import Job
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Callable, Iterable
+from .models import Job, DEFAULT_PRIORITY, new_id
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-import uuid
+import operator
+
+import numpy as np
+
+# Operator string -> comparison function, resolved once when a play is compiled.
+OPERATORS: Dict[str, Callable[[float, float], bool]] = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+# Equality checks reject most snapshots, so they run before range checks.
+_OPERATOR_COST = {"==": 0, "<": 1, "<=": 1, ">": 1, ">=": 1, "!=": 2}
+
+# A compiled clause: (kpi name, ratio divisor or None for absolute, comparison, threshold)
+Clause = Tuple[str, Optional[float], Callable[[float, float], bool], float]
 
 
 def evaluate_triggers(kpi_snapshot: Dict[str, float], play: Dict[str, Any], kpi_definitions: Dict[str, Dict[str, Any]]) -> bool:
@@ -67,10 +87,177 @@ def evaluate_triggers(kpi_snapshot: Dict[str, float], play: Dict[str, Any], kpi_
     return True
 
 
+def _compile_clause(clause: Dict[str, Any], kpi_definitions: Dict[str, Dict[str, Any]]) -> Optional[Clause]:
+    """Resolve a trigger clause, or return None if it can never pass."""
+    name = clause["kpi"]
+    compare = OPERATORS.get(clause["operator"])
+    if compare is None:
+        return None
+
+    divisor = None
+    if clause.get("relation", "absolute") == "ratio_to_target":
+        target = kpi_definitions.get(name, {}).get("target")
+        if not (target and target > 0):
+            return None
+        divisor = target
+
+    return (name, divisor, compare, clause["value"])
+
+
+def _clause_cost(raw: Dict[str, Any]) -> Tuple[int, int]:
+    """Sort key putting cheap, selective clauses first."""
+    is_ratio = 1 if raw.get("relation", "absolute") == "ratio_to_target" else 0
+    return (is_ratio, _OPERATOR_COST.get(raw["operator"], 3))
+
+
+def _resolve_step_dependencies(play_id: str, job_plan: List[Dict[str, Any]]) -> Tuple[Tuple[int, ...], ...]:
+    """
+    Resolve each step's ``depends_on`` step ids to step indexes.
+
+    Raises:
+        ValueError: If two steps share an id, a step depends on an unknown
+            step or the plan has a cycle
+    """
+    index_by_id: Dict[str, int] = {}
+    for i, step in enumerate(job_plan):
+        if "id" in step:
+            if step["id"] in index_by_id:
+                raise ValueError(f"Play {play_id}: duplicate step id '{step['id']}'")
+            index_by_id[step["id"]] = i
+
+    parents = []
+    children: List[List[int]] = [[] for _ in job_plan]
+    for i, step in enumerate(job_plan):
+        resolved = []
+        for dep in step.get("depends_on", []):
+            if dep not in index_by_id:
+                raise ValueError(f"Play {play_id}: step depends on unknown step '{dep}'")
+            resolved.append(index_by_id[dep])
+            children[index_by_id[dep]].append(i)
+        parents.append(tuple(resolved))
+
+    # Kahn's algorithm; steps never reached mean a cycle
+    indegree = [len(p) for p in parents]
+    ready = deque(i for i, n in enumerate(indegree) if n == 0)
+    visited = 0
+    while ready:
+        done = ready.popleft()
+        visited += 1
+        for child in children[done]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    if visited != len(job_plan):
+        raise ValueError(f"Play {play_id}: job_plan depends_on has a cycle")
+    return tuple(parents)
+
+
+class CompiledPlay:
+    """A play whose triggers are pre-resolved into a reusable predicate.
+
+    Semantics match ``evaluate_triggers``: missing KPIs and ratio clauses
+    without a positive target fail, every ``all`` clause must pass and at
+    least one ``any`` clause must pass when ``any`` is non-empty.
+    """
+
+    __slots__ = (
+        "play", "id", "name", "priority", "job_plan", "step_parents",
+        "kpi_names", "all_clauses", "any_clauses", "never",
+    )
+
+    def __init__(self, play: Dict[str, Any], kpi_definitions: Dict[str, Dict[str, Any]]):
+        self.play = play
+        self.id = play["id"]
+        self.name = play.get("name", "")
+        self.priority = play.get("priority", DEFAULT_PRIORITY)
+        self.job_plan = play.get("job_plan", [])
+        self.step_parents = _resolve_step_dependencies(self.id, self.job_plan)
+
+        triggers = play.get("triggers", {})
+        raw_all = sorted(triggers.get("all", []), key=_clause_cost)
+        raw_any = sorted(triggers.get("any", []), key=_clause_cost)
+        self.kpi_names = tuple(dict.fromkeys(c["kpi"] for c in raw_all + raw_any))
+
+        all_clauses = [_compile_clause(c, kpi_definitions) for c in raw_all]
+        any_clauses = [_compile_clause(c, kpi_definitions) for c in raw_any]
+
+        # An impossible "all" clause, or an "any" list with no possible clause,
+        # means the play can never fire.
+        self.never = None in all_clauses or (bool(raw_any) and all(c is None for c in any_clauses))
+        self.all_clauses: Tuple[Clause, ...] = tuple(all_clauses) if not self.never else ()
+        self.any_clauses: Tuple[Clause, ...] = tuple(c for c in any_clauses if c is not None)
+
+    def matches(self, kpi_snapshot: Dict[str, float]) -> bool:
+        """Return True if the play should trigger for the given KPI snapshot."""
+        if self.never:
+            return False
+
+        get = kpi_snapshot.get
+        for name, divisor, compare, value in self.all_clauses:
+            actual = get(name)
+            if actual is None:
+                return False
+            if divisor is not None:
+                actual = actual / divisor
+            if not compare(actual, value):
+                return False
+
+        if not self.any_clauses:
+            return True
+
+        for name, divisor, compare, value in self.any_clauses:
+            actual = get(name)
+            if actual is None:
+                continue
+            if divisor is not None:
+                actual = actual / divisor
+            if compare(actual, value):
+                return True
+        return False
+
+    def __repr__(self) -> str:
+        return f"CompiledPlay({self.id!r})"
+
+
+def compile_plays(
+    plays_cfg: Sequence[Dict[str, Any]],
+    kpi_definitions: Dict[str, Dict[str, Any]]
+) -> List[CompiledPlay]:
+    """Compile play definitions once so they can be evaluated many times."""
+    return [p if isinstance(p, CompiledPlay) else CompiledPlay(p, kpi_definitions) for p in plays_cfg]
+
+
+def _jobs_for_play(company_id: str, play: CompiledPlay, created_at: datetime, created_iso: str) -> List[Job]:
+    """Build the jobs described by a triggered play's job_plan, wiring depends_on to job ids."""
+    jobs = [
+        Job(
+            id=new_id(),
+            type=step["type"],
+            company_id=company_id,
+            priority=step.get("priority", play.priority),
+            payload={
+                "play_id": play.id,
+                "play_name": play.name,
+                "handler": step.get("handler"),
+                "params": step.get("params", {}),
+                "step_id": step.get("id"),
+                "created_at": created_iso,
+            },
+            created_at=created_at,
+        )
+        for step in play.job_plan
+    ]
+    for job, parents in zip(jobs, play.step_parents):
+        if parents:
+            job.depends_on = [jobs[i].id for i in parents]
+            job.payload["depends_on"] = job.depends_on
+    return jobs
+
+
 def generate_jobs_from_plays(
     company_id: str,
     kpi_snapshot: Dict[str, float],
-    plays_cfg: List[Dict[str, Any]],
+    plays_cfg: Sequence[Any],
     kpi_definitions: Dict[str, Dict[str, Any]]
 ) -> List[Job]:
     """
@@ -79,33 +266,232 @@ def generate_jobs_from_plays(
     Args:
         company_id: Company identifier
         kpi_snapshot: Current KPI values
-        plays_cfg: List of play definitions from plays.yml
+        plays_cfg: Play definitions from plays.yml, or plays already
+            compiled with ``compile_plays`` (preferred for repeated calls)
         kpi_definitions: KPI definitions for trigger evaluation
     
     Returns:
         List of Jobs to execute for triggered plays
     """
     jobs: List[Job] = []
-    
+    created_at = datetime.utcnow()
+    created_iso = created_at.isoformat()
+
+    for play in compile_plays(plays_cfg, kpi_definitions):
+        if play.matches(kpi_snapshot):
+            jobs.extend(_jobs_for_play(company_id, play, created_at, created_iso))
+
+    return jobs
+
+
+def build_kpi_index(plays_cfg: Iterable[Any]) -> Dict[str, Tuple[str, ...]]:
+    """Map each KPI name to the ids of plays whose triggers reference it."""
+    index: Dict[str, List[str]] = {}
     for play in plays_cfg:
-        if not evaluate_triggers(kpi_snapshot, play, kpi_definitions):
+        raw = play.play if isinstance(play, CompiledPlay) else play
+        triggers = raw.get("triggers", {})
+        for clause in triggers.get("all", []) + triggers.get("any", []):
+            dependents = index.setdefault(clause["kpi"], [])
+            if raw["id"] not in dependents:
+                dependents.append(raw["id"])
+    return {name: tuple(play_ids) for name, play_ids in index.items()}
+
+
+class PlayCatalog(list):
+    """List of play definitions that also carries a KPI -> play ids index."""
+
+    def __init__(self, plays_cfg: Iterable[Dict[str, Any]] = ()):
+        super().__init__(plays_cfg)
+        self.kpi_index = build_kpi_index(self)
+
+    def plays_for_kpis(self, kpi_names: Iterable[str]) -> List[str]:
+        """Return ids of plays that reference any of the given KPIs."""
+        seen: Dict[str, None] = {}
+        for name in kpi_names:
+            for play_id in self.kpi_index.get(name, ()):
+                seen[play_id] = None
+        return list(seen)
+
+
+@dataclass
+class TriggerDelta:
+    """Result of re-evaluating the plays touched by a KPI change."""
+    fired: List[str] = field(default_factory=list)    # plays that newly trigger
+    cleared: List[str] = field(default_factory=list)  # plays that stopped triggering
+    state: Dict[str, bool] = field(default_factory=dict)  # new state of re-evaluated plays
+
+
+class IncrementalEvaluator:
+    """Re-evaluates only the plays that depend on changed KPIs."""
+
+    def __init__(
+        self,
+        plays_cfg: Sequence[Any],
+        kpi_definitions: Dict[str, Dict[str, Any]],
+        kpi_index: Optional[Dict[str, Tuple[str, ...]]] = None
+    ):
+        self.plays = compile_plays(plays_cfg, kpi_definitions)
+        self.by_id = {play.id: play for play in self.plays}
+        if kpi_index is None:
+            kpi_index = getattr(plays_cfg, "kpi_index", None) or build_kpi_index(self.plays)
+        self.kpi_index = kpi_index
+
+    def affected_plays(self, changed_kpis: Iterable[str]) -> List[CompiledPlay]:
+        """Return compiled plays whose triggers reference any changed KPI."""
+        seen: Dict[str, CompiledPlay] = {}
+        for name in changed_kpis:
+            for play_id in self.kpi_index.get(name, ()):
+                if play_id not in seen:
+                    seen[play_id] = self.by_id[play_id]
+        return list(seen.values())
+
+    def evaluate(self, kpi_snapshot: Dict[str, float], changed_kpis: Iterable[str]) -> Dict[str, bool]:
+        """Evaluate the plays affected by ``changed_kpis`` against a snapshot."""
+        return {play.id: play.matches(kpi_snapshot) for play in self.affected_plays(changed_kpis)}
+
+    def update(
+        self,
+        previous_state: Dict[str, bool],
+        kpi_snapshot: Dict[str, float],
+        changed_kpis: Iterable[str]
+    ) -> TriggerDelta:
+        """
+        Compute which plays changed state after a KPI delta.
+
+        Args:
+            previous_state: Play id -> whether it was triggering (missing = False)
+            kpi_snapshot: Full KPI snapshot after applying the delta
+            changed_kpis: Names of KPIs whose values changed
+
+        Returns:
+            TriggerDelta with newly fired / cleared plays; merge ``state``
+            into the caller's stored state to keep it current.
+        """
+        delta = TriggerDelta(state=self.evaluate(kpi_snapshot, changed_kpis))
+        for play_id, now in delta.state.items():
+            before = previous_state.get(play_id, False)
+            if now and not before:
+                delta.fired.append(play_id)
+            elif before and not now:
+                delta.cleared.append(play_id)
+        return delta
+
+
+def build_kpi_matrix(
+    kpi_snapshots: Sequence[Dict[str, float]],
+    kpi_names: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Pack KPI snapshots into a companies x KPIs float matrix.
+
+    Args:
+        kpi_snapshots: One KPI snapshot (name -> value) per company
+        kpi_names: Column order; defaults to every name seen in the snapshots
+
+    Returns:
+        (matrix, kpi_names) where missing values are NaN
+    """
+    if kpi_names is None:
+        kpi_names = sorted({name for snapshot in kpi_snapshots for name in snapshot})
+    kpi_names = list(kpi_names)
+
+    matrix = np.full((len(kpi_snapshots), len(kpi_names)), np.nan, dtype=np.float64)
+    for col, name in enumerate(kpi_names):
+        column = matrix[:, col]
+        for row, snapshot in enumerate(kpi_snapshots):
+            value = snapshot.get(name)
+            if value is not None:
+                column[row] = value
+    return matrix, kpi_names
+
+
+def evaluate_triggers_batch(
+    kpi_matrix: np.ndarray,
+    kpi_names: Sequence[str],
+    plays_cfg: Sequence[Any],
+    kpi_definitions: Dict[str, Dict[str, Any]]
+) -> np.ndarray:
+    """
+    Evaluate every play against every company with array operations.
+
+    Args:
+        kpi_matrix: companies x KPIs values, NaN for missing KPIs
+        kpi_names: KPI name for each matrix column
+        plays_cfg: Play definitions or compiled plays
+        kpi_definitions: KPI definitions for ratio_to_target clauses
+
+    Returns:
+        Boolean companies x plays matrix, identical to calling
+        ``evaluate_triggers`` for each (snapshot, play) pair.
+    """
+    plays = compile_plays(plays_cfg, kpi_definitions)
+    rows = kpi_matrix.shape[0]
+    columns = {name: i for i, name in enumerate(kpi_names)}
+    present = ~np.isnan(kpi_matrix)
+    never = np.zeros(rows, dtype=bool)
+    clause_cache: Dict[Clause, np.ndarray] = {}
+
+    def clause_mask(clause: Clause) -> np.ndarray:
+        mask = clause_cache.get(clause)
+        if mask is not None:
+            return mask
+        name, divisor, compare, value = clause
+        col = columns.get(name)
+        if col is None:
+            mask = never
+        else:
+            actual = kpi_matrix[:, col]
+            if divisor is not None:
+                actual = actual / divisor
+            # NaN compares True under "!=", so mask out missing KPIs explicitly
+            with np.errstate(invalid="ignore"):
+                mask = compare(actual, value) & present[:, col]
+        clause_cache[clause] = mask
+        return mask
+
+    result = np.zeros((rows, len(plays)), dtype=bool)
+    for j, play in enumerate(plays):
+        if play.never:
             continue
-        
-        # Generate jobs from the play's job_plan
-        for step in play.get("job_plan", []):
-            job = Job(
-                id=str(uuid.uuid4()),
-                type=step["type"],
-                company_id=company_id,
-                payload={
-                    "play_id": play["id"],
-                    "play_name": play.get("name", ""),
-                    "handler": step.get("handler"),
-                    "params": step.get("params", {}),
-                    "created_at": datetime.utcnow().isoformat(),
-                },
-            )
-            jobs.append(job)
-    
-    return jobs
+        fired = np.ones(rows, dtype=bool)
+        for clause in play.all_clauses:
+            fired &= clause_mask(clause)
+        if play.any_clauses:
+            any_fired = np.zeros(rows, dtype=bool)
+            for clause in play.any_clauses:
+                any_fired |= clause_mask(clause)
+            fired &= any_fired
+        result[:, j] = fired
+    return result
+
+
+def generate_jobs_for_companies(
+    kpi_snapshots: Dict[str, Dict[str, float]],
+    plays_cfg: Sequence[Any],
+    kpi_definitions: Dict[str, Dict[str, Any]]
+) -> Dict[str, List[Job]]:
+    """
+    Bulk variant of ``generate_jobs_from_plays`` for many companies.
+
+    Args:
+        kpi_snapshots: Company id -> KPI snapshot
+        plays_cfg: Play definitions or compiled plays
+        kpi_definitions: KPI definitions for trigger evaluation
+
+    Returns:
+        Company id -> jobs for that company's triggered plays
+    """
+    plays = compile_plays(plays_cfg, kpi_definitions)
+    company_ids = list(kpi_snapshots)
+    kpi_names = sorted({c[0] for p in plays for c in p.all_clauses + p.any_clauses})
+    matrix, _ = build_kpi_matrix([kpi_snapshots[c] for c in company_ids], kpi_names)
+    fired = evaluate_triggers_batch(matrix, kpi_names, plays, kpi_definitions)
 
+    # One timestamp for the whole batch rather than one per job
+    created_at = datetime.utcnow()
+    created_iso = created_at.isoformat()
+    jobs: Dict[str, List[Job]] = {company_id: [] for company_id in company_ids}
+    for row, col in zip(*np.nonzero(fired)):
+        company_id = company_ids[row]
+        jobs[company_id].extend(_jobs_for_play(company_id, plays[col], created_at, created_iso))
+    return jobs
@@ -0,0 +1,568 @@
+"""Evidence archive - cold evidence moved out of the database into compressed Parquet files."""
+
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from datetime import datetime, timezone
+from pathlib import Path
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from database.bulk import IN_CLAUSE_CHUNK
+from database.models import EvidenceRecord
+import json
+import logging
+import os
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+# Root of the archive: <dir>/company_id=<id>/month=<YYYY-MM>/part-<hex>.parquet, with a
+# manifest.json per month directory
+ARCHIVE_DIR = Path(
+    os.getenv("EVIDENCE_ARCHIVE_DIR", str(BASE_DIR / "archive" / "evidence"))
+)
+
+# Evidence older than this many days is moved by services/evidence_archiver.py
+ARCHIVE_AFTER_DAYS = int(os.getenv("EVIDENCE_ARCHIVE_AFTER_DAYS", "90"))
+
+# Rows moved per transaction (and at most one file per month touched)
+ARCHIVE_BATCH_SIZE = int(os.getenv("EVIDENCE_ARCHIVE_BATCH_SIZE", "50000"))
+
+# Parquet codec and row-group size; row-group min/max statistics are what
+# let time and event_type predicates skip data without reading it
+ARCHIVE_COMPRESSION = os.getenv("EVIDENCE_ARCHIVE_COMPRESSION", "zstd")
+ARCHIVE_ROW_GROUP_SIZE = int(os.getenv("EVIDENCE_ARCHIVE_ROW_GROUP_SIZE", "10000"))
+
+MANIFEST_NAME = "manifest.json"
+
+# Manifests are per partition so writes rewrite one month's list and reads
+# load only the requested company's months
+_COMPANY_PREFIX, _MONTH_PREFIX = "company_id=", "month="
+
+_COLUMNS = ("id", "company_id", "job_id", "event_type", "occurred_at", "payload")
+
+
+def _pyarrow():
+    """pyarrow is optional; only archiving or reading archived rows needs it."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError(
+            "The evidence archive requires pyarrow (pip install pyarrow)"
+        ) from e
+    return pyarrow, pyarrow.parquet
+
+
+def naive_utc(ts: datetime) -> datetime:
+    """Archived times are naive UTC, as SQLite returns them."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+class EvidenceArchive:
+    """
+    Parquet files of archived evidence, partitioned by company and month.
+
+    Each ``company_id=<id>/month=<YYYY-MM>`` directory has a ``manifest.json``
+    listing its files with row count, time range and event types, so a
+    query loads only that company's manifests (skipping months outside its
+    time range) and opens only files that can match.
+    Inside a file, rows are sorted by ``occurred_at`` and payloads are JSON
+    text, so time and ``event_type`` filters are pushed down to row groups
+    and repeated payloads collapse under dictionary encoding and zstd.
+
+    Files are written and listed as ``pending`` before their rows are
+    deleted from the database, then marked ``committed``; readers only see
+    committed files and ``recover`` settles any left pending by a crash.
+    """
+
+    def __init__(self, root: Path = ARCHIVE_DIR):
+        self.root = Path(root)
+        self._manifests: Dict[Path, Tuple[Tuple[int, int], List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def legacy_manifest_path(self) -> Path:
+        """The single root manifest of archives written before manifests were partitioned."""
+        return self.root / MANIFEST_NAME
+
+    def _manifest_path(self, relative: str) -> Path:
+        """The manifest of the month directory holding a file."""
+        return (self.root / relative).parent / MANIFEST_NAME
+
+    def _load(self, path: Path) -> List[Dict[str, Any]]:
+        """A manifest's entries, reloaded when another process (the archiver) rewrites it."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return []
+        # Every save is a rename onto a new inode, so this changes on each rewrite
+        version = (stat.st_ino, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._manifests.get(path)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+        files = json.loads(path.read_text())["files"]
+        with self._lock:
+            self._manifests[path] = (version, files)
+        return files
+
+    def _save(self, path: Path, files: List[Dict[str, Any]]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "files": files}, indent=1))
+        os.replace(tmp, path)  # readers never see a partial manifest
+        stat = path.stat()
+        with self._lock:
+            self._manifests[path] = ((stat.st_ino, stat.st_mtime_ns), files)
+
+    def _month_manifests(self, company_id: str) -> List[Tuple[str, Path]]:
+        """(month, manifest path) for each of a company's month directories."""
+        company_dir = self.root / f"{_COMPANY_PREFIX}{company_id}"
+        return sorted(
+            (path.parent.name[len(_MONTH_PREFIX) :], path)
+            for path in company_dir.glob(f"{_MONTH_PREFIX}*/{MANIFEST_NAME}")
+        )
+
+    def entries(self) -> Iterator[Dict[str, Any]]:
+        """Every manifest entry, pending ones included."""
+        yield from self._load(self.legacy_manifest_path)
+        for path in self.root.glob(
+            f"{_COMPANY_PREFIX}*/{_MONTH_PREFIX}*/{MANIFEST_NAME}"
+        ):
+            yield from self._load(path)
+
+    def upgrade_manifest(self) -> int:
+        """
+        Split a legacy root ``manifest.json`` into per-month manifests and
+        remove it. Returns the entries moved.
+        """
+        legacy = self._load(self.legacy_manifest_path)
+        if not legacy and not self.legacy_manifest_path.exists():
+            return 0
+        partitions: Dict[Path, List[Dict[str, Any]]] = {}
+        for entry in legacy:
+            partitions.setdefault(self._manifest_path(entry["path"]), []).append(entry)
+        for path, moved in partitions.items():
+            files = self._load(path)
+            known = {entry["path"] for entry in files}
+            self._save(
+                path, files + [entry for entry in moved if entry["path"] not in known]
+            )
+        self.legacy_manifest_path.unlink()
+        with self._lock:
+            self._manifests.pop(self.legacy_manifest_path, None)
+        logger.info(
+            f"Split the archive manifest into {len(partitions)} month manifests ({len(legacy)} files)"
+        )
+        return len(legacy)
+
+    def files(
+        self,
+        company_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        event_type: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Committed manifest entries that may hold rows matching the filters, oldest month first."""
+        since = naive_utc(since) if since is not None else None
+        until = naive_utc(until) if until is not None else None
+        candidates = [
+            entry
+            for entry in self._load(self.legacy_manifest_path)
+            if entry["company_id"] == company_id
+        ]
+        for month, path in self._month_manifests(company_id):
+            if since is not None and month < _month(since):
+                continue
+            if until is not None and month > _month(until):
+                continue
+            candidates.extend(self._load(path))
+
+        matches, seen = [], set()
+        for entry in candidates:
+            # A legacy entry may also be in its month manifest if an upgrade was interrupted
+            if entry["state"] != "committed" or entry["path"] in seen:
+                continue
+            seen.add(entry["path"])
+            if (
+                since is not None
+                and datetime.fromisoformat(entry["max_occurred_at"]) < since
+            ):
+                continue
+            if (
+                until is not None
+                and datetime.fromisoformat(entry["min_occurred_at"]) >= until
+            ):
+                continue
+            if event_type is not None and event_type not in entry["event_types"]:
+                continue
+            matches.append(entry)
+        return sorted(
+            matches, key=lambda entry: (entry["month"], entry["min_occurred_at"])
+        )
+
+    def _read_month(
+        self,
+        entries: Sequence[Dict[str, Any]],
+        company_id: str,
+        since: Optional[datetime],
+        until: Optional[datetime],
+        event_type: Optional[str],
+        through: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rows of one month's files matching the filters, sorted by (occurred_at, id)."""
+        pa, pq = _pyarrow()
+        filters = [("company_id", "=", company_id)]
+        if since is not None:
+            filters.append(("occurred_at", ">=", since))
+        if until is not None:
+            filters.append(("occurred_at", "<", until))
+        if through is not None:
+            filters.append(("occurred_at", "<=", through))
+        if event_type is not None:
+            filters.append(("event_type", "=", event_type))
+        # The directory names are for humans; company_id is a real column
+        table = pq.read_table(
+            [str(self.root / entry["path"]) for entry in entries],
+            filters=filters,
+            partitioning=None,
+        )
+        rows = table.to_pylist()
+        for row in rows:
+            row["payload"] = json.loads(row["payload"]) if row["payload"] else {}
+        rows.sort(key=lambda row: (row["occurred_at"], row["id"]))
+        return rows
+
+    def get(self, evidence_id: str) -> Optional[Dict[str, Any]]:
+        """
+        The archived row with an id, or None. An id says nothing about its
+        company or time, so every committed file is searched (row-group id
+        statistics still skip most data); look in the database first.
+        """
+        paths = sorted(
+            {entry["path"] for entry in self.entries() if entry["state"] == "committed"}
+        )
+        if not paths:
+            return None
+        _, pq = _pyarrow()
+        table = pq.read_table(
+            [str(self.root / path) for path in paths],
+            filters=[("id", "=", evidence_id)],
+            partitioning=None,
+        )
+        rows = table.to_pylist()
+        if not rows:
+            return None
+        row = rows[0]
+        row["payload"] = json.loads(row["payload"]) if row["payload"] else {}
+        return row
+
+    def count(
+        self,
+        company_id: str,
+        since: Optional[datetime] = None,
+        job_ids: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Archived rows of a company since a time, optionally only those of the given jobs."""
+        since = naive_utc(since) if since is not None else None
+        entries = self.files(company_id, since)
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            if not job_ids:
+                return 0
+        if not entries:
+            return 0
+        _, pq = _pyarrow()
+        filters = [("company_id", "=", company_id)]
+        if since is not None:
+            filters.append(("occurred_at", ">=", since))
+        if job_ids is not None:
+            filters.append(("job_id", "in", job_ids))
+        table = pq.read_table(
+            [str(self.root / entry["path"]) for entry in entries],
+            columns=["id"],
+            filters=filters,
+            partitioning=None,
+        )
+        return table.num_rows
+
+    def _by_month(self, entries: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        months: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            months.setdefault(entry["month"], []).append(entry)
+        return [months[month] for month in sorted(months)]
+
+    def iter_rows(
+        self,
+        company_id: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        event_type: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Archived rows matching the filters, oldest first, one month in memory at a time."""
+        since = naive_utc(since) if since is not None else None
+        until = naive_utc(until) if until is not None else None
+        for month in self._by_month(self.files(company_id, since, until, event_type)):
+            yield from self._read_month(month, company_id, since, until, event_type)
+
+    def page(
+        self,
+        company_id: str,
+        since: Optional[datetime],
+        event_type: Optional[str],
+        before: Optional[Tuple[datetime, str]],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Up to ``limit`` archived rows, newest first, strictly before the
+        ``(occurred_at, id)`` keyset position ``before``. Months are read
+        newest first and reading stops once the page is full.
+        """
+        since = naive_utc(since) if since is not None else None
+        if before is not None:
+            before = (naive_utc(before[0]), before[1])
+        # Pushdown on time; ties with the cursor's timestamp are settled by id below
+        through = before[0] if before is not None else None
+        rows: List[Dict[str, Any]] = []
+        for month in reversed(
+            self._by_month(self.files(company_id, since, None, event_type))
+        ):
+            if (
+                through is not None
+                and min(datetime.fromisoformat(e["min_occurred_at"]) for e in month)
+                > through
+            ):
+                continue
+            month_rows = self._read_month(
+                month, company_id, since, None, event_type, through
+            )
+            for row in reversed(month_rows):
+                if before is not None and (row["occurred_at"], row["id"]) >= before:
+                    continue
+                rows.append(row)
+                if len(rows) >= limit:
+                    return rows
+        return rows
+
+    def write(
+        self, company_id: str, month: str, rows: Sequence[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Write one Parquet file of a company's rows for a month and list it as pending."""
+        pa, pq = _pyarrow()
+        schema = pa.schema(
+            [
+                ("id", pa.string()),
+                ("company_id", pa.string()),
+                ("job_id", pa.string()),
+                ("event_type", pa.string()),
+                ("occurred_at", pa.timestamp("us")),
+                ("payload", pa.string()),
+            ]
+        )
+        rows = sorted(rows, key=lambda row: (row["occurred_at"], row["id"]))
+        payloads = [
+            json.dumps(row["payload"], sort_keys=True, default=str) for row in rows
+        ]
+        table = pa.table(
+            {
+                "id": [row["id"] for row in rows],
+                "company_id": [company_id] * len(rows),
+                "job_id": [row["job_id"] for row in rows],
+                "event_type": [row["event_type"] for row in rows],
+                "occurred_at": [row["occurred_at"] for row in rows],
+                "payload": payloads,
+            },
+            schema=schema,
+        )
+
+        relative = (
+            Path(f"company_id={company_id}")
+            / f"month={month}"
+            / f"part-{uuid.uuid4().hex}.parquet"
+        )
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pq.write_table(
+            table,
+            path,
+            compression=ARCHIVE_COMPRESSION,
+            row_group_size=ARCHIVE_ROW_GROUP_SIZE,
+            use_dictionary=True,
+            write_statistics=True,
+        )
+
+        entry = {
+            "path": relative.as_posix(),
+            "company_id": company_id,
+            "month": month,
+            "rows": len(rows),
+            "min_occurred_at": rows[0]["occurred_at"].isoformat(),
+            "max_occurred_at": rows[-1]["occurred_at"].isoformat(),
+            "event_types": sorted({row["event_type"] for row in rows}),
+            "payload_bytes": sum(len(p) for p in payloads),
+            "bytes": path.stat().st_size,
+            "state": "pending",
+            "created_at": datetime.utcnow().isoformat(),
+        }
+        manifest_path = self._manifest_path(entry["path"])
+        self._save(manifest_path, self._load(manifest_path) + [entry])
+        return entry
+
+    def _settle(self, entries: Iterable[Dict[str, Any]], committed: bool):
+        partitions: Dict[Path, set] = {}
+        for entry in entries:
+            partitions.setdefault(self._manifest_path(entry["path"]), set()).add(
+                entry["path"]
+            )
+        for manifest_path, paths in partitions.items():
+            files = []
+            for entry in self._load(manifest_path):
+                if entry["path"] not in paths:
+                    files.append(entry)
+                elif committed:
+                    files.append({**entry, "state": "committed"})
+                else:
+                    (self.root / entry["path"]).unlink(missing_ok=True)
+            self._save(manifest_path, files)
+
+    def commit(self, entries: Iterable[Dict[str, Any]]):
+        """Make pending files visible once their rows are deleted from the database."""
+        self._settle(entries, committed=True)
+
+    def discard(self, entries: Iterable[Dict[str, Any]]):
+        """Remove pending files whose database delete rolled back."""
+        self._settle(entries, committed=False)
+
+    def recover(self, db: Session) -> int:
+        """
+        Settle files left pending by an interrupted run: commit those whose
+        rows are gone from the database, discard those whose rows are still
+        there (the delete never committed). A legacy root manifest is split
+        first. Returns the files settled.
+        """
+        self.upgrade_manifest()
+        pending = [entry for entry in self.entries() if entry["state"] == "pending"]
+        if not pending:
+            return 0
+        _, pq = _pyarrow()
+        done, undone = [], []
+        for entry in pending:
+            path = self.root / entry["path"]
+            if not path.exists():
+                undone.append(entry)
+                continue
+            # The delete is one transaction, so one chunk of ids tells which way it went
+            ids = (
+                pq.read_table(path, columns=["id"])
+                .column("id")
+                .to_pylist()[:IN_CLAUSE_CHUNK]
+            )
+            still_hot = db.scalar(
+                select(EvidenceRecord.id).where(EvidenceRecord.id.in_(ids)).limit(1)
+            )
+            (undone if still_hot else done).append(entry)
+        if done:
+            self.commit(done)
+        if undone:
+            self.discard(undone)
+        logger.warning(
+            f"Recovered archive files: {len(done)} committed, {len(undone)} discarded"
+        )
+        return len(pending)
+
+
+def _month(ts: datetime) -> str:
+    return ts.strftime("%Y-%m")
+
+
+def archive_evidence(
+    db: Session,
+    before: datetime,
+    archive: Optional[EvidenceArchive] = None,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    company_ids: Optional[Iterable[str]] = None,
+) -> Dict[str, int]:
+    """
+    Move evidence that occurred before ``before`` into the archive.
+
+    Each company is drained ``batch_size`` rows at a time, oldest first:
+    the rows are written as one file per month, then deleted in one
+    transaction, then their files are committed to the manifest. Commits.
+    Returns rows, files, companies and payload vs. file bytes moved.
+    """
+    archive = archive or evidence_archive
+    archive.recover(db)
+    before = naive_utc(before)
+    table = EvidenceRecord.__table__
+
+    if company_ids is None:
+        company_ids = db.scalars(
+            select(table.c.company_id).where(table.c.occurred_at < before).distinct()
+        ).all()
+
+    totals = {
+        "rows": 0,
+        "files": 0,
+        "companies": 0,
+        "payload_bytes": 0,
+        "archive_bytes": 0,
+    }
+    for company_id in company_ids:
+        moved = 0
+        while True:
+            rows = [
+                dict(row)
+                for row in db.execute(
+                    select(*(table.c[name] for name in _COLUMNS))
+                    .where(
+                        table.c.company_id == company_id, table.c.occurred_at < before
+                    )
+                    .order_by(table.c.occurred_at, table.c.id)
+                    .limit(batch_size)
+                ).mappings()
+            ]
+            if not rows:
+                break
+            for row in rows:
+                row["occurred_at"] = naive_utc(row["occurred_at"])
+
+            months: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                months.setdefault(_month(row["occurred_at"]), []).append(row)
+            entries = [
+                archive.write(company_id, month, month_rows)
+                for month, month_rows in months.items()
+            ]
+
+            try:
+                ids = [row["id"] for row in rows]
+                for i in range(0, len(ids), IN_CLAUSE_CHUNK):
+                    db.execute(
+                        delete(table).where(
+                            table.c.id.in_(ids[i : i + IN_CLAUSE_CHUNK])
+                        )
+                    )
+                db.commit()
+            except Exception:
+                db.rollback()
+                archive.discard(entries)
+                raise
+            archive.commit(entries)
+
+            moved += len(rows)
+            totals["files"] += len(entries)
+            totals["payload_bytes"] += sum(entry["payload_bytes"] for entry in entries)
+            totals["archive_bytes"] += sum(entry["bytes"] for entry in entries)
+            if len(rows) < batch_size:
+                break
+        if moved:
+            totals["rows"] += moved
+            totals["companies"] += 1
+    return totals
+
+
+evidence_archive = EvidenceArchive()
@@ -0,0 +1,247 @@
+"""Bulk persistence for jobs and evidence - executemany inserts, COPY on Postgres."""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+from datetime import datetime
+from sqlalchemy import Table, insert, select, update
+from sqlalchemy.orm import Session
+from database.models import Cycle, CycleStatus, Job, JobStatus, EvidenceRecord, KPI
+from core.models import Job as CoreJob, EvidenceRecord as CoreEvidenceRecord
+import csv
+import enum
+import io
+import json
+import uuid
+
+# Ids per UPDATE ... WHERE id IN (...), kept under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK = 500
+
+_NULL = "\\N"
+
+
+def job_row(job: CoreJob, cycle_id: Optional[str] = None) -> Dict[str, Any]:
+    """Column values for a jobs row."""
+    return {
+        "id": job.id,
+        "company_id": job.company_id,
+        "type": job.type,
+        "payload": job.payload,
+        "status": JobStatus(job.status),
+        "priority": job.priority,
+        "attempts": 0,
+        "cycle_id": cycle_id,
+        "created_at": job.created_at,
+        "updated_at": job.updated_at,
+    }
+
+
+def evidence_row(record: CoreEvidenceRecord) -> Dict[str, Any]:
+    """Column values for an evidence_records row."""
+    return {
+        "id": record.id,
+        "company_id": record.company_id,
+        "job_id": record.job_id,
+        "event_type": record.event_type,
+        "payload": record.payload,
+        "occurred_at": record.occurred_at or datetime.utcnow(),
+    }
+
+
+def to_core_evidence(row: EvidenceRecord) -> CoreEvidenceRecord:
+    """Convert an evidence_records row into a core evidence record."""
+    return CoreEvidenceRecord(
+        id=row.id,
+        company_id=row.company_id,
+        job_id=row.job_id,
+        event_type=row.event_type,
+        occurred_at=row.occurred_at,
+        payload=row.payload or {},
+    )
+
+
+def cycle_row(
+    company_id: str,
+    kpi_snapshot: Dict[str, float],
+    jobs: Sequence[CoreJob],
+    finished: bool = False,
+    created_at: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """
+    Column values for a new cycles row. A ``finished`` cycle is stored
+    completed (failed if any job failed) and timed from ``created_at``;
+    otherwise it is queued for workers.
+    """
+    now = datetime.utcnow()
+    if not finished and jobs:
+        status = CycleStatus.QUEUED
+    elif any(job.status == "failed" for job in jobs):
+        status = CycleStatus.FAILED
+    else:
+        status = CycleStatus.COMPLETED
+    return {
+        "id": str(uuid.uuid4()),
+        "company_id": company_id,
+        "status": status,
+        "kpi_snapshot": kpi_snapshot,
+        "plays_triggered": sorted(
+            {job.payload.get("play_name", "unknown") for job in jobs if job.payload}
+        ),
+        "jobs_created": len(jobs),
+        "created_at": created_at or now,
+        "finished_at": None if status == CycleStatus.QUEUED else now,
+    }
+
+
+def _use_copy(db: Session) -> bool:
+    bind = db.get_bind()
+    return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+
+def _copy_value(value: Any) -> Any:
+    if value is None:
+        return _NULL
+    if isinstance(value, enum.Enum):
+        return value.name  # Enum columns store member names
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _copy_rows(db: Session, table: Table, rows: Sequence[Dict[str, Any]]):
+    """Stream rows into ``table`` with COPY on the session's connection."""
+    columns = list(rows[0])
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for row in rows:
+        writer.writerow([_copy_value(row[c]) for c in columns])
+    buf.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')",
+            buf,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_rows(db: Session, table: Table, rows: List[Dict[str, Any]]) -> int:
+    if not rows:
+        return 0
+    if _use_copy(db):
+        _copy_rows(db, table, rows)
+    else:
+        # A list of parameter sets runs as a single executemany / multi-row VALUES
+        db.execute(insert(table), rows)
+    return len(rows)
+
+
+def bulk_insert_cycles(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Insert ``cycle_row`` rows in one statement. Caller commits."""
+    return _insert_rows(db, Cycle.__table__, rows)
+
+
+def bulk_insert_jobs(
+    db: Session, jobs: Iterable[CoreJob], cycle_ids: Optional[Mapping[str, str]] = None
+) -> int:
+    """Insert core jobs in one statement, tagged with ``cycle_ids[company_id]`` if given. Caller commits."""
+    cycle_ids = cycle_ids or {}
+    return _insert_rows(
+        db, Job.__table__, [job_row(job, cycle_ids.get(job.company_id)) for job in jobs]
+    )
+
+
+def bulk_insert_evidence(db: Session, records: Iterable[CoreEvidenceRecord]) -> int:
+    """Insert core evidence records in one statement. Caller commits."""
+    return _insert_rows(
+        db, EvidenceRecord.__table__, [evidence_row(r) for r in records]
+    )
+
+
+def insert_missing_evidence(db: Session, records: Sequence[CoreEvidenceRecord]) -> int:
+    """Insert the records whose ids are not stored yet, e.g. when replaying a log. Caller commits."""
+    ids = [r.id for r in records]
+    existing = set()
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+        existing.update(
+            db.scalars(
+                select(EvidenceRecord.id).where(
+                    EvidenceRecord.id.in_(ids[start : start + IN_CLAUSE_CHUNK])
+                )
+            )
+        )
+    return bulk_insert_evidence(db, (r for r in records if r.id not in existing))
+
+
+def bulk_insert_kpis(db: Session, rows: List[Dict[str, Any]]) -> int:
+    """Insert raw ``kpis`` rows (column dicts with ids set) in one statement. Caller commits."""
+    return _insert_rows(db, KPI.__table__, rows)
+
+
+def bulk_update_job_status(
+    db: Session,
+    statuses: Dict[str, str],
+    leased_by: Optional[str] = None,
+    **values: Any,
+) -> int:
+    """
+    Set job statuses with one UPDATE per distinct status (and id chunk).
+
+    With ``leased_by``, only rows still leased to that owner change. Extra
+    keyword arguments are written as additional column values. Caller commits.
+    Returns the number of rows updated.
+    """
+    now = datetime.utcnow()
+    by_status: Dict[str, List[str]] = {}
+    for job_id, status in statuses.items():
+        by_status.setdefault(status, []).append(job_id)
+
+    updated = 0
+    for status, ids in by_status.items():
+        for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+            stmt = update(Job).where(Job.id.in_(ids[start : start + IN_CLAUSE_CHUNK]))
+            if leased_by is not None:
+                stmt = stmt.where(Job.lease_owner == leased_by)
+            result = db.execute(
+                stmt.values(status=JobStatus(status), updated_at=now, **values),
+                execution_options={"synchronize_session": False},
+            )
+            updated += result.rowcount
+    return updated
+
+
+def persist_cycle(
+    db: Session,
+    jobs: Iterable[CoreJob],
+    evidence: Iterable[CoreEvidenceRecord],
+    cycles: Sequence[Dict[str, Any]] = (),
+):
+    """
+    Write a finished cycle's jobs (with final statuses) and evidence in one
+    transaction, along with ``cycle_row`` rows; jobs are linked to the
+    cycle row for their company.
+    """
+    try:
+        bulk_insert_cycles(db, list(cycles))
+        bulk_insert_jobs(db, jobs, {row["company_id"]: row["id"] for row in cycles})
+        bulk_insert_evidence(db, evidence)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+class BulkEvidenceSink:
+    """Orchestrator evidence sink that bulk-inserts each cycle into a session.
+
+    The session is not committed, so evidence lands in the caller's
+    transaction alongside its job status updates.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.count = 0
+
+    def __call__(self, records: List[CoreEvidenceRecord]):
+        self.count += bulk_insert_evidence(self.db, records)
@@ -1,6 +1,9 @@
 """Database connection and session management."""
 
-from sqlalchemy import create_engine
+from typing import Any, Dict
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from pathlib import Path
@@ -12,20 +15,122 @@ DATABASE_URL = os.getenv(
     f"sqlite:///{Path(__file__).resolve().parents[1] / 'profit_os_chimera.db'}"
 )
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {},
-    echo=False  # Set to True for SQL debugging
-)
+# SQLite pragmas applied to every new connection. WAL lets readers run
+# alongside a writer; NORMAL only fsyncs at checkpoints, which is durable
+# against application crashes (not power loss) in WAL mode.
+SQLITE_JOURNAL_MODE = os.getenv("DB_SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("DB_SQLITE_SYNCHRONOUS", "NORMAL")
+# Milliseconds a writer waits for the lock before "database is locked"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("DB_SQLITE_BUSY_TIMEOUT_MS", "15000"))
+# Bytes of the database file memory-mapped for reads (0 disables)
+SQLITE_MMAP_SIZE = int(os.getenv("DB_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+# Page cache per connection; negative values are KiB
+SQLITE_CACHE_SIZE = int(os.getenv("DB_SQLITE_CACHE_SIZE", "-65536"))
+
+# Connection pool (file-backed SQLite and server databases)
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+POOL_MAX_OVERFLOW = int(os.getenv("DB_POOL_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+# Server databases only: seconds before a connection is replaced, and a
+# liveness check on checkout so dropped connections are never handed out
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes", "on")
+
+# Compiled SQL cached per engine; also the driver's per-connection prepared
+# statement cache (sqlite3 cached_statements, asyncpg prepared_statement_cache_size)
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+
+
+def _backend(url: str) -> str:
+    return url.partition("://")[0].split("+")[0]
+
+
+def _sqlite_in_memory(url: str) -> bool:
+    path = url.partition("://")[2].lstrip("/")
+    return path in ("", ":memory:") or "mode=memory" in url
+
+
+def engine_options(url: str) -> Dict[str, Any]:
+    """``create_engine`` keyword arguments for ``url`` from the DB_* settings."""
+    options: Dict[str, Any] = {
+        "echo": False,  # Set to True for SQL debugging
+        "query_cache_size": STATEMENT_CACHE_SIZE,
+    }
+    if _backend(url) == "sqlite":
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000,
+            "cached_statements": STATEMENT_CACHE_SIZE,
+        }
+        if not _sqlite_in_memory(url):
+            # In-memory databases keep SQLAlchemy's single-connection pools
+            options.update(pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW, pool_timeout=POOL_TIMEOUT)
+        return options
+
+    options.update(
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=POOL_RECYCLE,
+        pool_pre_ping=POOL_PRE_PING,
+    )
+    if "+asyncpg" in url.partition("://")[0]:
+        options["connect_args"] = {"prepared_statement_cache_size": STATEMENT_CACHE_SIZE}
+    return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        cursor.execute(f"PRAGMA cache_size={SQLITE_CACHE_SIZE}")
+    finally:
+        cursor.close()
+
+
+def configure_engine(engine: Engine) -> Engine:
+    """Apply the SQLite pragma profile to each new connection of a (sync) engine."""
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _set_sqlite_pragmas)
+    return engine
+
+
+engine = configure_engine(create_engine(DATABASE_URL, **engine_options(DATABASE_URL)))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """The same database through its asyncio driver (aiosqlite or asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+# Async engine for API routes, so queries await instead of blocking the event loop
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(DATABASE_URL))
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+configure_engine(async_engine.sync_engine)
+
+# expire_on_commit=False: attributes stay readable after commit without an implicit (sync) reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 def init_db():
-    """Initialize database tables."""
-    from database.models import Company, KPI, Job, EvidenceRecord
+    """Initialize database tables and add columns or indexes that older tables lack."""
+    from database.models import Company, KPI, KPILatest, KPIRollup, Cycle, Job, EvidenceRecord  # noqa: F401
+    from database.migrations import upgrade_schema
     Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
 
 
 def get_db():
@@ -37,4 +142,7 @@ def get_db():
         db.close()
 
 
-
+async def get_async_db():
+    """Dependency for getting an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,117 @@
+"""Growth cycle tracking - progress of a cycle's jobs and completion as workers finish them."""
+
+from typing import Any, Dict, Iterable, Optional
+from datetime import datetime
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from database.archive import EvidenceArchive, evidence_archive
+from database.bulk import IN_CLAUSE_CHUNK
+from database.models import Cycle, CycleStatus, EvidenceRecord, Job, JobStatus
+
+_PENDING = (JobStatus.QUEUED, JobStatus.RUNNING)
+_TERMINAL = (CycleStatus.COMPLETED, CycleStatus.FAILED)
+
+
+def cycle_progress(
+    db: Session,
+    cycle: Cycle,
+    now: Optional[datetime] = None,
+    archive: Optional[EvidenceArchive] = None,
+) -> Dict[str, Any]:
+    """
+    Job counts per status, evidence count (archived records included),
+    elapsed time and the live status of a cycle. A queued cycle whose jobs
+    have started reports "running"; one with no pending jobs left reports
+    its final status even before a worker has recorded it.
+    """
+    counts = {status.value: 0 for status in JobStatus}
+    for status, count in (
+        db.query(Job.status, func.count(Job.id))
+        .filter(Job.cycle_id == cycle.id)
+        .group_by(Job.status)
+    ):
+        counts[status.value] = count
+    evidence_count = (
+        db.query(func.count(EvidenceRecord.id))
+        .join(Job, EvidenceRecord.job_id == Job.id)
+        .filter(Job.cycle_id == cycle.id)
+        .scalar()
+    )
+    archive = archive or evidence_archive
+    # Evidence occurs after its cycle is created, so older archive months are never read
+    if archive.files(cycle.company_id, cycle.created_at):
+        job_ids = db.scalars(select(Job.id).where(Job.cycle_id == cycle.id)).all()
+        evidence_count += archive.count(cycle.company_id, cycle.created_at, job_ids)
+
+    status = cycle.status
+    if status not in _TERMINAL:
+        if counts["queued"] + counts["running"] == 0:
+            status = CycleStatus.FAILED if counts["failed"] else CycleStatus.COMPLETED
+        elif counts["queued"] < cycle.jobs_created:
+            status = CycleStatus.RUNNING
+
+    end = cycle.finished_at or now or datetime.utcnow()
+    elapsed = (
+        end.replace(tzinfo=None) - cycle.created_at.replace(tzinfo=None)
+    ).total_seconds()
+    return {
+        "cycle_id": cycle.id,
+        "company_id": cycle.company_id,
+        "status": status.value,
+        "jobs_created": cycle.jobs_created,
+        "jobs": counts,
+        "evidence_count": evidence_count,
+        "plays_triggered": cycle.plays_triggered or [],
+        "created_at": cycle.created_at,
+        "finished_at": cycle.finished_at,
+        "elapsed_seconds": max(elapsed, 0.0),
+    }
+
+
+def update_cycles(
+    db: Session, cycle_ids: Iterable[Optional[str]], now: Optional[datetime] = None
+) -> int:
+    """
+    Record status for cycles whose jobs a worker just touched: running once
+    any job has left the queue, completed or failed once none are pending.
+    Caller commits. Returns the number of cycles finished.
+    """
+    now = now or datetime.utcnow()
+    ids = [cycle_id for cycle_id in set(cycle_ids) if cycle_id]
+    finished = 0
+    for start in range(0, len(ids), IN_CLAUSE_CHUNK):
+        chunk = ids[start : start + IN_CLAUSE_CHUNK]
+        pending = dict(
+            db.query(Job.cycle_id, func.count(Job.id))
+            .filter(Job.cycle_id.in_(chunk), Job.status.in_(_PENDING))
+            .group_by(Job.cycle_id)
+        )
+        failed = {
+            cycle_id
+            for (cycle_id,) in db.query(Job.cycle_id)
+            .filter(Job.cycle_id.in_(chunk), Job.status == JobStatus.FAILED)
+            .distinct()
+        }
+        open_cycles = Cycle.status.notin_(_TERMINAL)
+        running = [cycle_id for cycle_id in chunk if pending.get(cycle_id)]
+        done = [cycle_id for cycle_id in chunk if not pending.get(cycle_id)]
+
+        if running:
+            db.execute(
+                update(Cycle)
+                .where(Cycle.id.in_(running), Cycle.status == CycleStatus.QUEUED)
+                .values(status=CycleStatus.RUNNING),
+                execution_options={"synchronize_session": False},
+            )
+        for status, group in (
+            (CycleStatus.FAILED, [c for c in done if c in failed]),
+            (CycleStatus.COMPLETED, [c for c in done if c not in failed]),
+        ):
+            if group:
+                finished += db.execute(
+                    update(Cycle)
+                    .where(Cycle.id.in_(group), open_cycles)
+                    .values(status=status, finished_at=now),
+                    execution_options={"synchronize_session": False},
+                ).rowcount
+    return finished
@@ -0,0 +1,213 @@
+"""Durable job queue on the jobs table - enqueue, lease-based claiming and recovery."""
+
+from typing import Dict, Iterable, List, Mapping, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+from database.models import Job, JobStatus
+from core.models import Job as CoreJob
+from database.bulk import bulk_insert_jobs, bulk_update_job_status
+import logging
+import os
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claimed job is leased to a worker before another may reclaim it
+LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "300"))
+
+# Claims after which an expired job is failed instead of requeued
+MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# Delay before a job waiting on unfinished dependencies is offered again
+DEPENDENCY_RETRY_SECONDS = float(os.getenv("JOB_DEPENDENCY_RETRY_SECONDS", "1.0"))
+
+
+def to_db_job(job: CoreJob) -> Job:
+    """Convert a core job into a jobs row."""
+    return Job(
+        id=job.id,
+        company_id=job.company_id,
+        type=job.type,
+        payload=job.payload,
+        status=job.status,
+        priority=job.priority,
+        created_at=job.created_at,
+    )
+
+
+def to_core_job(row: Job) -> CoreJob:
+    """Convert a claimed jobs row into a core job for the agent layer."""
+    return CoreJob(
+        id=row.id,
+        type=row.type,
+        company_id=row.company_id,
+        payload=row.payload or {},
+        priority=row.priority,
+        created_at=row.created_at,
+    )
+
+
+def enqueue_jobs(
+    db: Session, jobs: Iterable[CoreJob], cycle_ids: Optional[Mapping[str, str]] = None
+) -> int:
+    """Persist jobs as queued rows for workers to claim, optionally tagged with company -> cycle id. Caller commits."""
+    return bulk_insert_jobs(db, jobs, cycle_ids)
+
+
+def claim_jobs(
+    db: Session,
+    worker_id: str,
+    batch_size: int = 50,
+    lease_seconds: int = LEASE_SECONDS,
+) -> List[Job]:
+    """
+    Atomically lease up to ``batch_size`` queued jobs to a worker.
+
+    Postgres uses ``SELECT ... FOR UPDATE SKIP LOCKED`` so concurrent workers
+    never block on each other. SQLite serializes writers, so a single
+    ``UPDATE ... WHERE id IN (SELECT ... LIMIT n)`` stamped with a unique
+    lease token is atomic there.
+    """
+    now = datetime.utcnow()
+    lease_owner = f"{worker_id}:{uuid.uuid4().hex}"
+    claimable = (Job.status == JobStatus.QUEUED) & or_(
+        Job.available_at.is_(None), Job.available_at <= now
+    )
+    values = dict(
+        status=JobStatus.RUNNING,
+        lease_owner=lease_owner,
+        lease_expires_at=now + timedelta(seconds=lease_seconds),
+        attempts=Job.attempts + 1,
+        updated_at=now,
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        rows = (
+            db.query(Job)
+            .filter(claimable)
+            .order_by(Job.priority, Job.created_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        ids = [row.id for row in rows]
+    else:
+        ids = [
+            row.id
+            for row in db.query(Job.id)
+            .filter(claimable)
+            .order_by(Job.priority, Job.created_at)
+            .limit(batch_size)
+        ]
+        # Re-check the status so a concurrent claimer's rows are not taken twice
+        claimable = claimable & Job.id.in_(ids)
+
+    if not ids:
+        db.rollback()
+        return []
+
+    db.execute(
+        update(Job).where(Job.id.in_(ids), claimable).values(**values),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return (
+        db.query(Job)
+        .filter(Job.lease_owner == lease_owner)
+        .order_by(Job.priority, Job.created_at)
+        .all()
+    )
+
+
+def finish_jobs(db: Session, lease_owner: str, statuses: Dict[str, str]) -> int:
+    """
+    Record final statuses for jobs still leased by ``lease_owner``.
+
+    Jobs whose lease expired and were reclaimed elsewhere are left alone.
+    Caller commits. Returns the number of rows updated.
+    """
+    return bulk_update_job_status(
+        db, statuses, leased_by=lease_owner, lease_owner=None, lease_expires_at=None
+    )
+
+
+def release_jobs(
+    db: Session,
+    lease_owner: str,
+    job_ids: Iterable[str],
+    delay_seconds: float = DEPENDENCY_RETRY_SECONDS,
+) -> int:
+    """Return leased jobs to the queue without counting the attempt. Caller commits."""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return 0
+    now = datetime.utcnow()
+    result = db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.lease_owner == lease_owner)
+        .values(
+            status=JobStatus.QUEUED,
+            lease_owner=None,
+            lease_expires_at=None,
+            attempts=Job.attempts - 1,
+            available_at=now + timedelta(seconds=delay_seconds),
+            updated_at=now,
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    return result.rowcount
+
+
+def recover_expired_leases(
+    db: Session, max_attempts: int = MAX_ATTEMPTS, now: Optional[datetime] = None
+) -> int:
+    """
+    Requeue running jobs whose lease expired (their worker died), or fail
+    them once they have used up ``max_attempts``. Commits.
+    """
+    now = now or datetime.utcnow()
+    expired = (Job.status == JobStatus.RUNNING) & (Job.lease_expires_at < now)
+    requeued = db.execute(
+        update(Job)
+        .where(expired, Job.attempts < max_attempts)
+        .values(
+            status=JobStatus.QUEUED,
+            lease_owner=None,
+            lease_expires_at=None,
+            updated_at=now,
+        ),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    failed = db.execute(
+        update(Job)
+        .where(expired, Job.attempts >= max_attempts)
+        .values(
+            status=JobStatus.FAILED,
+            lease_owner=None,
+            lease_expires_at=None,
+            updated_at=now,
+        ),
+        execution_options={"synchronize_session": False},
+    ).rowcount
+    db.commit()
+    if requeued or failed:
+        logger.warning(
+            f"Recovered expired leases: {requeued} requeued, {failed} failed"
+        )
+    return requeued + failed
+
+
+def dependency_statuses(db: Session, rows: Iterable[Job]) -> Dict[str, str]:
+    """Current status of every job the given rows depend on."""
+    parent_ids = {
+        pid for row in rows for pid in (row.payload or {}).get("depends_on", [])
+    }
+    if not parent_ids:
+        return {}
+    return {
+        job_id: status.value
+        for job_id, status in db.query(Job.id, Job.status).filter(
+            Job.id.in_(parent_ids)
+        )
+    }
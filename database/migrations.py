@@ -0,0 +1,87 @@
+"""Schema upgrades for databases created before the models gained columns or indexes."""
+
+from typing import List
+from sqlalchemy import Column, Enum, inspect, literal, text
+from sqlalchemy.engine import Dialect, Engine
+from database.connection import Base
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column: Column, dialect: Dialect) -> str:
+    """``ADD COLUMN`` clause for a model column; existing rows get its scalar default."""
+    quote = dialect.identifier_preparer.quote
+    ddl = f"{quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = (
+        column.default.arg
+        if column.default is not None and column.default.is_scalar
+        else None
+    )
+    if default is not None:
+        ddl += " DEFAULT " + str(
+            literal(default).compile(
+                dialect=dialect, compile_kwargs={"literal_binds": True}
+            )
+        )
+    if not column.nullable:
+        if default is None:
+            raise ValueError(
+                f"Cannot add NOT NULL column {column.table.name}.{column.name} without a default"
+            )
+        ddl += " NOT NULL"
+    for fk in column.foreign_keys:
+        ddl += f" REFERENCES {quote(fk.column.table.name)} ({quote(fk.column.name)})"
+    return ddl
+
+
+def upgrade_schema(engine: Engine) -> List[str]:
+    """
+    Add the columns, indexes and enum values the models define that existing
+    tables lack. ``create_all`` only creates missing tables, so databases from
+    before the job queue (priority, attempts, lease and cycle columns) or the
+    keyset-pagination indexes need this. It only adds, so it is safe to run
+    on every start. Returns the changes made.
+    """
+    from database import models  # noqa: F401  (register every table on Base.metadata)
+
+    changes: List[str] = []
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    tables = [table for table in Base.metadata.sorted_tables if table.name in existing]
+
+    with engine.begin() as conn:
+        for table in tables:
+            present = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in present:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {engine.dialect.identifier_preparer.quote(table.name)} "
+                            f"ADD COLUMN {_column_ddl(column, engine.dialect)}"
+                        )
+                    )
+                    changes.append(f"column {table.name}.{column.name}")
+            indexed = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexed:
+                    index.create(conn)
+                    changes.append(f"index {index.name}")
+
+    if engine.dialect.name == "postgresql":
+        # Native enum types keep the labels they were created with (e.g. no SKIPPED job
+        # status); ADD VALUE cannot run inside a transaction block before PostgreSQL 12
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in tables:
+                for column in table.columns:
+                    if isinstance(column.type, Enum) and column.type.name:
+                        for label in column.type.enums:
+                            conn.execute(
+                                text(
+                                    f"ALTER TYPE {column.type.name} ADD VALUE IF NOT EXISTS '{label}'"
+                                )
+                            )
+
+    for change in changes:
+        logger.info(f"Schema upgrade: added {change}")
+    return changes
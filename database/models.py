@@ -1,9 +1,10 @@
 """SQLAlchemy database models for Profit OS Chimera."""
 
-from sqlalchemy import Column, String, Float, Integer, DateTime, Text, JSON, ForeignKey, Enum
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, JSON, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+from datetime import datetime
 from database.connection import Base
 import uuid
 
@@ -14,6 +15,15 @@ class JobStatus(str, enum.Enum):
     RUNNING = "running"
     SUCCEEDED = "succeeded"
     FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class CycleStatus(str, enum.Enum):
+    """Growth cycle status enumeration."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 
 class KPIStatus(str, enum.Enum):
@@ -33,13 +43,18 @@ class Company(Base):
     industry = Column(String)
     size = Column(String)  # solo, smb, mid, enterprise
     meta_data = Column(JSON, default=dict)  # Renamed from metadata (reserved in SQLAlchemy)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     kpis = relationship("KPI", back_populates="company", cascade="all, delete-orphan")
     jobs = relationship("Job", back_populates="company", cascade="all, delete-orphan")
     evidence = relationship("EvidenceRecord", back_populates="company", cascade="all, delete-orphan")
+    cycles = relationship("Cycle", back_populates="company", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        Index("ix_companies_created_id", "created_at", "id"),  # keyset pagination
+    )
 
 
 class KPI(Base):
@@ -53,10 +68,66 @@ class KPI(Base):
     target = Column(Float)
     status = Column(Enum(KPIStatus), default=KPIStatus.UNKNOWN)
     meta_data = Column(JSON, default=dict)  # Renamed from metadata
-    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    recorded_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), index=True)
     
     # Relationships
     company = relationship("Company", back_populates="kpis")
+    
+    __table_args__ = (
+        Index("ix_kpis_company_name_recorded", "company_id", "name", "recorded_at"),
+        Index("ix_kpis_company_recorded_id", "company_id", "recorded_at", "id"),  # keyset pagination
+    )
+
+
+class KPILatest(Base):
+    """Most recent value per company and KPI, upserted on ingest."""
+    __tablename__ = "kpi_latest"
+    
+    company_id = Column(String, ForeignKey("companies.id"), primary_key=True)
+    name = Column(String, primary_key=True)
+    kpi_id = Column(String, ForeignKey("kpis.id"), nullable=False)  # raw row holding this value
+    value = Column(Float, nullable=False)
+    target = Column(Float)
+    status = Column(Enum(KPIStatus), default=KPIStatus.UNKNOWN)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class KPIRollup(Base):
+    """Pre-aggregated KPI values per hour or day bucket, maintained on ingest."""
+    __tablename__ = "kpi_rollups"
+    
+    company_id = Column(String, ForeignKey("companies.id"), primary_key=True)
+    name = Column(String, primary_key=True)
+    granularity = Column(String, primary_key=True)  # hour, day
+    bucket_start = Column(DateTime(timezone=True), primary_key=True)
+    count = Column(Integer, nullable=False)
+    sum_value = Column(Float, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+    last_value = Column(Float, nullable=False)
+    last_recorded_at = Column(DateTime(timezone=True), nullable=False)
+    
+    @property
+    def avg_value(self) -> float:
+        return self.sum_value / self.count if self.count else 0.0
+
+
+class Cycle(Base):
+    """Growth cycle model - one play evaluation for a company and the jobs it created."""
+    __tablename__ = "cycles"
+    
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    company_id = Column(String, ForeignKey("companies.id"), nullable=False, index=True)
+    status = Column(Enum(CycleStatus), default=CycleStatus.QUEUED, index=True)
+    kpi_snapshot = Column(JSON, default=dict)
+    plays_triggered = Column(JSON, default=list)
+    jobs_created = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), index=True)
+    finished_at = Column(DateTime(timezone=True))
+    
+    # Relationships
+    company = relationship("Company", back_populates="cycles")
+    jobs = relationship("Job", back_populates="cycle")
 
 
 class Job(Base):
@@ -68,12 +139,24 @@ class Job(Base):
     type = Column(String, nullable=False, index=True)
     payload = Column(JSON, default=dict)
     status = Column(Enum(JobStatus), default=JobStatus.QUEUED, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    priority = Column(Integer, default=100, nullable=False)  # lower runs first
+    attempts = Column(Integer, default=0, nullable=False)
+    available_at = Column(DateTime(timezone=True))  # not claimable before this time
+    lease_owner = Column(String, index=True)  # worker claim token while running
+    lease_expires_at = Column(DateTime(timezone=True))
+    cycle_id = Column(String, ForeignKey("cycles.id"), index=True)  # cycle that created the job
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), index=True)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     company = relationship("Company", back_populates="jobs")
+    cycle = relationship("Cycle", back_populates="jobs")
     evidence = relationship("EvidenceRecord", back_populates="job")
+    
+    __table_args__ = (
+        Index("ix_jobs_claim_order", "status", "priority", "created_at"),
+        Index("ix_jobs_company_created_id", "company_id", "created_at", "id"),  # keyset pagination
+    )
 
 
 class EvidenceRecord(Base):
@@ -85,9 +168,13 @@ class EvidenceRecord(Base):
     job_id = Column(String, ForeignKey("jobs.id"), nullable=True, index=True)
     event_type = Column(String, nullable=False, index=True)
     payload = Column(JSON, default=dict)
-    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    occurred_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now(), index=True)
     
     # Relationships
     company = relationship("Company", back_populates="evidence")
     job = relationship("Job", back_populates="evidence")
+    
+    __table_args__ = (
+        Index("ix_evidence_company_occurred_id", "company_id", "occurred_at", "id"),  # keyset pagination
+    )
 
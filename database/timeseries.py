@@ -0,0 +1,390 @@
+"""KPI time-series layer - latest-value table and hourly/daily rollups maintained on ingest."""
+
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from datetime import datetime
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+from database.bulk import IN_CLAUSE_CHUNK, bulk_insert_kpis
+from database.models import Company, KPI, KPILatest, KPIRollup, KPIStatus
+from core.kpis import kpi_status
+import uuid
+
+# Rollup bucket sizes maintained for every ingested point
+GRANULARITIES = ("hour", "day")
+
+
+def bucket_start(ts: datetime, granularity: str) -> datetime:
+    """Start of the hour or day bucket containing ``ts``."""
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(
+        f"Unknown granularity: {granularity} (expected one of {GRANULARITIES})"
+    )
+
+
+def _aggregate(points: Iterable[dict]) -> Tuple[Dict[tuple, dict], Dict[tuple, dict]]:
+    """Fold a batch into one latest row per (company, name) and one rollup row per bucket."""
+    latest: Dict[tuple, dict] = {}
+    rollups: Dict[tuple, dict] = {}
+    for point in points:
+        company_id, name = point["company_id"], point["name"]
+        value, recorded_at = point["value"], point["recorded_at"]
+        key = (company_id, name)
+        current = latest.get(key)
+        if current is None or recorded_at >= current["recorded_at"]:
+            latest[key] = {
+                "company_id": company_id,
+                "name": name,
+                "kpi_id": point["id"],
+                "value": value,
+                "target": point.get("target"),
+                "status": point.get("status"),
+                "recorded_at": recorded_at,
+            }
+
+        for granularity in GRANULARITIES:
+            bucket = bucket_start(recorded_at, granularity)
+            row = rollups.get(key + (granularity, bucket))
+            if row is None:
+                rollups[key + (granularity, bucket)] = {
+                    "company_id": company_id,
+                    "name": name,
+                    "granularity": granularity,
+                    "bucket_start": bucket,
+                    "count": 1,
+                    "sum_value": value,
+                    "min_value": value,
+                    "max_value": value,
+                    "last_value": value,
+                    "last_recorded_at": recorded_at,
+                }
+                continue
+            row["count"] += 1
+            row["sum_value"] += value
+            if value < row["min_value"]:
+                row["min_value"] = value
+            if value > row["max_value"]:
+                row["max_value"] = value
+            if recorded_at >= row["last_recorded_at"]:
+                row["last_value"] = value
+                row["last_recorded_at"] = recorded_at
+    return latest, rollups
+
+
+def _upsert(db: Session, latest: List[dict], rollups: List[dict]):
+    """INSERT ... ON CONFLICT DO UPDATE for SQLite and Postgres."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+
+        least, greatest = func.least, func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+        # SQLite's multi-argument min()/max() are scalar functions
+        least, greatest = func.min, func.max
+
+    if latest:
+        stmt = insert(KPILatest)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[KPILatest.company_id, KPILatest.name],
+            set_={
+                "kpi_id": stmt.excluded.kpi_id,
+                "value": stmt.excluded.value,
+                "target": stmt.excluded.target,
+                "status": stmt.excluded.status,
+                "recorded_at": stmt.excluded.recorded_at,
+            },
+            # Late-arriving points never replace a newer value
+            where=stmt.excluded.recorded_at >= KPILatest.recorded_at,
+        )
+        db.execute(stmt, latest)
+
+    if rollups:
+        stmt = insert(KPIRollup)
+        newer = stmt.excluded.last_recorded_at >= KPIRollup.last_recorded_at
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                KPIRollup.company_id,
+                KPIRollup.name,
+                KPIRollup.granularity,
+                KPIRollup.bucket_start,
+            ],
+            set_={
+                "count": KPIRollup.count + stmt.excluded.count,
+                "sum_value": KPIRollup.sum_value + stmt.excluded.sum_value,
+                "min_value": least(KPIRollup.min_value, stmt.excluded.min_value),
+                "max_value": greatest(KPIRollup.max_value, stmt.excluded.max_value),
+                "last_value": case(
+                    (newer, stmt.excluded.last_value), else_=KPIRollup.last_value
+                ),
+                "last_recorded_at": case(
+                    (newer, stmt.excluded.last_recorded_at),
+                    else_=KPIRollup.last_recorded_at,
+                ),
+            },
+        )
+        db.execute(stmt, rollups)
+
+
+def _merge(db: Session, latest: List[dict], rollups: List[dict]):
+    """Read-modify-write fallback for dialects without ON CONFLICT."""
+    for values in latest:
+        row = db.get(KPILatest, (values["company_id"], values["name"]))
+        if row is None:
+            db.add(KPILatest(**values))
+        elif values["recorded_at"] >= row.recorded_at:
+            for column, value in values.items():
+                setattr(row, column, value)
+
+    for values in rollups:
+        key = (
+            values["company_id"],
+            values["name"],
+            values["granularity"],
+            values["bucket_start"],
+        )
+        row = db.get(KPIRollup, key)
+        if row is None:
+            db.add(KPIRollup(**values))
+            continue
+        row.count += values["count"]
+        row.sum_value += values["sum_value"]
+        row.min_value = min(row.min_value, values["min_value"])
+        row.max_value = max(row.max_value, values["max_value"])
+        if values["last_recorded_at"] >= row.last_recorded_at:
+            row.last_value = values["last_value"]
+            row.last_recorded_at = values["last_recorded_at"]
+
+
+def record_points(db: Session, points: Sequence[dict]):
+    """
+    Fold already-inserted ``kpis`` rows, given as dicts with ``id``,
+    ``company_id``, ``name``, ``value``, ``recorded_at`` and optionally
+    ``target``/``status``, into ``kpi_latest`` and ``kpi_rollups``.
+
+    The batch is aggregated in memory first, so each key is written once.
+    Caller commits, keeping raw rows and derived tables in one transaction.
+    """
+    if not points:
+        return
+    latest, rollups = _aggregate(points)
+    if db.get_bind().dialect.name in ("sqlite", "postgresql"):
+        _upsert(db, list(latest.values()), list(rollups.values()))
+    else:
+        _merge(db, list(latest.values()), list(rollups.values()))
+
+
+def record_kpis(db: Session, kpis: Sequence[KPI]):
+    """``record_points`` for ORM rows; ``id`` and ``recorded_at`` must be set."""
+    record_points(
+        db,
+        [
+            {
+                "id": kpi.id,
+                "company_id": kpi.company_id,
+                "name": kpi.name,
+                "value": kpi.value,
+                "target": kpi.target,
+                "status": kpi.status,
+                "recorded_at": kpi.recorded_at,
+            }
+            for kpi in kpis
+        ],
+    )
+
+
+class KPIBatchWriter:
+    """
+    Buffers validated KPI points and writes them in batches: one bulk insert
+    into ``kpis``, one ``record_points`` upsert and one commit per batch.
+
+    Status is computed from ``definitions`` (kpis.yml) as points are added;
+    points for unknown companies are rejected at flush time, with company
+    ids looked up once per batch and cached across batches.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        definitions: Mapping[str, Dict[str, Any]],
+        batch_size: int = 5000,
+    ):
+        self.db = db
+        self.definitions = definitions
+        self.batch_size = batch_size
+        self.batches: List[int] = []
+        self.accepted = 0
+        self._pending: List[Tuple[Any, dict]] = []
+        self._known: Set[str] = set()
+        self._missing: Set[str] = set()
+
+    def add(self, ref: Any, point: dict) -> List[Tuple[Any, str]]:
+        """Queue a point from ``parse_point``; returns rejections if this filled a batch."""
+        definition = self.definitions.get(point["name"])
+        if point["target"] is None and definition:
+            point["target"] = definition.get("target")
+        point["status"] = KPIStatus(
+            kpi_status(point["value"], definition, point["target"])
+        )
+        self._pending.append((ref, point))
+        if len(self._pending) >= self.batch_size:
+            return self.flush()
+        return []
+
+    def flush(self) -> List[Tuple[Any, str]]:
+        """Write pending points and commit. Returns ``(ref, error)`` for rejected points."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        self._resolve_companies({point["company_id"] for _, point in pending})
+
+        rejected = []
+        rows = []
+        for ref, point in pending:
+            if point["company_id"] in self._missing:
+                rejected.append((ref, f"unknown company_id: {point['company_id']}"))
+                continue
+            point["id"] = str(uuid.uuid4())
+            point["meta_data"] = {}
+            rows.append(point)
+
+        if rows:
+            bulk_insert_kpis(self.db, rows)
+            record_points(self.db, rows)
+            self.db.commit()
+            self.batches.append(len(rows))
+            self.accepted += len(rows)
+        return rejected
+
+    def _resolve_companies(self, company_ids: Set[str]):
+        unseen = list(company_ids - self._known - self._missing)
+        for i in range(0, len(unseen), IN_CLAUSE_CHUNK):
+            chunk = unseen[i : i + IN_CLAUSE_CHUNK]
+            found = {
+                cid
+                for (cid,) in self.db.query(Company.id).filter(Company.id.in_(chunk))
+            }
+            self._known |= found
+            self._missing.update(cid for cid in chunk if cid not in found)
+
+
+def latest_values(
+    db: Session, company_id: str, names: Optional[Iterable[str]] = None
+) -> Dict[str, float]:
+    """Latest value per KPI name for a company, by primary key."""
+    query = db.query(KPILatest.name, KPILatest.value).filter(
+        KPILatest.company_id == company_id
+    )
+    if names is not None:
+        query = query.filter(KPILatest.name.in_(list(names)))
+    return {name: value for name, value in query}
+
+
+def iter_latest_snapshots(
+    db: Session, chunk_size: int = 500
+) -> Iterator[List[Tuple[str, Dict[str, float]]]]:
+    """
+    Yield ``(company_id, {name: latest value})`` for every company with
+    KPIs, ``chunk_size`` companies at a time in company id order.
+
+    Each chunk is two short queries (keyset on company id), so no cursor is
+    held open and callers may commit between chunks.
+    """
+    after: Optional[str] = None
+    while True:
+        query = db.query(KPILatest.company_id).distinct()
+        if after is not None:
+            query = query.filter(KPILatest.company_id > after)
+        company_ids = [
+            cid for (cid,) in query.order_by(KPILatest.company_id).limit(chunk_size)
+        ]
+        if not company_ids:
+            return
+        snapshots: Dict[str, Dict[str, float]] = {cid: {} for cid in company_ids}
+        rows = db.query(KPILatest.company_id, KPILatest.name, KPILatest.value).filter(
+            KPILatest.company_id.in_(company_ids)
+        )
+        for company_id, name, value in rows:
+            snapshots[company_id][name] = value
+        yield list(snapshots.items())
+        after = company_ids[-1]
+
+
+def latest_kpis(db: Session, company_id: str) -> List[KPI]:
+    """The raw ``kpis`` row behind each latest value for a company."""
+    return (
+        db.query(KPI)
+        .join(KPILatest, KPILatest.kpi_id == KPI.id)
+        .filter(KPILatest.company_id == company_id)
+        .order_by(KPILatest.name)
+        .all()
+    )
+
+
+def get_rollups(
+    db: Session,
+    company_id: str,
+    granularity: str = "day",
+    since: Optional[datetime] = None,
+    names: Optional[Iterable[str]] = None,
+) -> List[KPIRollup]:
+    """Rollup rows for a company, oldest bucket first."""
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity: {granularity} (expected one of {GRANULARITIES})"
+        )
+    query = db.query(KPIRollup).filter(
+        KPIRollup.company_id == company_id,
+        KPIRollup.granularity == granularity,
+    )
+    if since is not None:
+        query = query.filter(KPIRollup.bucket_start >= bucket_start(since, granularity))
+    if names is not None:
+        query = query.filter(KPIRollup.name.in_(list(names)))
+    return query.order_by(KPIRollup.name, KPIRollup.bucket_start).all()
+
+
+def rebuild_timeseries(
+    db: Session, company_id: Optional[str] = None, batch_size: int = 10000
+) -> int:
+    """
+    Recompute ``kpi_latest`` and ``kpi_rollups`` from raw ``kpis`` rows, for
+    databases populated before these tables existed. Commits. Returns the
+    number of raw rows folded in.
+    """
+    latest_q = db.query(KPILatest)
+    rollup_q = db.query(KPIRollup)
+    raw_q = db.query(KPI).filter(KPI.recorded_at.isnot(None))
+    if company_id is not None:
+        latest_q = latest_q.filter(KPILatest.company_id == company_id)
+        rollup_q = rollup_q.filter(KPIRollup.company_id == company_id)
+        raw_q = raw_q.filter(KPI.company_id == company_id)
+    latest_q.delete(synchronize_session=False)
+    rollup_q.delete(synchronize_session=False)
+
+    total = 0
+    batch: List[KPI] = []
+    for kpi in raw_q.order_by(KPI.recorded_at).yield_per(batch_size):
+        batch.append(kpi)
+        if len(batch) >= batch_size:
+            record_kpis(db, batch)
+            total += len(batch)
+            batch = []
+    record_kpis(db, batch)
+    total += len(batch)
+    db.commit()
+    return total
@@ -0,0 +1,98 @@
+"""Job handlers for the AI Business Intelligence and trend agents."""
+
+from typing import List
+from core.agents import Agent
+from core.handlers import jsonable, make_evidence, register_handler
+from core.models import EvidenceRecord, Job
+from .intelligence import (
+    AITrendAnalyzer,
+    FundingScout,
+    PartnershipFinder,
+    TrendCategory,
+)
+
+# Categories scanned for ANALYZE_MARKET_DRIVERS when none are given
+MARKET_DRIVER_CATEGORIES = ["market", "consumer", "business"]
+
+
+def _trends(job: Job, default_categories=None) -> list:
+    params = job.payload.get("params", {})
+    categories = params.get("categories", default_categories)
+    analyzer = AITrendAnalyzer(params.get("profile", {}))
+    return analyzer.detect_trends(
+        [TrendCategory(c) for c in categories] if categories else None,
+        limit=params.get("limit", 10),
+    )
+
+
+@register_handler("DETECT_TRENDS")
+def detect_trends(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Detect trends in ``params["categories"]`` (all categories by default)."""
+    trends = _trends(job)
+    return [
+        make_evidence(
+            job, "trends_detected", {"count": len(trends), "trends": jsonable(trends)}
+        )
+    ]
+
+
+@register_handler("ANALYZE_MARKET_DRIVERS")
+def analyze_market_drivers(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Detect market, consumer and business trends driving demand."""
+    trends = _trends(job, MARKET_DRIVER_CATEGORIES)
+    return [
+        make_evidence(
+            job,
+            "market_drivers_analyzed",
+            {"count": len(trends), "drivers": jsonable(trends)},
+        )
+    ]
+
+
+@register_handler("ANALYZE_COMPETITION")
+def analyze_competition(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Analyze competition in ``params["niche"]``."""
+    params = job.payload.get("params", {})
+    analyzer = AITrendAnalyzer(params.get("profile", {}))
+    analysis = analyzer.analyze_competition(params.get("niche", "general"))
+    return [make_evidence(job, "competition_analyzed", jsonable(analysis))]
+
+
+@register_handler("FIND_PARTNERSHIPS")
+def find_partnerships(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Find partners of ``params["partner_types"]``."""
+    params = job.payload.get("params", {})
+    finder = PartnershipFinder(params.get("profile", {}))
+    partnerships = finder.find_partnerships(
+        params.get("partner_types"), limit=params.get("limit", 10)
+    )
+    return [
+        make_evidence(
+            job,
+            "partnerships_found",
+            {
+                "count": len(partnerships),
+                "partnerships": jsonable(partnerships),
+            },
+        )
+    ]
+
+
+@register_handler("SCOUT_FUNDING")
+def scout_funding(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Find funding of ``params["types"]`` (grant, accelerator, investment)."""
+    params = job.payload.get("params", {})
+    scout = FundingScout(params.get("profile", {}))
+    opportunities = scout.find_funding_opportunities(
+        params.get("types"), limit=params.get("limit", 10)
+    )
+    return [
+        make_evidence(
+            job,
+            "funding_found",
+            {
+                "count": len(opportunities),
+                "opportunities": jsonable(opportunities),
+            },
+        )
+    ]
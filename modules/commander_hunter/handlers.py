@@ -0,0 +1,71 @@
+"""Job handlers for the Commander Opportunity Hunter agent."""
+
+from typing import List
+from core.agents import Agent
+from core.handlers import jsonable, make_evidence, register_handler
+from core.models import EvidenceRecord, Job
+from .hunter import (
+    IncomeStreamAnalyzer,
+    Opportunity,
+    OpportunityHunter,
+    OpportunityType,
+)
+
+
+def _hunt(params: dict) -> tuple:
+    hunter = OpportunityHunter(params.get("profile", {}))
+    types = (
+        [OpportunityType(t) for t in params["types"]] if params.get("types") else None
+    )
+    return hunter, hunter.hunt_opportunities(
+        types, max_results=params.get("max_results", 20)
+    )
+
+
+@register_handler("HUNT_OPPORTUNITIES")
+def hunt_opportunities(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Scout opportunities for the profile in ``params``; apply to ready ones with ``auto_apply``."""
+    params = job.payload.get("params", {})
+    hunter, opportunities = _hunt(params)
+    records = [
+        make_evidence(
+            job,
+            "opportunities_found",
+            {
+                "count": len(opportunities),
+                "opportunities": jsonable(opportunities),
+            },
+        )
+    ]
+    if params.get("auto_apply"):
+        applications = [
+            hunter.auto_apply(opp) for opp in opportunities if opp.auto_apply_ready
+        ]
+        records.append(
+            make_evidence(job, "opportunities_applied", {"applications": applications})
+        )
+    return records
+
+
+@register_handler("ANALYZE_INCOME_STREAMS")
+def analyze_income_streams(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Analyze the income streams listed in ``params["streams"]``."""
+    params = job.payload.get("params", {})
+    analyzer = IncomeStreamAnalyzer(params.get("profile", {}))
+    analysis = analyzer.analyze_current_streams(params.get("streams", []))
+    return [make_evidence(job, "income_streams_analyzed", jsonable(analysis))]
+
+
+@register_handler("AUTO_APPLY_OPPORTUNITY")
+def auto_apply_opportunity(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Apply to ``params["opportunity"]``, or to every auto-apply-ready opportunity found."""
+    params = job.payload.get("params", {})
+    if "opportunity" in params:
+        opp = dict(params["opportunity"])
+        opp["type"] = OpportunityType(opp["type"])
+        hunter = OpportunityHunter(params.get("profile", {}))
+        opportunities = [Opportunity(**opp)]
+    else:
+        hunter, opportunities = _hunt(params)
+    applications = [hunter.auto_apply(opp) for opp in opportunities]
+    return [make_evidence(job, "opportunities_applied", {"applications": applications})]
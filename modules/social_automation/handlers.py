@@ -0,0 +1,43 @@
+"""Job handlers for the Social Content Pack bot."""
+
+from typing import List
+from core.agents import Agent
+from core.handlers import jsonable, make_evidence, register_handler
+from core.models import EvidenceRecord, Job
+from .automator import Platform, SocialMediaAutomator
+
+DEFAULT_PLATFORMS = ["youtube", "instagram", "tiktok"]
+
+
+def _content_batch(params: dict) -> tuple:
+    automator = SocialMediaAutomator(
+        params.get("profile", {}), params.get("brand_voice", {})
+    )
+    posts = automator.create_content_batch(
+        [Platform(p) for p in params.get("platforms", DEFAULT_PLATFORMS)],
+        params.get("theme", "business growth"),
+        count=params.get("content_count", 7),
+    )
+    return automator, posts
+
+
+@register_handler("CREATE_SOCIAL_CONTENT")
+def create_social_content(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Create ``content_count`` posts per platform on ``theme``."""
+    _, posts = _content_batch(job.payload.get("params", {}))
+    return [
+        make_evidence(
+            job,
+            "social_content_created",
+            {"count": len(posts), "posts": jsonable(posts)},
+        )
+    ]
+
+
+@register_handler("SCHEDULE_SOCIAL_POSTS")
+def schedule_social_posts(agent: Agent, job: Job) -> List[EvidenceRecord]:
+    """Build the content batch described by ``params`` and schedule it."""
+    automator, posts = _content_batch(job.payload.get("params", {}))
+    return [
+        make_evidence(job, "social_posts_scheduled", automator.schedule_posts(posts))
+    ]
@@ -3,16 +3,22 @@
 import sys
 from pathlib import Path
 import logging
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
 import uuid
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from core.config_loader import load_agents, load_plays, load_kpis
+from core.config_loader import get_config, load_agents, load_plays, load_kpis
+from core.kpis import KPIPointError, iter_metric_file, parse_point
 from core.orchestrator import Orchestrator
-from core.models import Job, Company
-from core.playbooks import generate_jobs_from_plays
+from core.models import Job, Company, new_id
+from core.playbooks import generate_jobs_from_plays, generate_jobs_for_companies
 
 logging.basicConfig(
     level=logging.INFO,
@@ -116,7 +122,7 @@ def demo_cycle(company_id: str = "demo-company", company_name: str = "Demo Compa
     logger.info("=" * 60)
     
     job_statuses = {}
-    for job in orch.jobs.values():
+    for job in orch.all_jobs():
         status = job.status
         job_statuses[status] = job_statuses.get(status, 0) + 1
     
@@ -126,6 +132,70 @@ def demo_cycle(company_id: str = "demo-company", company_name: str = "Demo Compa
     return orch, evidence
 
 
+# Companies handed to a pool worker per task
+INGEST_CHUNK_SIZE = int(os.getenv("BI_INGEST_CHUNK_SIZE", "256"))
+
+# One orchestrator per process, rebuilt when the config snapshot changes
+_orchestrator: Optional[Orchestrator] = None
+_orchestrator_version: Optional[str] = None
+
+
+def _get_orchestrator() -> Orchestrator:
+    global _orchestrator, _orchestrator_version
+    config = get_config()
+    if _orchestrator is None or _orchestrator_version != config.version:
+        _orchestrator = Orchestrator(list(config.agents))
+        _orchestrator_version = config.version
+    return _orchestrator
+
+
+def _init_ingest_worker(verbose: bool):
+    """Pool initializer: load the config once per process and quiet per-job logging."""
+    if not verbose:
+        logging.getLogger("core").setLevel(logging.WARNING)
+    get_config()
+
+
+def _run_batch(snapshots: List[Tuple[str, Dict[str, float]]], metrics_source: str):
+    """Enqueue ingest and triggered play jobs for a batch of companies and run one cycle."""
+    config = get_config()
+    orch = _get_orchestrator()
+    jobs_by_company = generate_jobs_for_companies(dict(snapshots), config.compiled_plays, config.kpis)
+
+    jobs: List[Job] = []
+    created_at = datetime.utcnow()
+    for company_id, metrics in snapshots:
+        jobs.append(Job(
+            id=new_id(),
+            type="INGEST_METRICS",
+            company_id=company_id,
+            payload={"source": metrics_source, "metrics": metrics},
+            priority=0,
+            created_at=created_at,
+        ))
+    for company_jobs in jobs_by_company.values():
+        jobs.extend(company_jobs)
+    for job in jobs:
+        orch.enqueue(job)
+    return orch, jobs, orch.run_cycle()
+
+
+def run_companies(snapshots: List[Tuple[str, Dict[str, float]]], metrics_source: str) -> Dict[str, int]:
+    """
+    Ingest, evaluate triggers and execute jobs for a batch of companies.
+
+    Triggers for the whole batch are evaluated in one vectorized pass and
+    every company's jobs run in a single orchestrator cycle, ingest jobs
+    first. Returns counters: companies, jobs, evidence and jobs per status.
+    """
+    orch, jobs, evidence = _run_batch(snapshots, metrics_source)
+    orch.evidence.clear()  # only the counts leave this process
+
+    totals = Counter(job.status for job in jobs)
+    totals.update(companies=len(snapshots), jobs=len(jobs), evidence=len(evidence))
+    return dict(totals)
+
+
 def ingest_metrics_cycle(company_id: str, metrics_source: str, metrics_data: dict):
     """
     Run a cycle starting with metric ingestion.
@@ -136,29 +206,24 @@ def ingest_metrics_cycle(company_id: str, metrics_source: str, metrics_data: dic
         metrics_data: Dictionary of KPI name -> value
     """
     logger.info(f"Ingesting metrics from {metrics_source}...")
-    
-    agents = load_agents()
-    orch = Orchestrator(agents)
+    config = get_config()
+    orch = Orchestrator(list(config.agents))
     
     # Ingest metrics job
-    ingest_job = Job(
-        id=str(uuid.uuid4()),
+    orch.enqueue(Job(
+        id=new_id(),
         type="INGEST_METRICS",
         company_id=company_id,
         payload={
             "source": metrics_source,
             "metrics": metrics_data
         }
-    )
-    orch.enqueue(ingest_job)
+    ))
     orch.run_cycle()
     
     # Then evaluate and suggest plays
-    kpi_definitions = load_kpis()
-    plays_cfg = load_plays()
-    
     jobs_for_plays = generate_jobs_from_plays(
-        company_id, metrics_data, plays_cfg, kpi_definitions
+        company_id, metrics_data, config.compiled_plays, config.kpis
     )
     
     for job in jobs_for_plays:
@@ -168,6 +233,113 @@ def ingest_metrics_cycle(company_id: str, metrics_source: str, metrics_data: dic
     return orch, evidence
 
 
+def read_metric_snapshots(
+    path: str,
+    default_company_id: Optional[str] = None
+) -> Tuple[Dict[str, Dict[str, float]], int, int]:
+    """
+    Stream a metrics file into one KPI snapshot per company.
+
+    Only the latest value of each KPI per company is kept, so memory grows
+    with companies x KPIs rather than file size. Returns the snapshots and
+    the number of accepted and rejected rows.
+    """
+    latest: Dict[str, Dict[str, Tuple[datetime, float]]] = {}
+    accepted = rejected = 0
+    epoch = datetime.min
+    for record in iter_metric_file(path):
+        try:
+            if isinstance(record, KPIPointError):
+                raise record
+            if default_company_id and isinstance(record, dict) and not record.get("company_id"):
+                record["company_id"] = default_company_id
+            point = parse_point(record, epoch)
+        except KPIPointError as e:
+            rejected += 1
+            if rejected <= 10:
+                logger.warning(f"Skipping metrics row: {e}")
+            continue
+        accepted += 1
+        company = latest.setdefault(point["company_id"], {})
+        current = company.get(point["name"])
+        if current is None or point["recorded_at"] >= current[0]:
+            company[point["name"]] = (point["recorded_at"], point["value"])
+
+    snapshots = {
+        company_id: {name: value for name, (_, value) in kpis.items()}
+        for company_id, kpis in latest.items()
+    }
+    return snapshots, accepted, rejected
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def ingest_metrics_file(
+    path: str,
+    metrics_source: str = "file",
+    workers: Optional[int] = None,
+    chunk_size: int = INGEST_CHUNK_SIZE,
+    default_company_id: Optional[str] = None,
+    verbose: bool = False
+) -> Dict[str, int]:
+    """
+    Run ingest + trigger evaluation + job execution for every company in a
+    metrics file, spreading companies across a process pool.
+
+    The config is loaded once in the parent and once per worker process
+    (inherited as-is where processes fork); each worker keeps a single
+    orchestrator for all the companies it is handed.
+    """
+    get_config()
+    if not verbose:
+        logging.getLogger("core").setLevel(logging.WARNING)
+
+    start = time.perf_counter()
+    snapshots, accepted, rejected = read_metric_snapshots(path, default_company_id)
+    read_seconds = time.perf_counter() - start
+    logger.info(
+        f"Read {accepted} rows for {len(snapshots)} companies in {read_seconds:.2f}s"
+        + (f" ({rejected} rejected)" if rejected else "")
+    )
+
+    batches = list(_chunks(list(snapshots.items()), max(1, chunk_size)))
+    workers = workers or os.cpu_count() or 1
+    totals: Counter = Counter(rows=accepted, rejected_rows=rejected)
+    run_start = time.perf_counter()
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            totals.update(run_companies(batch, metrics_source))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(batches)),
+            initializer=_init_ingest_worker,
+            initargs=(verbose,),
+        ) as pool:
+            for result in pool.map(run_companies, batches, [metrics_source] * len(batches)):
+                totals.update(result)
+    run_seconds = time.perf_counter() - run_start
+
+    elapsed = time.perf_counter() - start
+    logger.info("=" * 60)
+    logger.info(f"Ingested {path}")
+    logger.info(f"  companies: {totals['companies']}  jobs: {totals['jobs']}  evidence: {totals['evidence']}")
+    for status in ("succeeded", "failed", "skipped"):
+        if totals[status]:
+            logger.info(f"  {status}: {totals[status]}")
+    logger.info(
+        f"  read {read_seconds:.2f}s, run {run_seconds:.2f}s with {workers} worker(s), total {elapsed:.2f}s"
+    )
+    if run_seconds > 0:
+        logger.info(
+            f"  throughput: {totals['companies'] / run_seconds:,.0f} companies/s, "
+            f"{totals['jobs'] / run_seconds:,.0f} jobs/s"
+        )
+    return dict(totals)
+
+
 if __name__ == "__main__":
     import argparse
     
@@ -180,21 +352,53 @@ if __name__ == "__main__":
     )
     parser.add_argument(
         "--company-id",
-        default="demo-company",
-        help="Company identifier"
+        default=None,
+        help="Company identifier (demo: default demo-company; ingest: used for rows without company_id)"
     )
     parser.add_argument(
         "--company-name",
         default="Demo Company",
         help="Company name"
     )
+    parser.add_argument(
+        "--metrics-file",
+        help="Ingest mode: CSV, JSONL or JSON file of KPI rows (company_id, name, value, recorded_at)"
+    )
+    parser.add_argument(
+        "--source",
+        default="file",
+        help="Ingest mode: metrics source recorded on INGEST_METRICS jobs"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Ingest mode: worker processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=INGEST_CHUNK_SIZE,
+        help="Ingest mode: companies per worker task"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Ingest mode: keep per-job logging"
+    )
     
     args = parser.parse_args()
     
     if args.mode == "demo":
-        demo_cycle(args.company_id, args.company_name)
+        demo_cycle(args.company_id or "demo-company", args.company_name)
     elif args.mode == "ingest":
-        # Example: you would pass real metrics here
-        print("Ingest mode - pass metrics via API or file")
-        print("Example: python bi_cli.py --mode ingest --company-id my-company --metrics-file metrics.json")
-
+        if not args.metrics_file:
+            parser.error("--mode ingest requires --metrics-file")
+        ingest_metrics_file(
+            args.metrics_file,
+            metrics_source=args.source,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            default_company_id=args.company_id,
+            verbose=args.verbose,
+        )
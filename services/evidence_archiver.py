@@ -0,0 +1,83 @@
+"""Profit OS Chimera evidence archiver - moves cold evidence into the Parquet archive."""
+
+import sys
+from pathlib import Path
+import logging
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from database.archive import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_DIR,
+    EvidenceArchive,
+    archive_evidence,
+)
+from database.connection import SessionLocal, init_db
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def run(older_than_days: int, archive_dir: Path, batch_size: int, company_ids=None):
+    """Archive evidence older than ``older_than_days`` and log what moved."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    archive = EvidenceArchive(archive_dir)
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        totals = archive_evidence(db, cutoff, archive, batch_size, company_ids)
+        elapsed = time.perf_counter() - start
+    finally:
+        db.close()
+
+    ratio = (
+        totals["payload_bytes"] / totals["archive_bytes"]
+        if totals["archive_bytes"]
+        else 0.0
+    )
+    logger.info(
+        f"Archived {totals['rows']} evidence records before {cutoff:%Y-%m-%d} from "
+        f"{totals['companies']} companies into {totals['files']} files in {elapsed:.2f}s"
+    )
+    logger.info(
+        f"  payload JSON {totals['payload_bytes']:,} bytes -> archive {totals['archive_bytes']:,} bytes "
+        f"({ratio:.1f}x) under {archive_dir}"
+    )
+    return totals
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profit OS Chimera evidence archiver")
+    parser.add_argument(
+        "--older-than-days",
+        type=int,
+        default=ARCHIVE_AFTER_DAYS,
+        help="Archive evidence that occurred more than this many days ago",
+    )
+    parser.add_argument(
+        "--archive-dir", type=Path, default=ARCHIVE_DIR, help="Archive root directory"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ARCHIVE_BATCH_SIZE,
+        help="Rows moved per transaction",
+    )
+    parser.add_argument(
+        "--company-id",
+        action="append",
+        help="Only archive these companies (repeatable)",
+    )
+
+    args = parser.parse_args()
+
+    init_db()
+    run(args.older_than_days, args.archive_dir, args.batch_size, args.company_id)
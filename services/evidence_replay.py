@@ -0,0 +1,192 @@
+"""Profit OS Chimera evidence replay - rebuilds evidence_records or a derived view from the event logs."""
+
+import sys
+from pathlib import Path
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.event_log import (
+    EVIDENCE_LOG_DIR,
+    log_streams,
+    read_evidence,
+    read_log,
+    replay,
+)
+from core.evidence_store import JsonlSpill
+from core.models import EvidenceRecord
+from database.archive import naive_utc
+from database.bulk import insert_missing_evidence
+from database.connection import SessionLocal, init_db
+from database.models import EvidenceRecord as EvidenceRow
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def verify(log_dirs: List[Path]) -> int:
+    """Read every record, checking CRCs and segment continuity. Returns the record count."""
+    total = 0
+    for log_dir in log_dirs:
+        count, end = 0, 0
+        for offset, _ in read_log(log_dir):
+            count += 1
+            end = offset + 1
+        logger.info(f"{log_dir}: {count} records, next offset {end}")
+        total += count
+    return total
+
+
+def run(
+    log_dirs: List[Path],
+    start: int = 0,
+    since: Optional[datetime] = None,
+    company_ids: Optional[List[str]] = None,
+    jsonl: Optional[Path] = None,
+    rebuild: bool = False,
+    batch_size: int = 1000,
+) -> int:
+    """
+    Replay log streams into ``evidence_records`` (records already stored are
+    skipped) or, with ``jsonl``, into a JSON Lines file with the streams
+    merged by ``occurred_at``. ``rebuild`` first deletes the table rows the
+    filters select.
+    """
+    companies = set(company_ids) if company_ids else None
+    since = naive_utc(since) if since is not None else None
+
+    def wanted(record: EvidenceRecord) -> bool:
+        if companies is not None and record.company_id not in companies:
+            return False
+        return since is None or (
+            record.occurred_at is not None and naive_utc(record.occurred_at) >= since
+        )
+
+    begin = time.perf_counter()
+    total = 0
+    if jsonl is not None:
+        sink = JsonlSpill(jsonl)
+        batch: List[EvidenceRecord] = []
+        for record in read_evidence(log_dirs, wanted):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                sink(batch)
+                total += len(batch)
+                batch = []
+        sink(batch)
+        total += len(batch)
+        logger.info(
+            f"Replayed {total} evidence records in {time.perf_counter() - begin:.2f}s"
+        )
+        return total
+
+    db = SessionLocal()
+    try:
+        if rebuild:
+            query = db.query(EvidenceRow)
+            if companies is not None:
+                query = query.filter(EvidenceRow.company_id.in_(companies))
+            if since is not None:
+                query = query.filter(EvidenceRow.occurred_at >= since)
+            deleted = query.delete(synchronize_session=False)
+            db.commit()
+            logger.info(f"Deleted {deleted} evidence rows to rebuild")
+
+        inserted = 0
+
+        def sink(records: List[EvidenceRecord]):
+            nonlocal inserted
+            inserted += insert_missing_evidence(db, records)
+            db.commit()
+
+        for log_dir in log_dirs:
+            replayed, resume = replay(log_dir, sink, start, batch_size, wanted)
+            logger.info(
+                f"{log_dir}: {replayed} records replayed, resume from offset {resume}"
+            )
+            total += replayed
+    finally:
+        db.close()
+
+    logger.info(
+        f"Replayed {total} evidence records ({inserted} inserted, {total - inserted} already stored) "
+        f"in {time.perf_counter() - begin:.2f}s"
+    )
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Profit OS Chimera evidence log replay"
+    )
+    parser.add_argument(
+        "--log-dir",
+        type=Path,
+        action="append",
+        help="Evidence log root or stream directory (repeatable; default EVIDENCE_LOG_DIR)",
+    )
+    parser.add_argument(
+        "--from-offset",
+        type=int,
+        default=0,
+        help="First log offset to replay (one stream only)",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Only records that occurred at or after this time",
+    )
+    parser.add_argument(
+        "--company-id", action="append", help="Only these companies (repeatable)"
+    )
+    parser.add_argument(
+        "--jsonl", type=Path, help="Write a JSON Lines file instead of the database"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Delete the selected evidence rows first, so the table matches the log exactly",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Records per insert transaction"
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Only check record CRCs and segment continuity",
+    )
+
+    args = parser.parse_args()
+
+    roots = args.log_dir or ([Path(EVIDENCE_LOG_DIR)] if EVIDENCE_LOG_DIR else [])
+    if not roots:
+        parser.error("pass --log-dir or set EVIDENCE_LOG_DIR")
+    # A root holds one <hostname>-<pid> stream per process that wrote evidence
+    log_dirs = [stream for root in roots for stream in log_streams(root)]
+    if args.from_offset and len(log_dirs) != 1:
+        parser.error(
+            f"--from-offset applies to a single log stream; found {len(log_dirs)}"
+        )
+
+    if args.verify:
+        verify(log_dirs)
+    else:
+        if args.jsonl is None:
+            init_db()
+        run(
+            log_dirs,
+            args.from_offset,
+            args.since,
+            args.company_id,
+            args.jsonl,
+            args.rebuild,
+            args.batch_size,
+        )
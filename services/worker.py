@@ -0,0 +1,240 @@
+"""Profit OS Chimera worker - drains queued jobs from the database through the agent layer."""
+
+import sys
+from pathlib import Path
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config_loader import get_config
+from core.event_log import EventLog, EventLogSink, shared_evidence_log
+from core.models import EvidenceRecord, new_id
+from core.orchestrator import Orchestrator
+from database.bulk import BulkEvidenceSink
+from database.connection import SessionLocal, init_db
+from database.cycles import update_cycles
+from database.models import Job
+from database.job_queue import (
+    LEASE_SECONDS,
+    claim_jobs,
+    dependency_statuses,
+    finish_jobs,
+    recover_expired_leases,
+    release_jobs,
+    to_core_job,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """Claims leased batches of jobs, executes them and writes evidence."""
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: int = 50,
+        lease_seconds: int = LEASE_SECONDS,
+        concurrency: int = 1,
+        on_commit: Optional[Callable[[Iterable[str]], None]] = None,
+        event_log: Optional[EventLog] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.concurrency = concurrency
+        # Called with the company ids of each committed batch (e.g. cache invalidation)
+        self.on_commit = on_commit
+        # Evidence is group-committed here before it joins the batch's transaction
+        self.event_log = event_log
+        self._orch: Optional[Orchestrator] = None
+        self._config_version: Optional[str] = None
+        self._stopping = threading.Event()
+
+    def _orchestrator(self) -> Orchestrator:
+        """Reuse one orchestrator per config version."""
+        config = get_config()
+        if self._orch is None or config.version != self._config_version:
+            self._discard_orchestrator()
+            self._orch = Orchestrator(
+                list(config.agents),
+                executor="thread" if self.concurrency > 1 else None,
+                max_workers=self.concurrency,
+                max_completed=self.batch_size,
+            )
+            self._config_version = config.version
+        return self._orch
+
+    def run_once(self) -> int:
+        """Claim and process one batch. Returns the number of jobs claimed."""
+        db = SessionLocal()
+        try:
+            rows = claim_jobs(db, self.worker_id, self.batch_size, self.lease_seconds)
+            if rows:
+                self._process(db, rows)
+            return len(rows)
+        finally:
+            db.close()
+
+    def _process(self, db, rows: List[Job]):
+        """Run claimed rows in dependency waves and persist the outcome in one transaction."""
+        lease_owner = rows[0].lease_owner
+        now = datetime.utcnow()  # one timestamp for the batch's skipped evidence
+        statuses = dependency_statuses(db, rows)
+        pending = {row.id: row for row in rows}
+        final: Dict[str, str] = {}
+        skipped_evidence = []
+        orch = self._orchestrator()
+        # Evidence goes into this batch's transaction as each wave completes
+        sink = BulkEvidenceSink(db)
+        orch.evidence_sink = (
+            EventLogSink(self.event_log, sink) if self.event_log is not None else sink
+        )
+
+        while pending:
+            ready = []
+            for row in list(pending.values()):
+                parents = [
+                    statuses.get(pid)
+                    for pid in (row.payload or {}).get("depends_on", [])
+                ]
+                if any(s in ("failed", "skipped") for s in parents):
+                    del pending[row.id]
+                    final[row.id] = statuses[row.id] = "skipped"
+                    skipped_evidence.append(
+                        EvidenceRecord(
+                            id=new_id(),
+                            company_id=row.company_id,
+                            job_id=row.id,
+                            event_type="job_skipped",
+                            occurred_at=now,
+                            payload={"reason": "dependency_not_succeeded"},
+                        )
+                    )
+                elif all(s in ("succeeded", None) for s in parents):
+                    # A parent with no row (None) was never persisted; don't wait on it
+                    ready.append(row)
+
+            if not ready:
+                break
+
+            for row in ready:
+                del pending[row.id]
+                orch.enqueue(to_core_job(row))
+            orch.run_cycle()
+            for row in ready:
+                final[row.id] = statuses[row.id] = orch.get_job_status(row.id).status
+            orch.evidence.clear()
+
+        # Parents still queued or running elsewhere; try again shortly
+        release_jobs(db, lease_owner, pending)
+        orch.evidence_sink(skipped_evidence)
+        finish_jobs(db, lease_owner, final)
+        update_cycles(db, (row.cycle_id for row in rows))
+        db.commit()
+        if self.on_commit is not None:
+            self.on_commit({row.company_id for row in rows})
+        logger.info(
+            f"Worker {self.worker_id}: {len(final)} jobs finished, "
+            f"{len(pending)} released, {sink.count} evidence records"
+        )
+
+    def run(
+        self,
+        poll_interval: float = 1.0,
+        recover_interval: float = 30.0,
+        drain: bool = False,
+    ):
+        """Process batches until interrupted, or until the queue is empty with ``drain``."""
+        logger.info(
+            f"Worker {self.worker_id} started (batch={self.batch_size}, concurrency={self.concurrency})"
+        )
+        next_recovery = 0.0
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if time.monotonic() >= next_recovery:
+                        db = SessionLocal()
+                        try:
+                            recover_expired_leases(db)
+                        finally:
+                            db.close()
+                        next_recovery = time.monotonic() + recover_interval
+
+                    if self.run_once():
+                        continue
+                except Exception:
+                    # The batch's transaction was rolled back with its session; its
+                    # leases expire and are recovered, so keep polling
+                    logger.exception(f"Worker {self.worker_id}: batch failed")
+                    self._discard_orchestrator()
+                    self._stopping.wait(poll_interval)
+                    continue
+                if drain:
+                    break
+                self._stopping.wait(poll_interval)
+        except KeyboardInterrupt:
+            logger.info(f"Worker {self.worker_id} stopping")
+        finally:
+            self._discard_orchestrator()
+
+    def _discard_orchestrator(self):
+        """Shut down the cached orchestrator, e.g. after a batch left jobs in it."""
+        if self._orch is not None:
+            self._orch.shutdown()
+            self._orch = None
+
+    def stop(self):
+        """Ask ``run`` to return after the batch in progress."""
+        self._stopping.set()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profit OS Chimera job worker")
+    parser.add_argument("--worker-id", help="Worker identifier (default: hostname-pid)")
+    parser.add_argument(
+        "--batch-size", type=int, default=50, help="Jobs claimed per batch"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=1, help="Threads executing jobs in a batch"
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=int,
+        default=LEASE_SECONDS,
+        help="Lease length per claim",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=1.0, help="Seconds to sleep when idle"
+    )
+    parser.add_argument(
+        "--drain", action="store_true", help="Exit once the queue is empty"
+    )
+
+    args = parser.parse_args()
+
+    init_db()
+    on_commit = None
+    if os.getenv("API_CACHE_BACKEND") == "redis":
+        # A shared cache is reachable from here, so evict the API's stale views
+        from api.cache import invalidate_companies as on_commit
+    Worker(
+        worker_id=args.worker_id,
+        batch_size=args.batch_size,
+        lease_seconds=args.lease_seconds,
+        concurrency=args.concurrency,
+        on_commit=on_commit,
+        event_log=shared_evidence_log(),
+    ).run(poll_interval=args.poll_interval, drain=args.drain)
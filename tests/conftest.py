@@ -0,0 +1,42 @@
+"""Shared fixtures: a throwaway SQLite database and repo-root imports."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# database.connection builds its engine at import time, so point it at a scratch file first
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.pop("EVIDENCE_LOG_DIR", None)
+
+
+@pytest.fixture
+def db():
+    """A session on a freshly initialized database; every table is emptied afterwards."""
+    from database.connection import Base, SessionLocal, init_db
+
+    init_db()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            session.execute(table.delete())
+        session.commit()
+        session.close()
+
+
+@pytest.fixture
+def company(db):
+    """A stored company row."""
+    from database.models import Company
+
+    row = Company(name="Test Co", industry="saas", size="smb")
+    db.add(row)
+    db.commit()
+    return row
@@ -0,0 +1,53 @@
+"""Evidence archive: archived rows stay reachable by id and in cycle progress."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from database.archive import EvidenceArchive, archive_evidence
+from database.cycles import cycle_progress
+from database.models import Cycle, EvidenceRecord, Job
+
+
+def test_archived_evidence_is_found_by_id_and_counted_for_its_cycle(
+    db, company, tmp_path
+):
+    archive = EvidenceArchive(tmp_path)
+    old = datetime.utcnow() - timedelta(days=200)
+    cycle = Cycle(company_id=company.id, created_at=old, jobs_created=1)
+    db.add(cycle)
+    db.flush()
+    job = Job(company_id=company.id, type="TEST_OK", cycle_id=cycle.id, payload={})
+    db.add(job)
+    db.flush()
+    records = [
+        EvidenceRecord(
+            id=str(uuid.uuid4()),
+            company_id=company.id,
+            job_id=job.id,
+            event_type="test_done",
+            payload={"n": i},
+            occurred_at=old + timedelta(minutes=i),
+        )
+        for i in range(3)
+    ]
+    recent = EvidenceRecord(
+        company_id=company.id, job_id=job.id, event_type="test_done", payload={}
+    )
+    db.add_all(records + [recent])
+    db.commit()
+    archived_id = records[1].id
+
+    assert (
+        archive_evidence(db, datetime.utcnow() - timedelta(days=90), archive)["rows"]
+        == 3
+    )
+    row = archive.get(archived_id)
+    assert row["job_id"] == job.id and row["payload"] == {"n": 1}
+    assert archive.get(str(uuid.uuid4())) is None
+    assert cycle_progress(db, cycle, archive=archive)["evidence_count"] == 4
+
+
+def test_empty_archive_lookups_read_nothing(tmp_path):
+    archive = EvidenceArchive(tmp_path / "missing")
+    assert archive.get("anything") is None
+    assert archive.count("c1") == 0
@@ -0,0 +1,146 @@
+"""Evidence event log: torn-tail recovery, CRC checks, per-process streams and replay."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.event_log import (
+    EventLog,
+    EventLogCorruption,
+    EventLogError,
+    EventLogSink,
+    decode_evidence,
+    log_streams,
+    process_log_dir,
+    read_evidence,
+    read_log,
+    replay,
+)
+from core.models import EvidenceRecord, new_id
+
+START = datetime(2026, 3, 1)
+
+
+def records(n, company_id="c1", start=START):
+    return [
+        EvidenceRecord(
+            new_id(),
+            company_id,
+            new_id(),
+            "test_event",
+            start + timedelta(seconds=i),
+            {"i": i},
+        )
+        for i in range(n)
+    ]
+
+
+def write(directory, evidence, **kwargs):
+    with EventLog(directory, **kwargs) as log:
+        EventLogSink(log)(evidence)
+
+
+def test_records_round_trip_across_segments(tmp_path):
+    evidence = records(300)
+    write(tmp_path, evidence, segment_bytes=2048)
+    assert len(list(tmp_path.glob("*.log"))) > 1
+    logged = list(read_log(tmp_path))
+    assert [offset for offset, _ in logged] == list(range(300))
+    decoded = [decode_evidence(payload) for _, payload in logged]
+    assert decoded == evidence
+    assert decoded[0].job_id == evidence[0].job_id
+
+
+def test_torn_tail_is_truncated_on_reopen(tmp_path):
+    write(tmp_path, records(10))
+    segment = sorted(tmp_path.glob("*.log"))[-1]
+    intact = segment.stat().st_size
+    with segment.open("ab") as f:
+        f.write(b"\x40\x00\x00\x00\x01\x02")  # header promising 64 bytes, then a crash
+
+    # Readers stop quietly at the incomplete record in the active segment
+    assert len(list(read_log(tmp_path))) == 10
+    with EventLog(tmp_path) as log:
+        assert log.next_offset == 10
+        assert segment.stat().st_size == intact
+        EventLogSink(log)(records(1))
+    assert [offset for offset, _ in read_log(tmp_path)] == list(range(11))
+
+
+def test_crc_mismatch_in_sealed_segment_raises(tmp_path):
+    write(tmp_path, records(200), segment_bytes=2048)
+    first = sorted(tmp_path.glob("*.log"))[0]
+    data = bytearray(first.read_bytes())
+    data[20] ^= 0xFF
+    first.write_bytes(bytes(data))
+    with pytest.raises(EventLogCorruption, match="CRC mismatch"):
+        list(read_log(tmp_path))
+
+
+def test_crc_mismatch_at_active_tail_is_dropped_on_reopen(tmp_path):
+    write(tmp_path, records(5))
+    segment = sorted(tmp_path.glob("*.log"))[-1]
+    data = bytearray(segment.read_bytes())
+    data[-1] ^= 0xFF
+    segment.write_bytes(bytes(data))
+    with EventLog(tmp_path) as log:
+        assert log.next_offset == 4
+
+
+def test_second_writer_is_refused(tmp_path):
+    with EventLog(tmp_path):
+        with pytest.raises(EventLogError):
+            EventLog(tmp_path)
+
+
+def test_replay_resumes_from_offset_and_filters(tmp_path):
+    evidence = records(50, "c1") + records(50, "c2")
+    write(tmp_path, evidence)
+    out = []
+    replayed, resume = replay(
+        tmp_path,
+        out.extend,
+        start=40,
+        batch_size=7,
+        predicate=lambda r: r.company_id == "c2",
+    )
+    assert (replayed, resume) == (50, 100)
+    assert out == evidence[50:]
+
+
+def test_per_process_streams_are_merged_by_time(tmp_path):
+    assert process_log_dir(tmp_path).parent == tmp_path
+    early, late = records(20, start=START), records(
+        20, start=START + timedelta(milliseconds=500)
+    )
+    write(tmp_path / "host-1", early)
+    write(tmp_path / "host-2", late)
+    streams = log_streams(tmp_path)
+    assert streams == [tmp_path / "host-1", tmp_path / "host-2"]
+    merged = list(read_evidence(streams))
+    assert len(merged) == 40
+    assert [r.occurred_at for r in merged] == sorted(
+        r.occurred_at for r in early + late
+    )
+
+
+def test_replay_into_database_skips_stored_records(tmp_path, db, company):
+    from database.models import EvidenceRecord as EvidenceRow
+    from services.evidence_replay import run
+
+    evidence = records(30, company.id)
+    write(tmp_path / "host-1", evidence[:20])
+    write(tmp_path / "host-2", evidence[20:])
+    streams = log_streams(tmp_path)
+
+    assert run(streams, batch_size=8) == 30
+    assert db.query(EvidenceRow).count() == 30
+    # A second pass finds every record already stored
+    assert run(streams) == 30
+    assert db.query(EvidenceRow).count() == 30
+
+    db.query(EvidenceRow).filter(EvidenceRow.id == evidence[3].id).delete()
+    db.commit()
+    run(streams, company_ids=[company.id], rebuild=True)
+    db.expire_all()
+    assert {row.id for row in db.query(EvidenceRow)} == {r.id for r in evidence}
@@ -0,0 +1,153 @@
+"""Database job queue: claiming, lease expiry and reclaim, releases, the schema upgrade and the worker loop."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, inspect, text
+
+from core.models import Job as CoreJob
+from database.job_queue import (
+    claim_jobs,
+    enqueue_jobs,
+    finish_jobs,
+    recover_expired_leases,
+    release_jobs,
+)
+from database.migrations import upgrade_schema
+from database.models import Job, JobStatus
+from services.worker import Worker
+
+
+def queue(db, company, *priorities):
+    jobs = [
+        CoreJob(
+            id=str(uuid.uuid4()),
+            type="TEST_OK",
+            company_id=company.id,
+            payload={},
+            priority=priority,
+        )
+        for priority in priorities
+    ]
+    enqueue_jobs(db, jobs)
+    db.commit()
+    return jobs
+
+
+def test_claim_leases_jobs_in_priority_order(db, company):
+    low, high = queue(db, company, 200, 10)
+    claimed = claim_jobs(db, "w1", batch_size=1, lease_seconds=60)
+    assert [row.id for row in claimed] == [high.id]
+    row = claimed[0]
+    assert row.status == JobStatus.RUNNING
+    assert row.attempts == 1
+    assert row.lease_owner.startswith("w1:")
+    assert row.lease_expires_at > datetime.utcnow()
+
+    # A second worker only sees what is left
+    assert [row.id for row in claim_jobs(db, "w2", batch_size=5)] == [low.id]
+    assert claim_jobs(db, "w3") == []
+
+
+def test_expired_lease_is_reclaimed_and_stale_owner_cannot_finish(db, company):
+    (job,) = queue(db, company, 100)
+    first = claim_jobs(db, "w1", lease_seconds=60)[0]
+    stale_owner = first.lease_owner
+
+    # Not expired yet: nothing to recover
+    assert recover_expired_leases(db) == 0
+    assert (
+        recover_expired_leases(db, now=datetime.utcnow() + timedelta(seconds=120)) == 1
+    )
+    db.expire_all()
+    assert db.get(Job, job.id).status == JobStatus.QUEUED
+
+    second = claim_jobs(db, "w2", lease_seconds=60)[0]
+    assert second.id == job.id
+    assert second.attempts == 2
+
+    # The first worker's late result is ignored; the new owner's is kept
+    assert finish_jobs(db, stale_owner, {job.id: "succeeded"}) == 0
+    assert finish_jobs(db, second.lease_owner, {job.id: "failed"}) == 1
+    db.commit()
+    db.expire_all()
+    row = db.get(Job, job.id)
+    assert row.status == JobStatus.FAILED
+    assert row.lease_owner is None
+
+
+def test_expired_lease_fails_after_max_attempts(db, company):
+    (job,) = queue(db, company, 100)
+    later = datetime.utcnow() + timedelta(seconds=120)
+    for _ in range(2):
+        claim_jobs(db, "w", lease_seconds=60)
+        recover_expired_leases(db, max_attempts=2, now=later)
+    db.expire_all()
+    row = db.get(Job, job.id)
+    assert row.status == JobStatus.FAILED
+    assert row.attempts == 2
+
+
+def test_released_job_is_delayed_without_spending_an_attempt(db, company):
+    (job,) = queue(db, company, 100)
+    claimed = claim_jobs(db, "w1")[0]
+    assert release_jobs(db, claimed.lease_owner, [job.id], delay_seconds=3600) == 1
+    db.commit()
+    assert claim_jobs(db, "w2") == []
+    db.expire_all()
+    row = db.get(Job, job.id)
+    assert row.status == JobStatus.QUEUED
+    assert row.attempts == 0
+    assert row.available_at > datetime.utcnow()
+
+
+def test_upgrade_schema_adds_queue_columns_to_old_jobs_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/old.db")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE jobs (id VARCHAR PRIMARY KEY, company_id VARCHAR NOT NULL, type VARCHAR NOT NULL, "
+                "payload JSON, status VARCHAR(9), created_at DATETIME, updated_at DATETIME)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO jobs (id, company_id, type, status) VALUES ('j1', 'c1', 'T', 'QUEUED')"
+            )
+        )
+
+    changes = upgrade_schema(engine)
+    assert (
+        "column jobs.priority" in changes and "column jobs.lease_expires_at" in changes
+    )
+    columns = {column["name"] for column in inspect(engine).get_columns("jobs")}
+    assert {
+        "priority",
+        "attempts",
+        "available_at",
+        "lease_owner",
+        "lease_expires_at",
+        "cycle_id",
+    } <= columns
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT priority, attempts FROM jobs")).one() == (
+            100,
+            0,
+        )
+    assert upgrade_schema(engine) == []
+
+
+def test_worker_keeps_running_after_a_failed_batch(db, monkeypatch):
+    worker = Worker(worker_id="w1")
+    calls = []
+
+    def run_once():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("database went away")
+        worker.stop()
+        return 0
+
+    monkeypatch.setattr(worker, "run_once", run_once)
+    worker.run(poll_interval=0)
+    assert len(calls) == 2
@@ -0,0 +1,203 @@
+"""Orchestrator scheduling: dependency ordering, skipped descendants, agent limits and timeouts."""
+
+import time
+import uuid
+
+import pytest
+
+from core.agents import Agent
+from core.handlers import HANDLERS, make_evidence
+from core.models import Job
+from core.orchestrator import Orchestrator
+
+
+def _ok(agent, job):
+    return [make_evidence(job, "test_done", {})]
+
+
+def _fail(agent, job):
+    raise RuntimeError("boom")
+
+
+def _sleep(agent, job):
+    time.sleep(job.payload["seconds"])
+    return [make_evidence(job, "test_done", {})]
+
+
+TEST_HANDLERS = {"TEST_OK": _ok, "TEST_FAIL": _fail, "TEST_SLEEP": _sleep}
+
+
+@pytest.fixture(autouse=True)
+def test_handlers():
+    for job_type, handler in TEST_HANDLERS.items():
+        HANDLERS.add(job_type, handler)
+    yield
+    for job_type in TEST_HANDLERS:
+        HANDLERS.remove(job_type)
+
+
+def make_job(job_type="TEST_OK", depends_on=None, status="queued", **payload):
+    return Job(
+        id=str(uuid.uuid4()),
+        type=job_type,
+        company_id="c1",
+        payload=payload,
+        status=status,
+        depends_on=depends_on,
+    )
+
+
+@pytest.fixture
+def orch():
+    orchestrator = Orchestrator(
+        [Agent("tester", ["TEST_OK", "TEST_FAIL", "TEST_SLEEP"])]
+    )
+    yield orchestrator
+    orchestrator.shutdown()
+
+
+def outcomes(evidence):
+    return {
+        record.job_id: (record.event_type, record.payload.get("reason"))
+        for record in evidence
+    }
+
+
+def test_children_run_after_parents(orch):
+    parent = make_job()
+    child = make_job(depends_on=[parent.id])
+    orch.enqueue(child)  # enqueued first, still runs second
+    orch.enqueue(parent)
+    evidence = orch.run_cycle()
+    assert [record.job_id for record in evidence] == [
+        child.id,
+        parent.id,
+    ]  # results keep enqueue order
+    assert orch.last_cycle.critical_path == [parent.id, child.id]
+    assert orch.get_job_status(child.id).status == "succeeded"
+
+
+def test_failed_parent_skips_descendants(orch):
+    parent = make_job("TEST_FAIL")
+    child = make_job(depends_on=[parent.id])
+    grandchild = make_job(depends_on=[child.id])
+    sibling = make_job()
+    for job in (parent, child, grandchild, sibling):
+        orch.enqueue(job)
+    result = outcomes(orch.run_cycle())
+
+    assert result[parent.id] == ("error", None)
+    assert result[child.id] == ("job_skipped", "dependency_not_succeeded")
+    assert result[grandchild.id] == ("job_skipped", "dependency_not_succeeded")
+    assert result[sibling.id] == ("test_done", None)
+    assert orch.get_job_status(grandchild.id).status == "skipped"
+
+
+def test_child_of_already_failed_parent_is_skipped_at_enqueue(orch):
+    parent = make_job("TEST_FAIL")
+    orch.enqueue(parent)
+    orch.run_cycle()
+
+    child = make_job(depends_on=[parent.id])
+    orch.enqueue(child)
+    skipped = orch.run_cycle()
+    assert outcomes(skipped)[child.id] == ("job_skipped", "dependency_not_succeeded")
+    assert skipped[0].payload["dependency"] == parent.id
+
+
+def test_dependency_loop_and_missing_parent_are_skipped(orch):
+    first = make_job()
+    second = make_job(depends_on=[first.id])
+    first.depends_on = [second.id]
+    orphan = make_job(depends_on=[str(uuid.uuid4())])
+    downstream = make_job(depends_on=[second.id])
+    independent = make_job()
+    for job in (first, second, orphan, downstream, independent):
+        orch.enqueue(job)
+    result = outcomes(orch.run_cycle())
+
+    for job in (first, second, orphan, downstream):
+        assert result[job.id] == ("job_skipped", "dependency_unresolved")
+    assert result[independent.id] == ("test_done", None)
+    # Nothing is left blocked for the next cycle
+    assert orch.blocked_count == 0
+    assert not orch.jobs
+    assert orch.run_cycle() == []
+
+
+def test_finished_parent_from_enqueue_satisfies_child(orch):
+    parent = make_job(status="succeeded")
+    child = make_job(depends_on=[parent.id])
+    orch.enqueue(parent)
+    orch.enqueue(child)
+    assert outcomes(orch.run_cycle()) == {child.id: ("test_done", None)}
+
+
+def test_enqueue_rejects_running_job(orch):
+    with pytest.raises(ValueError, match="running"):
+        orch.enqueue(make_job(status="running"))
+
+
+def test_timed_out_job_keeps_agent_slot_until_it_returns():
+    orch = Orchestrator(
+        [Agent("tester", ["TEST_SLEEP"])],
+        executor="thread",
+        max_workers=2,
+        agent_limits={"tester": 1},
+        job_timeout=0.1,
+    )
+    try:
+        slow, fast = make_job("TEST_SLEEP", seconds=0.4), make_job(
+            "TEST_SLEEP", seconds=0
+        )
+        orch.enqueue(slow)
+        orch.enqueue(fast)
+        started = time.perf_counter()
+        result = outcomes(orch.run_cycle())
+        assert result[slow.id][0] == "error"
+        assert result[fast.id][0] == "test_done"
+        # fast only started once the timed-out thread released the agent's single slot
+        assert time.perf_counter() - started >= 0.35
+        assert orch.in_flight["tester"] == 0
+    finally:
+        orch.shutdown()
+
+
+def test_deferred_job_runs_when_slot_frees_before_wait():
+    orch = Orchestrator(
+        [Agent("tester", ["TEST_SLEEP"])],
+        executor="thread",
+        max_workers=2,
+        agent_limits={"tester": 1},
+        job_timeout=0.05,
+    )
+    dequeue = orch._dequeue
+
+    def slow_dequeue():
+        if orch._abandoned:
+            time.sleep(0.3)  # the timed-out worker returns before the loop re-checks
+        return dequeue()
+
+    orch._dequeue = slow_dequeue
+    try:
+        slow, fast = make_job("TEST_SLEEP", seconds=0.15), make_job(
+            "TEST_SLEEP", seconds=0
+        )
+        orch.enqueue(slow)
+        orch.enqueue(fast)
+        result = outcomes(orch.run_cycle())
+        assert result[slow.id][0] == "error"
+        assert result[fast.id][0] == "test_done"
+        assert not orch.jobs
+    finally:
+        orch.shutdown()
+
+
+def test_evidence_is_stamped_with_the_cycle_time(orch):
+    jobs = [make_job() for _ in range(3)] + [make_job("TEST_FAIL")]
+    for job in jobs:
+        orch.enqueue(job)
+    evidence = orch.run_cycle()
+    assert len(evidence) == len(jobs)
+    assert {record.occurred_at for record in evidence} == {orch.cycle_time}
+    assert {job.updated_at for job in jobs} == {orch.cycle_time}
@@ -0,0 +1,279 @@
+"""Trigger evaluation (interpreted, compiled, batched and incremental) and job_plan dependency resolution."""
+
+import random
+
+import numpy as np
+import pytest
+
+from core.agents import Agent
+from core.config_loader import get_config, load_kpis, load_plays
+from core.models import Job
+from core.playbooks import (
+    _resolve_step_dependencies,
+    CompiledPlay,
+    build_kpi_matrix,
+    compile_plays,
+    evaluate_triggers,
+    evaluate_triggers_batch,
+    generate_jobs_for_companies,
+    generate_jobs_from_plays,
+)
+
+KPI_DEFINITIONS = {
+    "revenue": {"target": 1000.0},
+    "conversion": {"target": 0.05},
+    "no_target": {},
+    "zero_target": {"target": 0},
+}
+
+PLAYS = [
+    {
+        "id": "all_absolute",
+        "triggers": {
+            "all": [
+                {"kpi": "revenue", "operator": "<", "value": 500},
+                {"kpi": "conversion", "operator": ">=", "value": 0.02},
+            ]
+        },
+    },
+    {
+        "id": "any_ratio",
+        "triggers": {
+            "any": [
+                {
+                    "kpi": "revenue",
+                    "relation": "ratio_to_target",
+                    "operator": "<",
+                    "value": 0.5,
+                },
+                {
+                    "kpi": "conversion",
+                    "relation": "ratio_to_target",
+                    "operator": "<=",
+                    "value": 0.8,
+                },
+            ]
+        },
+    },
+    {
+        "id": "all_and_any",
+        "triggers": {
+            "all": [{"kpi": "revenue", "operator": ">", "value": 100}],
+            "any": [
+                {"kpi": "sessions", "operator": "==", "value": 0},
+                {"kpi": "conversion", "operator": "!=", "value": 0.05},
+            ],
+        },
+    },
+    {
+        "id": "ratio_without_target",
+        "triggers": {
+            "all": [
+                {
+                    "kpi": "no_target",
+                    "relation": "ratio_to_target",
+                    "operator": "<",
+                    "value": 1,
+                },
+            ]
+        },
+    },
+    {
+        "id": "ratio_zero_target_any",
+        "triggers": {
+            "any": [
+                {
+                    "kpi": "zero_target",
+                    "relation": "ratio_to_target",
+                    "operator": ">",
+                    "value": 0,
+                },
+            ]
+        },
+    },
+    {"id": "no_triggers", "triggers": {}},
+    {
+        "id": "missing_kpi_not_equal",
+        "triggers": {
+            "all": [
+                {"kpi": "churn", "operator": "!=", "value": 1},
+            ]
+        },
+    },
+]
+
+
+def random_snapshots(n, seed=7):
+    rng = random.Random(seed)
+    names = ["revenue", "conversion", "sessions", "no_target", "zero_target", "churn"]
+    snapshots = []
+    for _ in range(n):
+        snapshot = {}
+        for name in names:
+            roll = rng.random()
+            if roll < 0.15:
+                continue  # missing KPI
+            if roll < 0.25:
+                snapshot[name] = 0.0
+            elif name == "conversion":
+                snapshot[name] = rng.choice([0.05, rng.uniform(0, 0.1)])
+            else:
+                snapshot[name] = rng.uniform(0, 2000)
+        snapshots.append(snapshot)
+    return snapshots
+
+
+def shipped_config_snapshots(n, seed=11):
+    """The shipped plays and KPI definitions, with snapshots scattered around each target."""
+    plays_cfg, kpi_definitions = load_plays(), load_kpis()
+    rng = random.Random(seed)
+    snapshots = [
+        {
+            name: rng.uniform(0, 2) * (definition.get("target") or 100)
+            for name, definition in sorted(kpi_definitions.items())
+            if rng.random() > 0.1
+        }
+        for _ in range(n)
+    ]
+    return plays_cfg, kpi_definitions, snapshots
+
+
+def test_compiled_triggers_match_interpreter():
+    plays = compile_plays(PLAYS, KPI_DEFINITIONS)
+    for snapshot in random_snapshots(400):
+        for compiled, play in zip(plays, PLAYS):
+            assert compiled.matches(snapshot) == evaluate_triggers(
+                snapshot, play, KPI_DEFINITIONS
+            ), (play["id"], snapshot)
+
+
+def test_compiled_triggers_match_interpreter_for_shipped_config():
+    plays_cfg, kpi_definitions, snapshots = shipped_config_snapshots(200)
+    compiled = compile_plays(plays_cfg, kpi_definitions)
+    for snapshot in snapshots:
+        assert [play.matches(snapshot) for play in compiled] == [
+            evaluate_triggers(snapshot, play, kpi_definitions) for play in plays_cfg
+        ]
+
+
+def test_impossible_play_never_matches():
+    play = CompiledPlay(PLAYS[3], KPI_DEFINITIONS)
+    assert play.never
+    assert not play.matches({"no_target": 0.0})
+
+
+def test_compile_plays_keeps_compiled_plays():
+    compiled = compile_plays(PLAYS, KPI_DEFINITIONS)
+    assert compile_plays(compiled, KPI_DEFINITIONS)[0] is compiled[0]
+
+
+def test_batch_triggers_match_interpreter():
+    snapshots = random_snapshots(400)
+    matrix, names = build_kpi_matrix(snapshots)
+    batch = evaluate_triggers_batch(matrix, names, PLAYS, KPI_DEFINITIONS)
+    expected = np.array(
+        [
+            [evaluate_triggers(s, play, KPI_DEFINITIONS) for play in PLAYS]
+            for s in snapshots
+        ]
+    )
+    assert batch.shape == (400, len(PLAYS))
+    assert (batch == expected).all()
+
+
+def test_batch_triggers_match_interpreter_for_shipped_config():
+    plays_cfg, kpi_definitions, snapshots = shipped_config_snapshots(200)
+    matrix, names = build_kpi_matrix(snapshots)
+    batch = evaluate_triggers_batch(matrix, names, plays_cfg, kpi_definitions)
+    expected = np.array(
+        [
+            [evaluate_triggers(s, play, kpi_definitions) for play in plays_cfg]
+            for s in snapshots
+        ]
+    )
+    assert (batch == expected).all()
+
+
+def test_batch_job_generation_matches_per_company():
+    snapshots = {
+        f"company-{i}": snapshot
+        for i, snapshot in enumerate(random_snapshots(50, seed=3))
+    }
+    plays = [
+        dict(play, job_plan=[{"type": f"RUN_{play['id'].upper()}"}]) for play in PLAYS
+    ]
+    bulk = generate_jobs_for_companies(snapshots, plays, KPI_DEFINITIONS)
+    for company_id, snapshot in snapshots.items():
+        single = generate_jobs_from_plays(company_id, snapshot, plays, KPI_DEFINITIONS)
+        assert sorted(job.type for job in bulk[company_id]) == sorted(
+            job.type for job in single
+        )
+
+
+def test_step_dependencies_resolve_to_indexes():
+    plan = [
+        {"id": "fetch"},
+        {"id": "score", "depends_on": ["fetch"]},
+        {"id": "report", "depends_on": ["fetch", "score"]},
+        {"type": "NOTIFY"},
+    ]
+    assert _resolve_step_dependencies("p", plan) == ((), (0,), (0, 1), ())
+
+
+def test_play_jobs_depend_on_parent_job_ids():
+    play = {
+        "id": "p",
+        "triggers": {},
+        "job_plan": [
+            {"id": "a", "type": "STEP_A"},
+            {"id": "b", "type": "STEP_B", "depends_on": ["a"]},
+        ],
+    }
+    a, b = generate_jobs_from_plays("c1", {}, [play], {})
+    assert a.depends_on == []
+    assert b.depends_on == [a.id]
+    assert b.payload["depends_on"] == [a.id]
+
+
+@pytest.mark.parametrize(
+    "plan, message",
+    [
+        ([{"id": "a"}, {"id": "a"}], "duplicate step id 'a'"),
+        ([{"id": "a", "depends_on": ["missing"]}], "unknown step 'missing'"),
+        ([{"id": "a", "depends_on": ["b"]}, {"id": "b", "depends_on": ["a"]}], "cycle"),
+        ([{"id": "a", "depends_on": ["a"]}], "cycle"),
+    ],
+)
+def test_invalid_step_dependencies_raise(plan, message):
+    with pytest.raises(ValueError, match=message):
+        _resolve_step_dependencies("p", plan)
+
+
+def test_long_dependency_chain_resolves():
+    plan = [
+        {"id": f"s{i}", "depends_on": [f"s{i - 1}"] if i else []} for i in range(5000)
+    ]
+    parents = _resolve_step_dependencies("p", plan)
+    assert parents[0] == () and parents[-1] == (4998,)
+
+
+def test_ingest_records_trigger_state_of_affected_plays_only():
+    config = get_config()
+    name = next(
+        name
+        for name, play_ids in sorted(config.evaluator.kpi_index.items())
+        if play_ids
+    )
+    metrics = {name: 0.0}
+    job = Job(
+        id="ingest-1",
+        type="INGEST_METRICS",
+        company_id="c1",
+        payload={"metrics": metrics},
+    )
+    (record,) = Agent("ingest", ["INGEST_METRICS"]).handle(job)
+
+    by_id = {play["id"]: play for play in config.plays}
+    assert set(record.payload["trigger_state"]) == set(config.evaluator.kpi_index[name])
+    for play_id, triggering in record.payload["trigger_state"].items():
+        assert triggering == evaluate_triggers(metrics, by_id[play_id], config.kpis)
@@ -0,0 +1,115 @@
+"""KPI latest-value and rollup upserts: replays, late points and batch splits converge."""
+
+import uuid
+from datetime import datetime, timedelta
+
+from database.bulk import bulk_insert_kpis
+from database.models import KPILatest, KPIRollup
+from database.timeseries import (
+    get_rollups,
+    latest_values,
+    rebuild_timeseries,
+    record_points,
+)
+
+START = datetime(2026, 1, 5, 9, 0)
+
+
+def make_points(company_id, n=48):
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "company_id": company_id,
+            "name": name,
+            "value": float((i * 7) % 13) + offset,
+            "target": None,
+            "status": None,
+            "recorded_at": START + timedelta(minutes=25 * i),
+            "meta_data": {},
+        }
+        for i in range(n)
+        for name, offset in (("revenue", 100.0), ("sessions", 0.0))
+    ]
+
+
+def rollup_state(db, company_id):
+    return sorted(
+        (
+            r.name,
+            r.granularity,
+            r.bucket_start,
+            r.count,
+            r.sum_value,
+            r.min_value,
+            r.max_value,
+            r.last_value,
+            r.last_recorded_at,
+        )
+        for r in db.query(KPIRollup).filter(KPIRollup.company_id == company_id)
+    )
+
+
+def latest_state(db, company_id):
+    return sorted(
+        (r.name, r.kpi_id, r.value, r.recorded_at)
+        for r in db.query(KPILatest).filter(KPILatest.company_id == company_id)
+    )
+
+
+def test_latest_upsert_is_idempotent_and_ignores_late_points(db, company):
+    points = make_points(company.id)
+    record_points(db, points)
+    db.commit()
+    expected = latest_values(db, company.id)
+    state = latest_state(db, company.id)
+    assert expected["revenue"] == points[-2]["value"]
+
+    # Replaying the same points, or an older point arriving late, changes nothing
+    record_points(db, points)
+    late = dict(points[0], id=str(uuid.uuid4()), value=-1.0)
+    record_points(db, [late])
+    db.commit()
+    assert latest_state(db, company.id) == state
+
+    newer = dict(
+        points[-1],
+        id=str(uuid.uuid4()),
+        value=999.0,
+        recorded_at=points[-1]["recorded_at"] + timedelta(hours=1),
+    )
+    record_points(db, [newer])
+    db.commit()
+    assert latest_values(db, company.id)["sessions"] == 999.0
+
+
+def test_rollups_do_not_depend_on_batch_boundaries(db, company):
+    points = make_points(company.id)
+    record_points(db, points)
+    db.commit()
+    one_batch = rollup_state(db, company.id)
+
+    db.query(KPIRollup).delete()
+    db.commit()
+    # Reverse order in uneven batches: upserts must merge into the same buckets
+    shuffled = points[::-1]
+    for i in range(0, len(shuffled), 7):
+        record_points(db, shuffled[i : i + 7])
+        db.commit()
+    assert rollup_state(db, company.id) == one_batch
+
+    days = get_rollups(db, company.id, "day", names=["revenue"])
+    assert sum(r.count for r in days) == 48
+    assert all(r.min_value <= r.avg_value <= r.max_value for r in days)
+
+
+def test_rebuild_is_idempotent_and_matches_incremental(db, company):
+    points = make_points(company.id)
+    bulk_insert_kpis(db, points)
+    record_points(db, points)
+    db.commit()
+    incremental = (rollup_state(db, company.id), latest_state(db, company.id))
+
+    assert rebuild_timeseries(db, company.id, batch_size=10) == len(points)
+    assert (rollup_state(db, company.id), latest_state(db, company.id)) == incremental
+    rebuild_timeseries(db, company.id, batch_size=10)
+    assert (rollup_state(db, company.id), latest_state(db, company.id)) == incremental